@@ -8,10 +8,13 @@
 from ._pages.chromium_page import ChromiumPage
 from ._pages.session_page import SessionPage
 from ._pages.web_page import WebPage
+from ._pages.async_tab import AsyncChromiumTab
+from ._base.async_browser import AsyncBrowser
 
 # 启动配置类
 from ._configs.chromium_options import ChromiumOptions
 from ._configs.session_options import SessionOptions
 
-__all__ = ['ChromiumPage', 'ChromiumOptions', 'SessionOptions', 'SessionPage', 'WebPage', '__version__']
+__all__ = ['ChromiumPage', 'ChromiumOptions', 'SessionOptions', 'SessionPage', 'WebPage', 'AsyncChromiumTab',
+           'AsyncBrowser', '__version__']
 __version__ = '4.0.4.22'
@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from .async_driver import AsyncDriver, get_json
+from .._functions.tools import raise_error
+from ..errors import BrowserConnectError
+
+
+class AsyncBrowser(object):
+    """基于asyncio的浏览器管理对象，用于新建、获取和关闭标签页"""
+
+    def __init__(self, address):
+        """
+        :param address: 浏览器地址，ip:port，浏览器需已启动
+        """
+        self.address = address
+        self.id = None
+        self.driver = None
+
+    def __repr__(self):
+        return f'<AsyncBrowser {self.address}>'
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    async def connect(self):
+        """连接浏览器
+        :return: 当前对象
+        """
+        try:
+            ws = (await get_json(self.address, '/json/version'))['webSocketDebuggerUrl']
+        except (OSError, KeyError, ValueError):
+            raise BrowserConnectError(f'\n浏览器连接失败，地址：{self.address}')
+        self.id = ws.split('/')[-1]
+        self.driver = AsyncDriver(self.id, 'browser', self.address, self)
+        await self.driver.start()
+        return self
+
+    async def disconnect(self):
+        """断开与浏览器的连接，不关闭浏览器"""
+        if self.driver:
+            await self.driver.stop()
+
+    async def run_cdp(self, cmd, **cmd_args):
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ignore = cmd_args.pop('_ignore', None)
+        r = await self.driver.run(cmd, **cmd_args)
+        return r if 'error' not in r else raise_error(r, ignore)
+
+    async def tab_ids(self):
+        """返回所有标签页id组成的列表"""
+        r = await self.run_cdp('Target.getTargets')
+        return [i['targetId'] for i in r['targetInfos']
+                if i['type'] == 'page' and not i['url'].startswith('devtools://')]
+
+    async def new_tab(self, url=None, new_window=False, background=False, timeout=None):
+        """新建一个标签页并连接
+        :param url: 新标签页跳转到的网址
+        :param new_window: 是否在新窗口打开标签页
+        :param background: 是否不激活新标签页，如new_window为True则无效
+        :param timeout: 标签页默认超时时间（秒）
+        :return: 已连接的AsyncChromiumTab对象
+        """
+        from .._pages.async_tab import AsyncChromiumTab
+        kwargs = {'url': 'about:blank'}
+        if new_window:
+            kwargs['newWindow'] = True
+        if background:
+            kwargs['background'] = True
+        tab_id = (await self.run_cdp('Target.createTarget', **kwargs))['targetId']
+        tab = await AsyncChromiumTab(self.address, tab_id, timeout=timeout).connect()
+        if url:
+            await tab.get(url)
+        return tab
+
+    async def get_tab(self, tab_id=None, timeout=None):
+        """连接一个已存在的标签页
+        :param tab_id: 标签页id，为None时获取第一个标签页
+        :param timeout: 标签页默认超时时间（秒）
+        :return: 已连接的AsyncChromiumTab对象
+        """
+        from .._pages.async_tab import AsyncChromiumTab
+        return await AsyncChromiumTab(self.address, tab_id, timeout=timeout).connect()
+
+    async def close_tabs(self, tab_ids):
+        """关闭标签页
+        :param tab_ids: 标签页id或其组成的列表
+        :return: None
+        """
+        if isinstance(tab_ids, str):
+            tab_ids = (tab_ids,)
+        await self.driver.run_many([('Target.closeTarget', {'targetId': i}) for i in tab_ids])
+
+    async def quit(self):
+        """关闭浏览器"""
+        await self.driver.run('Browser.close', _timeout=0)
+        await self.disconnect()
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Union, List, Optional, Tuple
+
+from .async_driver import AsyncDriver
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncBrowser(object):
+    address: str
+    id: Optional[str]
+    driver: Optional[AsyncDriver]
+
+    def __init__(self, address: str): ...
+
+    async def __aenter__(self) -> AsyncBrowser: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    async def connect(self) -> AsyncBrowser: ...
+
+    async def disconnect(self) -> None: ...
+
+    async def run_cdp(self, cmd: str, **cmd_args) -> dict: ...
+
+    async def tab_ids(self) -> List[str]: ...
+
+    async def new_tab(self,
+                      url: str = None,
+                      new_window: bool = False,
+                      background: bool = False,
+                      timeout: float = None) -> AsyncChromiumTab: ...
+
+    async def get_tab(self, tab_id: str = None, timeout: float = None) -> AsyncChromiumTab: ...
+
+    async def close_tabs(self, tab_ids: Union[str, List[str], Tuple[str, ...]]) -> None: ...
+
+    async def quit(self) -> None: ...
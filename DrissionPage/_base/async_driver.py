@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import (open_connection, get_event_loop, Queue, wait_for, IncompleteReadError, CancelledError,
+                     TimeoutError as AsyncTimeoutError)
+from base64 import b64encode
+from hashlib import sha1
+from json import loads
+from os import urandom
+from traceback import print_exc
+from struct import pack, unpack
+from urllib.parse import urlparse
+
+from .driver import Driver
+from .._functions.json_codec import get_codec, peek_event
+from .._functions.settings import Settings
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class AsyncWebSocket(object):
+    """基于asyncio的简易websocket客户端，只实现cdp通讯所需的功能"""
+
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._closing = None
+
+    async def connect(self, url):
+        """连接websocket
+        :param url: ws地址
+        :return: None
+        """
+        parsed = urlparse(url)
+        self._reader, self._writer = await open_connection(parsed.hostname, parsed.port or 80)
+        key = b64encode(urandom(16)).decode()
+        path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        self._writer.write((f'GET {path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nUpgrade: websocket\r\n'
+                            f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+                            f'Sec-WebSocket-Version: 13\r\n\r\n').encode())
+        await self._writer.drain()
+
+        head = (await self._reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        status = head.split('\r\n', 1)[0]
+        if ' 101 ' not in f'{status} ':
+            self.close()
+            raise ConnectionError(f'websocket握手失败：{status}')
+        accept = b64encode(sha1((key + _WS_GUID).encode()).digest()).decode()
+        if accept.lower() not in head.lower():
+            self.close()
+            raise ConnectionError('websocket握手失败：Sec-WebSocket-Accept不匹配。')
+
+    async def send(self, text):
+        """发送文本帧
+        :param text: 文本
+        :return: None
+        """
+        await self._send_frame(text.encode('utf-8'), 1)
+
+    async def recv(self):
+        """接收一条完整的文本信息，自动回应ping
+        :return: 文本
+        """
+        chunks = []
+        while True:
+            fin, opcode, data = await self._read_frame()
+            if opcode == 8:
+                raise ConnectionError('websocket已关闭。')
+            elif opcode == 9:
+                await self._send_frame(data, 10)
+                continue
+            elif opcode == 10:
+                continue
+
+            chunks.append(data)
+            if fin:
+                return b''.join(chunks).decode('utf-8')
+
+    def close(self):
+        """关闭连接"""
+        if self._writer:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._closing = self._writer
+            self._writer = None
+
+    async def wait_closed(self):
+        """等待close()关闭的连接完全关闭"""
+        writer, self._closing = self._closing, None
+        if writer is not None and hasattr(writer, 'wait_closed'):  # Python 3.7以上才有
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _send_frame(self, data, opcode):
+        """发送带掩码的帧
+        :param data: 数据
+        :param opcode: 帧类型
+        :return: None
+        """
+        length = len(data)
+        if length < 126:
+            head = pack('>BB', 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            head = pack('>BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            head = pack('>BBQ', 0x80 | opcode, 0x80 | 127, length)
+        mask = urandom(4)
+        masked = (int.from_bytes(data, 'big') ^ int.from_bytes((mask * (length // 4 + 1))[:length], 'big')
+                  ).to_bytes(length, 'big')
+        self._writer.write(head + mask + masked)
+        await self._writer.drain()
+
+    async def _read_frame(self):
+        """读取一个帧
+        :return: (是否结束帧, 帧类型, 数据)
+        """
+        b1, b2 = await self._reader.readexactly(2)
+        length = b2 & 0x7f
+        if length == 126:
+            length = unpack('>H', await self._reader.readexactly(2))[0]
+        elif length == 127:
+            length = unpack('>Q', await self._reader.readexactly(8))[0]
+        data = await self._reader.readexactly(length) if length else b''
+        return b1 & 0x80, b1 & 0x0f, data
+
+
+async def get_json(address, path):
+    """以异步方式请求浏览器的http接口
+    :param address: 浏览器地址，ip:port
+    :param path: 接口路径，如'/json'
+    :return: 解析后的json数据
+    """
+    host, port = address.rsplit(':', 1)
+    reader, writer = await open_connection(host, int(port))
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {address}\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return loads(data.split(b'\r\n\r\n', 1)[1].decode('utf-8'))
+
+
+class AsyncDriver(object):
+    def __init__(self, tab_id, tab_type, address, owner=None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        """
+        self.id = tab_id
+        self.address = address
+        self.type = tab_type
+        self.owner = owner
+        self.alert_flag = False
+
+        self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
+        self._cur_id = 0
+        self._codec, self._loads, self._dumps = get_codec(Settings.json_codec)
+        self._ws = None
+        self._recv_task = None
+        self._handle_event_task = None
+        self._stopped = True
+
+        self.event_handlers = {}
+        self.method_results = {}
+        self.event_queue = None
+
+    def __repr__(self):
+        return f'<AsyncDriver {self.id}>'
+
+    @property
+    def is_running(self):
+        """返回连接是否可用"""
+        return not self._stopped
+
+    async def start(self):
+        """启动连接"""
+        self._ws = AsyncWebSocket()
+        await self._ws.connect(self._websocket_url)
+        self._stopped = False
+        self.event_queue = Queue()
+        loop = get_event_loop()
+        self._recv_task = loop.create_task(self._recv_loop())
+        self._handle_event_task = loop.create_task(self._handle_event_loop())
+        return True
+
+    async def stop(self):
+        """中断连接"""
+        ws = self._ws
+        self._stop()
+        for task in (self._recv_task, self._handle_event_task):
+            if task:
+                try:
+                    await task
+                except (CancelledError, Exception):
+                    pass
+        if ws:
+            await ws.wait_closed()
+        return True
+
+    def _stop(self):
+        """中断连接，取消接收和执行事件的任务"""
+        if self._stopped:
+            return False
+        self._stopped = True
+        for task in (self._recv_task, self._handle_event_task):
+            if task and not task.done():
+                task.cancel()
+        if self._ws:
+            self._ws.close()
+            self._ws = None
+        self.event_handlers.clear()
+        self._wake_pending({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+
+        if hasattr(self.owner, '_on_disconnect'):
+            self.owner._on_disconnect()
+
+    def _wake_pending(self, result, methods=None):
+        """以指定结果唤醒等待中的命令
+        :param result: 设置给命令的结果
+        :param methods: 只唤醒以这些字符串开头的cdp方法，为None时唤醒全部
+        :return: None
+        """
+        for ws_id, (method, future) in list(self.method_results.items()):
+            if methods is None or method.startswith(methods):
+                self.method_results.pop(ws_id, None)
+                if not future.done():
+                    future.set_result(result)
+
+    async def _post(self, message):
+        """发送信息到浏览器，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: (信息id, 等待结果的Future对象)，发送失败返回None
+        """
+        self._cur_id += 1
+        ws_id = self._cur_id
+        message['id'] = ws_id
+        future = get_event_loop().create_future()
+        self.method_results[ws_id] = (message['method'], future)
+        try:
+            await self._ws.send(self._dumps(message))
+            return ws_id, future
+        except (OSError, ConnectionError, AttributeError):
+            self.method_results.pop(ws_id, None)
+            return None
+
+    async def _get_result(self, ws_id, future, method, timeout=None):
+        """等待已发送信息的返回结果
+        :param ws_id: 信息id
+        :param future: 等待结果的Future对象
+        :param method: cdp方法名
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: 浏览器返回的数据
+        """
+        if self.alert_flag and method.startswith(('Input.', 'Runtime.')):
+            timeout = .2 if timeout is None else min(timeout, .2)
+        try:
+            return await wait_for(future, timeout)
+        except AsyncTimeoutError:
+            self.method_results.pop(ws_id, None)
+            return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
+                if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
+
+    async def run(self, _method, **kwargs):
+        """执行cdp方法
+        :param _method: cdp方法名
+        :param kwargs: cdp参数
+        :return: 执行结果，格式与Driver.run()一致
+        """
+        if self._stopped:
+            return {'error': 'connection disconnected', 'type': 'connection_error'}
+
+        timeout = kwargs.pop('_timeout', Settings.cdp_timeout)
+        sent = await self._post({'method': _method, 'params': kwargs})
+        if sent is None:
+            result = {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+        elif timeout == 0:
+            self.method_results.pop(sent[0], None)
+            result = {'id': sent[0], 'result': {}}
+        else:
+            result = await self._get_result(sent[0], sent[1], _method, timeout)
+        return Driver._make_result(result, _method, kwargs, timeout)
+
+    async def run_many(self, cmds, timeout=None):
+        """批量执行cdp方法，所有命令连续发出后再统一收集结果
+        :param cmds: 命令组成的列表，每项为(方法名, 参数dict)元组或方法名字符串，参数中可用_timeout单独设置超时
+        :param timeout: 默认超时时间（秒），为None时使用Settings.cdp_timeout
+        :return: 执行结果组成的列表，顺序与cmds一致
+        """
+        if self._stopped:
+            return [{'error': 'connection disconnected', 'type': 'connection_error'} for _ in cmds]
+
+        timeout = Settings.cdp_timeout if timeout is None else timeout
+        sent = []
+        for cmd in cmds:
+            if isinstance(cmd, str):
+                method, kwargs = cmd, {}
+            else:
+                method, kwargs = cmd[0], dict(cmd[1]) if len(cmd) > 1 and cmd[1] else {}
+            cmd_timeout = kwargs.pop('_timeout', timeout)
+            sent.append((await self._post({'method': method, 'params': kwargs}), method, kwargs, cmd_timeout))
+
+        loop = get_event_loop()
+        begin = loop.time()
+        results = []
+        for s, method, kwargs, cmd_timeout in sent:
+            if s is None:
+                result = {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+            elif cmd_timeout == 0:
+                self.method_results.pop(s[0], None)
+                result = {'id': s[0], 'result': {}}
+            else:
+                left = None if cmd_timeout is None else max(begin + cmd_timeout - loop.time(), 0)
+                result = await self._get_result(s[0], s[1], method, left)
+            results.append(Driver._make_result(result, method, kwargs, cmd_timeout))
+        return results
+
+    async def _recv_loop(self):
+        """接收浏览器信息的任务"""
+        while not self._stopped:
+            try:
+                msg_json = await self._ws.recv()
+                method = peek_event(msg_json)[0]
+                if method and method not in self.event_handlers and not method.startswith('Page.javascriptDialog'):
+                    continue
+                msg = self._loads(msg_json)
+            except CancelledError:
+                raise
+            except (ConnectionError, OSError, IncompleteReadError, ValueError, AttributeError):
+                ws = self._ws
+                if ws:
+                    ws.close()
+                    await ws.wait_closed()
+                self._stop()
+                return
+
+            if 'method' in msg:
+                if msg['method'].startswith('Page.javascriptDialog'):
+                    self.alert_flag = msg['method'].endswith('Opening')
+                    if self.alert_flag:
+                        self._wake_pending({'error': {'message': 'alert exists.'}, 'type': 'alert_exists'},
+                                           ('Input.', 'Runtime.'))
+                if msg['method'] in self.event_handlers:
+                    self.event_queue.put_nowait(msg)
+
+            else:
+                r = self.method_results.pop(msg.get('id'), None)
+                if r and not r[1].done():
+                    r[1].set_result(msg)
+
+    async def _handle_event_loop(self):
+        """按顺序执行已绑定的事件回调，回调可以是普通函数或协程函数"""
+        while not self._stopped:
+            event = await self.event_queue.get()
+            function = self.event_handlers.get(event['method'])
+            if function:
+                try:
+                    r = function(**event['params'])
+                    if hasattr(r, '__await__'):
+                        await r
+                except CancelledError:
+                    raise
+                except Exception:
+                    if self._stopped:
+                        return
+                    print_exc()
+
+    def set_callback(self, event, callback):
+        """绑定cdp event和回调方法
+        :param event: cdp event
+        :param callback: 绑定到cdp event的回调方法，可以是协程函数，为None时解除绑定
+        :return: None
+        """
+        if callback:
+            self.event_handlers[event] = callback
+        else:
+            self.event_handlers.pop(event, None)
+
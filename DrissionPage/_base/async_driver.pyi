@@ -0,0 +1,81 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Queue, StreamReader, StreamWriter, Task, Future
+from typing import Union, Callable, Dict, Optional, List, Tuple, Any
+
+
+class AsyncWebSocket(object):
+    _reader: Optional[StreamReader]
+    _writer: Optional[StreamWriter]
+    _closing: Optional[StreamWriter]
+
+    def __init__(self): ...
+
+    async def connect(self, url: str) -> None: ...
+
+    async def send(self, text: str) -> None: ...
+
+    async def recv(self) -> str: ...
+
+    def close(self) -> None: ...
+
+    async def wait_closed(self) -> None: ...
+
+    async def _send_frame(self, data: bytes, opcode: int) -> None: ...
+
+    async def _read_frame(self) -> Tuple[int, int, bytes]: ...
+
+
+async def get_json(address: str, path: str) -> Union[dict, list]: ...
+
+
+class AsyncDriver(object):
+    id: str
+    address: str
+    type: str
+    owner = ...
+    alert_flag: bool
+    _websocket_url: str
+    _cur_id: int
+    _codec: str
+    _loads: Callable[[Union[str, bytes]], dict]
+    _dumps: Callable[[dict], str]
+    _ws: Optional[AsyncWebSocket]
+    _recv_task: Optional[Task]
+    _handle_event_task: Optional[Task]
+    _stopped: bool
+    event_handlers: Dict[str, Callable]
+    method_results: Dict[int, Tuple[str, Future]]
+    event_queue: Optional[Queue]
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None): ...
+
+    @property
+    def is_running(self) -> bool: ...
+
+    async def start(self) -> bool: ...
+
+    async def stop(self) -> bool: ...
+
+    def _stop(self) -> None: ...
+
+    def _wake_pending(self, result: dict, methods: Union[str, Tuple[str, ...], None] = None) -> None: ...
+
+    async def _post(self, message: dict) -> Optional[Tuple[int, Future]]: ...
+
+    async def _get_result(self, ws_id: int, future: Future, method: str, timeout: float = None) -> dict: ...
+
+    async def run(self, _method: str, **kwargs) -> dict: ...
+
+    async def run_many(self, cmds: List[Union[str, Tuple[str, dict]]], timeout: float = None) -> List[dict]: ...
+
+    async def _recv_loop(self) -> None: ...
+
+    async def _handle_event_loop(self) -> None: ...
+
+    def set_callback(self, event: str, callback: Optional[Callable]) -> None: ...
@@ -363,6 +363,7 @@ class BasePage(BaseParser):
         self._download_path = None
         self._none_ele_return_value = False
         self._none_ele_value = None
+        self._doc_tree = None  # (文档版本, 解析后的lxml对象)
         self._type = 'BasePage'
 
     @property
@@ -437,6 +438,10 @@ class BasePage(BaseParser):
     def get(self, url, show_errmsg=False, retry=None, interval=None):
         pass
 
+    def _doc_version(self):
+        """返回当前文档的版本，版本不变时s_ele()等使用缓存的解析结果，返回None时不缓存"""
+        return None
+
     def _ele(self, locator, timeout=None, index=1, raise_err=None, method=None):
         """调用获取元素的方法
         :param locator: 定位符
@@ -9,6 +9,7 @@ from abc import abstractmethod
 from typing import Union, Tuple, List, Any, Optional
 
 from DownloadKit import DownloadKit
+from lxml.html import HtmlElement
 
 from .._elements.none_element import NoneElement
 from .._elements.session_element import SessionElement
@@ -204,6 +205,7 @@ class BasePage(BaseParser):
         self._DownloadKit: DownloadKit = ...
         self._none_ele_return_value: bool = ...
         self._none_ele_value: Any = ...
+        self._doc_tree: Optional[Tuple[Any, HtmlElement]] = ...
         self._page: Union[ChromiumPage, SessionPage, WebPage]=...
 
     @property
@@ -242,6 +244,8 @@ class BasePage(BaseParser):
     @abstractmethod
     def get(self, url: str, show_errmsg: bool = False, retry: int = None, interval: float = None): ...
 
+    def _doc_version(self) -> Any: ...
+
     def _ele(self,
              locator,
              timeout: float = None,
@@ -11,10 +11,10 @@ from time import perf_counter, sleep
 
 from websocket import WebSocketBadStatusException
 
-from .driver import BrowserDriver, Driver
+from .driver import BrowserDriver, Driver, SessionDriver
 from .._functions.tools import raise_error
 from .._units.downloader import DownloadManager
-from ..errors import PageDisconnectedError
+from ..errors import PageDisconnectedError, BrowserConnectError
 
 __ERROR__ = 'error'
 
@@ -45,6 +45,7 @@ class Browser(object):
 
         self.page = page
         self.address = address
+        self._transport = page._chromium_options.transport
         self._driver = BrowserDriver(browser_id, 'browser', address, self)
         self.id = browser_id
         self._frames = {}
@@ -74,11 +75,21 @@ class Browser(object):
         """
         d = self._drivers.pop(tab_id, None)
         if not d:
-            d = Driver(tab_id, 'page', self.address)
+            d = self._new_driver(tab_id)
         d.owner = owner
         self._all_drivers.setdefault(tab_id, set()).add(d)
         return d
 
+    def _new_driver(self, tab_id, owner=None):
+        """按连接方式新建一个连接到指定target的Driver，不做记录
+        :param tab_id: 标签页或frame的target id
+        :param owner: 使用该驱动的对象
+        :return: Driver对象
+        """
+        if self._transport != 'websocket':
+            return SessionDriver(tab_id, 'page', self.address, owner, self._driver)
+        return Driver(tab_id, 'page', self.address, owner)
+
     def _onTargetCreated(self, **kwargs):
         """标签页创建时执行"""
         if (kwargs['targetInfo']['type'] in ('page', 'webview')
@@ -86,7 +97,7 @@ class Browser(object):
                 and not kwargs['targetInfo']['url'].startswith('devtools://')):
             try:
                 tab_id = kwargs['targetInfo']['targetId']
-                d = Driver(tab_id, 'page', self.address)
+                d = self._new_driver(tab_id)
                 self._drivers[tab_id] = d
                 self._all_drivers.setdefault(tab_id, set()).add(d)
             except WebSocketBadStatusException:
@@ -133,10 +144,19 @@ class Browser(object):
     @property
     def tab_ids(self):
         """返回所有标签页id组成的列表"""
-        j = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp，因为顺序不对
+        j = self._get_tabs_info()
         return [i['id'] for i in j if i['type'] in ('page', 'webview')
                 and not i['url'].startswith(('devtools://', 'chrome-extension://'))]
 
+    def _get_tabs_info(self):
+        """返回所有target信息组成的列表，格式与/json接口一致"""
+        if self._transport != 'pipe':
+            return self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp，因为顺序不对
+
+        # 管道方式没有http接口，用cdp获取，顺序与/json不一定相同
+        return [{'id': i['targetId'], 'type': i['type'], 'url': i['url'], 'title': i['title']}
+                for i in self.run_cdp('Target.getTargets')['targetInfos']]
+
     @property
     def process_id(self):
         """返回浏览器进程id"""
@@ -149,7 +169,7 @@ class Browser(object):
         :param tab_type: tab类型，可用列表输入多个
         :return: dict格式的tab信息列表列表
         """
-        tabs = self._driver.get(f'http://{self.address}/json').json()  # 不要改用cdp
+        tabs = self._get_tabs_info()
 
         if isinstance(tab_type, str):
             tab_type = {tab_type}
@@ -216,7 +236,11 @@ class Browser(object):
         return tid
 
     def reconnect(self):
-        """断开重连"""
+        """断开重连，管道方式只能在启动浏览器时建立，连接未断开时保留原连接，已断开时报错"""
+        if self._transport == 'pipe':
+            if self._driver._stopped.is_set():
+                raise BrowserConnectError('以管道方式启动的浏览器连接已断开，无法重连，请重新启动浏览器。')
+            return
         self._driver.stop()
         BrowserDriver.BROWSERS.pop(self.id)
         self._driver = BrowserDriver(self.id, 'browser', self.address, self)
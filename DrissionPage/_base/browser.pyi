@@ -5,7 +5,7 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import List, Optional, Union, Set, Dict
+from typing import List, Optional, Union, Set, Dict, Literal
 
 from .driver import BrowserDriver, Driver
 from .._pages.chromium_page import ChromiumPage
@@ -18,6 +18,7 @@ class Browser(object):
     _driver: BrowserDriver = ...
     id: str = ...
     address: str = ...
+    _transport: Literal['websocket', 'flatten', 'pipe'] = ...
     _frames: dict = ...
     _drivers: Dict[str, Driver] = ...
     _all_drivers: Dict[str, Set[Driver]] = ...
@@ -31,6 +32,8 @@ class Browser(object):
 
     def _get_driver(self, tab_id: str, owner=None) -> Driver: ...
 
+    def _new_driver(self, tab_id: str, owner=None) -> Driver: ...
+
     def run_cdp(self, cmd, **cmd_args) -> dict: ...
 
     @property
@@ -42,6 +45,8 @@ class Browser(object):
     @property
     def tab_ids(self) -> List[str]: ...
 
+    def _get_tabs_info(self) -> List[dict]: ...
+
     @property
     def process_id(self) -> Optional[int]: ...
 
@@ -0,0 +1,305 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from collections import deque, OrderedDict
+from threading import Thread, Lock, Condition, current_thread
+from traceback import print_exc
+
+from .._functions.settings import Settings
+from ..errors import PageDisconnectedError
+
+POLICIES = ('block', 'drop_oldest', 'drop_newest', 'coalesce')
+LANE_KEYS_SIZE = 1024  # 最多记录多少个没有未完成事件的顺序键所在的线程
+
+
+class EventDispatcher(object):
+    """按顺序键把事件分给固定数量的常驻工作线程执行，同一个键的事件按到达顺序执行，不同键的事件互不阻塞
+    立即执行的事件使用单独的一个线程，不会排在普通事件后面，也不受队列上限限制
+    """
+
+    def __init__(self, driver, workers=None, order_key=None):
+        """
+        :param driver: 所属的Driver对象
+        :param workers: 普通事件的工作线程数，为None时使用Settings.event_workers
+        :param order_key: 顺序键，'domain'、事件参数名（如'requestId'、'frameId'）或接收(事件名, 参数)的方法，
+                          为None时使用Settings.event_order_key，参数中没有该键的事件按domain分配
+        """
+        self._driver = driver
+        self.workers = max(int(workers or Settings.event_workers), 1)
+        self.order_key = order_key or Settings.event_order_key
+        self.max_size = Settings.event_queue_size
+        self.policy = Settings.event_queue_policy
+        self.limits = {}
+        self.dropped = {}
+        self.coalesced = {}
+        self.blocked = 0
+        self.on_drop = None  # 有事件被丢弃或合并时在锁内执行的方法，接收事件名，不能执行cdp命令或等待其它锁
+
+        self._lock = Lock()
+        self._space = Condition(self._lock)
+        # 最后一个是立即执行事件专用的
+        self._queues = [deque() for _ in range(self.workers + 1)]
+        self._conditions = [Condition(self._lock) for _ in range(self.workers + 1)]
+        self._threads = [None] * (self.workers + 1)
+        self._size = 0
+        self._method_sizes = {}
+        self._slots = {}
+        self._seq = 0
+        self._lanes = OrderedDict()  # {顺序键: [线程序号, 未执行完的事件数]}，按最近使用排序
+        self._lane_keys = [0] * self.workers  # 每个线程分到的顺序键数
+
+    def set_limit(self, size, policy='drop_oldest', method=None, coalesce_key=None):
+        """设置普通事件队列的上限和超出上限时的处理方式
+        :param size: 最多积压的事件数，为0或None时不限制
+        :param policy: 'block'：接收线程等待，等待期间命令结果也不会被接收，回调中执行cdp命令时不要使用
+                       'drop_oldest'：丢弃最早的事件
+                       'drop_newest'：丢弃新到的事件
+                       'coalesce'：队列中已有相同事件时，用新事件的参数替换旧事件，不改变排队位置
+        :param method: 只限制此事件，为None时设置整个Driver的上限
+        :param coalesce_key: coalesce时用于区分事件的参数名，为None时同名事件只保留一个
+        :return: None
+        """
+        if policy not in POLICIES:
+            raise ValueError(f'policy只能是{POLICIES}之一。')
+        with self._lock:
+            if method is None:
+                self.max_size = size or 0
+                self.policy = policy
+            elif size or policy == 'coalesce':
+                self.limits[method] = (size or 0, policy, coalesce_key)
+            else:
+                self.limits.pop(method, None)
+            self._space.notify_all()
+
+    def counters(self):
+        """返回队列计数
+        :return: {'queued': 积压事件数, 'blocked': 接收线程等待次数, 'dropped': {事件名: 丢弃数}, 'coalesced': {事件名: 合并数}}
+        """
+        with self._lock:
+            return {'queued': self._size, 'blocked': self.blocked,
+                    'dropped': dict(self.dropped), 'coalesced': dict(self.coalesced)}
+
+    def dispatch(self, method, params, immediate=False):
+        """把一个事件交给对应的工作线程
+        :param method: 事件名
+        :param params: 事件参数
+        :param immediate: 是否立即执行的事件
+        :return: None
+        """
+        key = None if immediate or self.workers == 1 else self._get_key(method, params)
+        with self._lock:
+            index = self.workers
+            entry = None
+            if not immediate:
+                size, policy, coalesce_key = self.limits.get(method) or (self.max_size, self.policy, None)
+                slot = None
+                if policy == 'coalesce':
+                    slot = (method, params.get(coalesce_key) if coalesce_key else None)
+                    entry = self._slots.get(slot)
+                    if entry is not None:
+                        entry[2] = params
+                        self.coalesced[method] = self.coalesced.get(method, 0) + 1
+                        self._notify_drop(method)
+                        return
+
+                if not self._make_room(method, size, policy, method in self.limits):
+                    return
+                # 在腾出位置后再分配，block策略等待期间其它键可能已被移除
+                index = 0 if key is None else self._get_lane(key)
+                self._seq += 1
+                entry = [self._seq, method, params, slot, key]
+                if slot is not None:
+                    self._slots[slot] = entry
+                self._size += 1
+                self._method_sizes[method] = self._method_sizes.get(method, 0) + 1
+
+            self._queues[index].append(entry or [0, method, params, None, None])
+            self._conditions[index].notify()
+
+        if self._threads[index] is None or not self._threads[index].is_alive():
+            self._start_worker(index)
+
+    def is_alive(self):
+        """返回是否还有工作线程在运行，不包括当前线程"""
+        me = current_thread()
+        return any(th is not None and th is not me and th.is_alive() for th in self._threads)
+
+    def clear(self):
+        """清空所有未执行的事件，唤醒等待的接收线程"""
+        with self._lock:
+            for q in self._queues:
+                for e in q:
+                    self._release_key(e[4])
+                q.clear()
+            self._size = 0
+            self._method_sizes.clear()
+            self._slots.clear()
+            self._space.notify_all()
+
+    def _make_room(self, method, size, policy, by_method):
+        """在锁内调用，按策略为新事件腾出位置
+        :param method: 新事件名
+        :param size: 上限，为0时不限制
+        :param policy: 超出上限时的处理方式
+        :param by_method: 上限是否只针对此事件
+        :return: 是否可以放入新事件
+        """
+        if not size:
+            return True
+
+        def full():
+            return (self._method_sizes.get(method, 0) if by_method else self._size) >= size
+
+        if not full():
+            return True
+        if policy == 'drop_newest':
+            self.dropped[method] = self.dropped.get(method, 0) + 1
+            self._notify_drop(method)
+            return False
+
+        if policy == 'block':
+            self.blocked += 1
+            while full():
+                if self._driver._stopped.is_set():
+                    return False
+                self._space.wait(1)
+            return True
+
+        # drop_oldest和coalesce都丢弃最早的事件
+        oldest = None
+        for q in self._queues[:-1]:
+            for e in q:
+                if not by_method or e[1] == method:
+                    if oldest is None or e[0] < oldest[1][0]:
+                        oldest = (q, e)
+                    break
+        if oldest:
+            q, e = oldest
+            q.remove(e)
+            self._take(e)
+            self._release_key(e[4])
+            self.dropped[e[1]] = self.dropped.get(e[1], 0) + 1
+            self._notify_drop(e[1])
+        return True
+
+    def _notify_drop(self, method):
+        """在锁内调用，通知有事件未被执行
+        :param method: 事件名
+        :return: None
+        """
+        if self.on_drop is not None:
+            try:
+                self.on_drop(method)
+            except Exception:
+                print_exc()
+
+    def _take(self, entry):
+        """在锁内调用，更新取出事件后的计数
+        :param entry: 取出的事件
+        :return: None
+        """
+        if not entry[0]:
+            return
+        self._size -= 1
+        self._method_sizes[entry[1]] -= 1
+        if entry[3] is not None and self._slots.get(entry[3]) is entry:
+            self._slots.pop(entry[3])
+        self._space.notify()
+
+    def _get_lane(self, key):
+        """在锁内调用，为顺序键的一个新事件返回线程序号，新键分给积压事件最少的线程，积压相同时分给键最少的
+        键有未执行完的事件时一直留在原线程，保证顺序；超过LANE_KEYS_SIZE个键时移除最久未使用且没有未完成事件的键
+        :param key: 顺序键
+        :return: 线程序号
+        """
+        lane = self._lanes.get(key)
+        if lane is not None:
+            self._lanes.move_to_end(key)
+            lane[1] += 1
+            return lane[0]
+
+        index = min(range(self.workers), key=lambda i: (len(self._queues[i]), self._lane_keys[i], i))
+        self._lanes[key] = [index, 1]
+        self._lane_keys[index] += 1
+        if len(self._lanes) > LANE_KEYS_SIZE:
+            for k, lane in self._lanes.items():
+                if not lane[1]:
+                    del self._lanes[k]
+                    self._lane_keys[lane[0]] -= 1
+                    break
+        return index
+
+    def _release_key(self, key):
+        """在锁内调用，顺序键的一个事件执行完或被丢弃后调用，键数超过上限时移除没有未完成事件的键
+        :param key: 顺序键，为None时不处理
+        :return: None
+        """
+        lane = self._lanes.get(key) if key is not None else None
+        if lane is None:
+            return
+        lane[1] -= 1
+        if not lane[1] and len(self._lanes) > LANE_KEYS_SIZE:
+            del self._lanes[key]
+            self._lane_keys[lane[0]] -= 1
+
+    def _get_key(self, method, params):
+        """获取事件的顺序键
+        :param method: 事件名
+        :param params: 事件参数
+        :return: 顺序键
+        """
+        if self.order_key == 'domain':
+            return method.split('.', 1)[0]
+        if callable(self.order_key):
+            return self.order_key(method, params)
+        return params.get(self.order_key) or method.split('.', 1)[0]
+
+    def _start_worker(self, index):
+        """启动一个工作线程
+        :param index: 线程序号
+        :return: None
+        """
+        with self._lock:
+            if self._threads[index] is None or not self._threads[index].is_alive():
+                handlers = (self._driver.immediate_event_handlers if index == self.workers
+                            else self._driver.event_handlers)
+                th = Thread(target=self._work, args=(index, handlers), daemon=True)
+                self._threads[index] = th
+                th.start()
+
+    def _work(self, index, handlers):
+        """工作线程方法，执行时才查找回调，已取消的回调不会再执行
+        :param index: 线程序号
+        :param handlers: 事件名和回调方法组成的dict
+        :return: None
+        """
+        stopped = self._driver._stopped
+        q = self._queues[index]
+        condition = self._conditions[index]
+        key = None  # 上一个执行完的事件的顺序键
+        while not stopped.is_set():
+            with self._lock:
+                if key is not None:
+                    self._release_key(key)
+                    key = None
+                if not q:
+                    condition.wait(1)
+                    continue
+                entry = q.popleft()
+                self._take(entry)
+                key = entry[4]
+
+            function = handlers.get(entry[1])
+            if function:
+                try:
+                    function(**entry[2])
+                except PageDisconnectedError:
+                    pass
+                except Exception:
+                    if stopped.is_set():
+                        return
+                    print_exc()
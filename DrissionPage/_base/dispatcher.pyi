@@ -0,0 +1,75 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from collections import deque, OrderedDict
+from threading import Thread, Lock, Condition
+from typing import Union, Callable, List, Optional, Any, Hashable, Dict, Tuple, Literal
+
+from .driver import Driver
+
+POLICIES: Tuple[str, ...] = ...
+LANE_KEYS_SIZE: int = ...
+POLICY = Literal['block', 'drop_oldest', 'drop_newest', 'coalesce']
+
+
+class EventDispatcher(object):
+    _driver: Driver = ...
+    workers: int = ...
+    order_key: Union[str, Callable[[str, dict], Hashable]] = ...
+    max_size: int = ...
+    policy: POLICY = ...
+    limits: Dict[str, Tuple[int, POLICY, Optional[str]]] = ...
+    dropped: Dict[str, int] = ...
+    coalesced: Dict[str, int] = ...
+    blocked: int = ...
+    on_drop: Optional[Callable[[str], Any]] = ...
+    _lock: Lock = ...
+    _space: Condition = ...
+    _queues: List[deque] = ...
+    _conditions: List[Condition] = ...
+    _threads: List[Optional[Thread]] = ...
+    _size: int = ...
+    _method_sizes: Dict[str, int] = ...
+    _slots: Dict[Tuple[str, Any], list] = ...
+    _seq: int = ...
+    _lanes: OrderedDict = ...
+    _lane_keys: List[int] = ...
+
+    def __init__(self,
+                 driver: Driver,
+                 workers: int = None,
+                 order_key: Union[str, Callable[[str, dict], Hashable]] = None): ...
+
+    def set_limit(self,
+                  size: Optional[int],
+                  policy: POLICY = 'drop_oldest',
+                  method: str = None,
+                  coalesce_key: str = None) -> None: ...
+
+    def counters(self) -> dict: ...
+
+    def dispatch(self, method: str, params: dict, immediate: bool = False) -> None: ...
+
+    def is_alive(self) -> bool: ...
+
+    def clear(self) -> None: ...
+
+    def _make_room(self, method: str, size: int, policy: POLICY, by_method: bool) -> bool: ...
+
+    def _notify_drop(self, method: str) -> None: ...
+
+    def _take(self, entry: list) -> None: ...
+
+    def _get_lane(self, key: Hashable) -> int: ...
+
+    def _release_key(self, key: Optional[Hashable]) -> None: ...
+
+    def _get_key(self, method: str, params: dict) -> Any: ...
+
+    def _start_worker(self, index: int) -> None: ...
+
+    def _work(self, index: int, handlers: dict) -> None: ...
@@ -5,19 +5,149 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from json import dumps, loads, JSONDecodeError
-from queue import Queue, Empty
-from threading import Thread, Event
+from json import dumps
+from os import read, write, close
+from select import select
+from threading import Thread, Event, Lock
 from time import perf_counter, sleep
 
 from requests import Session
 from websocket import (WebSocketTimeoutException, WebSocketConnectionClosedException, create_connection,
                        WebSocketException, WebSocketBadStatusException)
 
+from .dispatcher import EventDispatcher
+from .stats import DriverStats
+from .._functions.json_codec import get_codec, peek_event
 from .._functions.settings import Settings
 from ..errors import PageDisconnectedError
 
 
+class PendingResult(object):
+    """等待返回结果的cdp命令，由接收线程直接唤醒等待者"""
+    __slots__ = ('id', 'method', 'result', '_lock')
+
+    def __init__(self, ws_id, method):
+        """
+        :param ws_id: 命令id
+        :param method: cdp方法名
+        """
+        self.id = ws_id
+        self.method = method
+        self.result = None
+        self._lock = Lock()
+        self._lock.acquire()
+
+    def set_result(self, result):
+        """设置结果并唤醒等待者，只有第一次设置有效
+        :param result: 结果数据
+        :return: None
+        """
+        if self.result is None:
+            self.result = result
+            try:
+                self._lock.release()
+            except RuntimeError:
+                pass
+
+    def wait(self, timeout=None):
+        """等待结果
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: 是否已获得结果
+        """
+        if self._lock.acquire(timeout=-1 if timeout is None else max(timeout, 0)):
+            self._lock.release()
+            return True
+        return False
+
+
+class PipeConnection(object):
+    """通过--remote-debugging-pipe与浏览器通讯的连接，接口与websocket连接一致，信息以\\0分隔"""
+    CONNECTIONS = {}
+
+    def __init__(self, read_fd, write_fd, process=None):
+        """
+        :param read_fd: 读取浏览器信息的管道
+        :param write_fd: 向浏览器写入信息的管道
+        :param process: 浏览器进程对象
+        """
+        self.id = None
+        self.process = process
+        self.connected = True
+        self._read_fd = read_fd
+        self._write_fd = write_fd
+        self._buffer = bytearray()
+        self._searched = 0
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f'<PipeConnection {self.id}>'
+
+    def send(self, data):
+        """发送一条信息
+        :param data: json文本
+        :return: None
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = memoryview(data + b'\0')
+        with self._lock:
+            if not self.connected:
+                raise ConnectionResetError('浏览器管道已关闭。')
+            while data:
+                data = data[write(self._write_fd, data):]
+
+    def recv(self, timeout=None):
+        """接收一条完整信息
+        :param timeout: 超时时间（秒），为None表示无限
+        :return: json文本
+        """
+        end_time = perf_counter() + timeout if timeout is not None else None
+        while True:
+            i = self._buffer.find(b'\0', self._searched)
+            if i >= 0:
+                msg = self._buffer[:i].decode('utf-8')
+                del self._buffer[:i + 1]
+                self._searched = 0
+                return msg
+            self._searched = len(self._buffer)
+
+            # 分段等待，使close()能在1秒内结束接收线程
+            if not select((self._read_fd,), (), (), 1)[0]:
+                if not self.connected:
+                    self._close_read()
+                    raise ConnectionResetError('浏览器管道已关闭。')
+                if end_time is not None and perf_counter() >= end_time:
+                    raise TimeoutError
+                continue
+
+            chunk = read(self._read_fd, 65536)
+            if not chunk:
+                self.close()
+                self._close_read()
+                raise ConnectionResetError('浏览器管道已关闭。')
+            self._buffer.extend(chunk)
+
+    def close(self):
+        """关闭连接，读取端在接收线程退出时关闭"""
+        with self._lock:
+            if not self.connected:
+                return
+            self.connected = False
+            PipeConnection.CONNECTIONS.pop(self.id, None)
+            try:
+                close(self._write_fd)
+            except OSError:
+                pass
+
+    def _close_read(self):
+        if self._read_fd is not None:
+            try:
+                close(self._read_fd)
+            except OSError:
+                pass
+            self._read_fd = None
+
+
 class Driver(object):
     def __init__(self, tab_id, tab_type, address, owner=None):
         """
@@ -30,26 +160,26 @@ class Driver(object):
         self.address = address
         self.type = tab_type
         self.owner = owner
-        # self._debug = False
         self.alert_flag = False  # 标记alert出现，跳过一条请求后复原
 
         self._websocket_url = f'ws://{address}/devtools/{tab_type}/{tab_id}'
         self._cur_id = 0
         self._ws = None
+        self._codec, self._loads, self._dumps = get_codec(Settings.json_codec)
 
         self._recv_th = Thread(target=self._recv_loop)
-        self._handle_event_th = Thread(target=self._handle_event_loop)
         self._recv_th.daemon = True
-        self._handle_event_th.daemon = True
-        self._handle_immediate_event_th = None
 
         self._stopped = Event()
 
         self.event_handlers = {}
         self.immediate_event_handlers = {}
         self.method_results = {}
-        self.event_queue = Queue()
-        self.immediate_event_queue = Queue()
+        self.dispatcher = EventDispatcher(self)
+        self._observers = ()
+        self._stats = None
+        if Settings.cdp_stats:
+            self.enable_stats()
 
         self.start()
 
@@ -59,51 +189,75 @@ class Driver(object):
         :param timeout: 超时时间，为None表示无限
         :return: 浏览器返回的数据
         """
+        pending = self._post(message)
+        if pending is None:
+            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+        if timeout == 0:
+            self.method_results.pop(pending.id, None)
+            return {'id': pending.id, 'result': {}}
+
+        end_time = perf_counter() + timeout if timeout is not None else None
+        return self._get_result(pending, end_time)
+
+    def _post(self, message):
+        """发送信息到浏览器，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: 等待结果的PendingResult对象，发送失败返回None
+        """
         self._cur_id += 1
         ws_id = self._cur_id
         message['id'] = ws_id
-        message_json = dumps(message)
-
-        # if self._debug:
-        #     if self._debug is True or (isinstance(self._debug, str) and
-        #                                message.get('method', '').startswith(self._debug)):
-        #         print(f'发> {message_json}')
-        #     elif isinstance(self._debug, (list, tuple, set)):
-        #         for m in self._debug:
-        #             if message.get('method', '').startswith(m):
-        #                 print(f'发> {message_json}')
-        #                 break
+        message_json = self._dumps(message)
 
-        end_time = perf_counter() + timeout if timeout is not None else None
-        self.method_results[ws_id] = Queue()
+        pending = PendingResult(ws_id, message['method'])
+        self.method_results[ws_id] = pending
+        for observer in self._observers:
+            observer.on_send(self, ws_id, message['method'], message_json)
         try:
             self._ws.send(message_json)
-            if timeout == 0:
-                self.method_results.pop(ws_id, None)
-                return {'id': ws_id, 'result': {}}
+            return pending
 
-        except (OSError, WebSocketConnectionClosedException):
+        except (OSError, WebSocketConnectionClosedException, AttributeError):
             self.method_results.pop(ws_id, None)
-            return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+            return None
 
-        while not self._stopped.is_set():
-            try:
-                result = self.method_results[ws_id].get(timeout=.2)
+    def _get_result(self, pending, end_time=None):
+        """等待并获取已发送信息的返回结果
+        :param pending: 发送信息时获得的PendingResult对象
+        :param end_time: 结束时间点，为None表示无限
+        :return: 浏览器返回的数据
+        """
+        if self.alert_flag and pending.method.startswith(('Input.', 'Runtime.')):
+            # alert已存在时，这些命令通常不会返回，只等待很短时间
+            end_time = perf_counter() + .2 if end_time is None else min(end_time, perf_counter() + .2)
+
+        while True:
+            # 结果和断开连接都会直接唤醒等待，分段等待只用于防止断开时漏掉唤醒
+            timeout = 1 if end_time is None else min(end_time - perf_counter(), 1)
+            if pending.wait(timeout):
+                return pending.result
+
+            if self._stopped.is_set():
+                self.method_results.pop(pending.id, None)
+                return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+
+            if end_time is not None and perf_counter() >= end_time:
+                self.method_results.pop(pending.id, None)
+                for observer in self._observers:
+                    observer.on_timeout(self, pending.id, pending.method)
+                return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
+                    if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
+
+    def _wake_pending(self, result, methods=None):
+        """以指定结果唤醒等待中的命令
+        :param result: 设置给命令的结果
+        :param methods: 只唤醒以这些字符串开头的cdp方法，为None时唤醒全部
+        :return: None
+        """
+        for ws_id, pending in list(self.method_results.items()):
+            if methods is None or pending.method.startswith(methods):
                 self.method_results.pop(ws_id, None)
-                return result
-
-            except Empty:
-                if self.alert_flag and message['method'].startswith(('Input.', 'Runtime.')):
-                    return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'}
-
-                if timeout is not None and perf_counter() > end_time:
-                    self.method_results.pop(ws_id, None)
-                    return {'error': {'message': 'alert exists.'}, 'type': 'alert_exists'} \
-                        if self.alert_flag else {'error': {'message': 'timeout'}, 'type': 'timeout'}
-
-                continue
-
-        return {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+                pending.set_result(result)
 
     def _recv_loop(self):
         """接收浏览器信息的守护线程方法"""
@@ -111,71 +265,67 @@ class Driver(object):
             try:
                 # self._ws.settimeout(1)
                 msg_json = self._ws.recv()
-                msg = loads(msg_json)
             except WebSocketTimeoutException:
                 continue
-            except (WebSocketException, OSError, WebSocketConnectionClosedException, JSONDecodeError):
+            except (WebSocketException, OSError, WebSocketConnectionClosedException):
                 self._stop()
                 return
 
-            # if self._debug:
-            #     if self._debug is True or 'id' in msg or (isinstance(self._debug, str)
-            #                                               and msg.get('method', '').startswith(self._debug)):
-            #         print(f'<收 {msg_json}')
-            #     elif isinstance(self._debug, (list, tuple, set)):
-            #         for m in self._debug:
-            #             if msg.get('method', '').startswith(m):
-            #                 print(f'<收 {msg_json}')
-            #                 break
-
-            if 'method' in msg:
-                if msg['method'].startswith('Page.javascriptDialog'):
-                    self.alert_flag = msg['method'].endswith('Opening')
-                function = self.immediate_event_handlers.get(msg['method'])
-                if function:
-                    self._handle_immediate_event(function, msg['params'])
-                else:
-                    self.event_queue.put(msg)
-
-            elif msg.get('id') in self.method_results:
-                self.method_results[msg['id']].put(msg)
-
-            # elif self._debug:
-            #     print(f'未知信息：{msg}')
-
-    def _handle_event_loop(self):
-        """当接收到浏览器信息，执行已绑定的方法"""
-        while not self._stopped.is_set():
-            try:
-                event = self.event_queue.get(timeout=1)
-            except Empty:
+            method, session_id = peek_event(msg_json)
+            if method and session_id is not False and not self._is_wanted(method, session_id):
+                self._observe_recv(session_id, msg_json, None)
                 continue
+            try:
+                msg = self._loads(msg_json)
+            except ValueError:
+                self._stop()
+                return
 
-            function = self.event_handlers.get(event['method'])
-            if function:
-                function(**event['params'])
-
-            self.event_queue.task_done()
+            self._observe_recv(msg.get('sessionId'), msg_json, msg)
+            self._handle_msg(msg)
 
-    def _handle_immediate_event_loop(self):
-        while not self._stopped.is_set() and not self.immediate_event_queue.empty():
-            function, kwargs = self.immediate_event_queue.get(timeout=1)
-            try:
-                function(**kwargs)
-            except PageDisconnectedError:
-                pass
+    def _observe_recv(self, session_id, raw, msg):
+        """把收到的信息交给观察者
+        :param session_id: 信息所属的sessionId
+        :param raw: 收到的json文本
+        :param msg: 解析后的信息，没有完整解析的事件为None
+        :return: None
+        """
+        for observer in self._observers:
+            observer.on_recv(self, raw, msg)
+
+    def _is_wanted(self, method, session_id=None):
+        """判断事件是否需要完整解析，没有绑定处理方法的事件直接丢弃
+        :param method: 事件名
+        :param session_id: 事件所属的sessionId
+        :return: bool
+        """
+        return (method in self.event_handlers or method in self.immediate_event_handlers
+                or method.startswith(('Page.javascriptDialog', 'Target.')))
 
-    def _handle_immediate_event(self, function, kwargs):
-        """处理立即执行的动作
-        :param function: 要运行下方法
-        :param kwargs: 方法参数
+    def _handle_msg(self, msg):
+        """处理一条已解析的浏览器信息，把事件放入队列或唤醒等待结果的命令
+        :param msg: 信息数据
         :return: None
         """
-        self.immediate_event_queue.put((function, kwargs))
-        if self._handle_immediate_event_th is None or not self._handle_immediate_event_th.is_alive():
-            self._handle_immediate_event_th = Thread(target=self._handle_immediate_event_loop)
-            self._handle_immediate_event_th.daemon = True
-            self._handle_immediate_event_th.start()
+        if 'method' in msg:
+            if msg['method'].startswith('Page.javascriptDialog'):
+                self.alert_flag = msg['method'].endswith('Opening')
+                if self.alert_flag:
+                    self._wake_pending({'error': {'message': 'alert exists.'}, 'type': 'alert_exists'},
+                                       ('Input.', 'Runtime.'))
+            if msg['method'] in self.immediate_event_handlers:
+                self.dispatcher.dispatch(msg['method'], msg['params'], immediate=True)
+            elif msg['method'] in self.event_handlers:
+                self.dispatcher.dispatch(msg['method'], msg['params'])
+
+        else:
+            pending = self.method_results.pop(msg.get('id'), None)
+            if pending:
+                pending.set_result(msg)
+
+            # elif self._debug:
+            #     print(f'未知信息：{msg}')
 
     def run(self, _method, **kwargs):
         """执行cdp方法
@@ -188,10 +338,53 @@ class Driver(object):
 
         timeout = kwargs.pop('_timeout', Settings.cdp_timeout)
         result = self._send({'method': _method, 'params': kwargs}, timeout=timeout)
+        return self._make_result(result, _method, kwargs, timeout)
+
+    def run_many(self, cmds, timeout=None):
+        """批量执行cdp方法，所有命令连续发出后再统一收集结果，只需等待一次往返时间
+        :param cmds: 命令组成的列表，每项为(方法名, 参数dict)元组或方法名字符串，参数中可用_timeout单独设置超时
+        :param timeout: 默认超时时间（秒），为None时使用Settings.cdp_timeout
+        :return: 执行结果组成的列表，顺序与cmds一致，每项格式与run()返回值一致
+        """
+        if self._stopped.is_set():
+            return [{'error': 'connection disconnected', 'type': 'connection_error'} for _ in cmds]
+
+        timeout = Settings.cdp_timeout if timeout is None else timeout
+        sent = []
+        for cmd in cmds:
+            if isinstance(cmd, str):
+                method, kwargs = cmd, {}
+            else:
+                method, kwargs = cmd[0], dict(cmd[1]) if len(cmd) > 1 and cmd[1] else {}
+            cmd_timeout = kwargs.pop('_timeout', timeout)
+            sent.append((self._post({'method': method, 'params': kwargs}), method, kwargs, cmd_timeout))
+
+        begin = perf_counter()
+        results = []
+        for pending, method, kwargs, cmd_timeout in sent:
+            if pending is None:
+                result = {'error': {'message': 'connection disconnected'}, 'type': 'connection_error'}
+            elif cmd_timeout == 0:
+                self.method_results.pop(pending.id, None)
+                result = {'id': pending.id, 'result': {}}
+            else:
+                result = self._get_result(pending, None if cmd_timeout is None else begin + cmd_timeout)
+            results.append(self._make_result(result, method, kwargs, cmd_timeout))
+        return results
+
+    @staticmethod
+    def _make_result(result, method, kwargs, timeout):
+        """把浏览器返回的数据整理成run()的返回格式
+        :param result: 浏览器返回的数据
+        :param method: cdp方法名
+        :param kwargs: cdp参数
+        :param timeout: 超时时间
+        :return: 执行结果
+        """
         if 'result' not in result and 'error' in result:
             kwargs['_timeout'] = timeout
             return {'error': result['error']['message'], 'type': result.get('type', 'call_method_error'),
-                    'method': _method, 'args': kwargs}
+                    'method': method, 'args': kwargs}
         else:
             return result['result']
 
@@ -206,13 +399,12 @@ class Driver(object):
             else:
                 return
         self._recv_th.start()
-        self._handle_event_th.start()
         return True
 
     def stop(self):
         """中断连接"""
         self._stop()
-        while self._handle_event_th.is_alive() or self._recv_th.is_alive():
+        while self._recv_th.is_alive() or self.dispatcher.is_alive():
             sleep(.1)
         return True
 
@@ -222,9 +414,7 @@ class Driver(object):
             return False
 
         self._stopped.set()
-        if self._ws:
-            self._ws.close()
-            self._ws = None
+        self._close_connection()
 
         # try:
         #     while not self.event_queue.empty():
@@ -237,12 +427,60 @@ class Driver(object):
         #     pass
 
         self.event_handlers.clear()
-        self.method_results.clear()
-        self.event_queue.queue.clear()
+        self._wake_pending({'error': {'message': 'connection disconnected'}, 'type': 'connection_error'})
+        self.dispatcher.clear()
 
         if hasattr(self.owner, '_on_disconnect'):
             self.owner._on_disconnect()
 
+    def _close_connection(self):
+        """关闭连接"""
+        if self._ws:
+            self._ws.close()
+            self._ws = None
+
+    def add_observer(self, observer):
+        """添加观察收发信息的对象，它需有on_send(driver, msg_id, method, raw)、on_recv(driver, raw, msg)、
+        on_timeout(driver, msg_id, method)三个方法，在收发线程中执行，应尽快返回
+        :param observer: 观察者对象
+        :return: None
+        """
+        if observer not in self._observers:
+            self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """移除观察者
+        :param observer: 观察者对象
+        :return: None
+        """
+        self._observers = tuple(i for i in self._observers if i is not observer)
+
+    def enable_stats(self, on_off=True):
+        """开启或关闭cdp调用统计，关闭时丢弃已有统计结果
+        :param on_off: 开或关
+        :return: None
+        """
+        if on_off and self._stats is None:
+            self._stats = DriverStats()
+            self.add_observer(self._stats)
+        elif not on_off and self._stats is not None:
+            self.remove_observer(self._stats)
+            self._stats = None
+
+    def stats(self, as_json=False, reset=False):
+        """返回cdp调用统计结果，包括各方法调用次数、延迟直方图、超时次数、收发数据量，各事件数量，以及事件队列计数
+        :param as_json: 是否返回json文本
+        :param reset: 获取后是否清空统计
+        :return: 统计结果dict或json文本，未开启统计时返回None
+        """
+        if self._stats is None:
+            return None
+        r = self._stats.as_dict()
+        r['queue'] = self.dispatcher.counters()
+        if reset:
+            self._stats.reset()
+        return dumps(r, ensure_ascii=False, indent=2) if as_json else r
+
     def set_callback(self, event, callback, immediate=False):
         """绑定cdp event和回调方法
         :param event: cdp event
@@ -270,6 +508,7 @@ class BrowserDriver(Driver):
             return
         self._created = True
         BrowserDriver.BROWSERS[tab_id] = self
+        self.sessions = {}
         super().__init__(tab_id, tab_type, address, owner)
         self._control_session = Session()
         self._control_session.trust_env = False
@@ -277,7 +516,112 @@ class BrowserDriver(Driver):
     def __repr__(self):
         return f'<BrowserDriver {self.id}>'
 
+    def start(self):
+        """启动连接，由本程序以管道方式启动的浏览器直接使用其管道"""
+        pipe = PipeConnection.CONNECTIONS.get(self.id)
+        if pipe is None:
+            return super().start()
+        self._stopped.clear()
+        self._ws = pipe
+        self._recv_th.start()
+        return True
+
     def get(self, url):
         r = self._control_session.get(url, headers={'Connection': 'close'})
         r.close()
         return r
+
+    def _observe_recv(self, session_id, raw, msg):
+        """把收到的信息交给观察者，带sessionId的信息交给对应的SessionDriver的观察者
+        :param session_id: 信息所属的sessionId
+        :param raw: 收到的json文本
+        :param msg: 解析后的信息，没有完整解析的事件为None
+        :return: None
+        """
+        if session_id:
+            driver = self.sessions.get(session_id)
+            if driver:
+                driver._observe_recv(None, raw, msg)
+            return
+        super()._observe_recv(session_id, raw, msg)
+
+    def _is_wanted(self, method, session_id=None):
+        """判断事件是否需要完整解析，带sessionId的事件由对应的SessionDriver判断
+        :param method: 事件名
+        :param session_id: 事件所属的sessionId
+        :return: bool
+        """
+        if session_id:
+            driver = self.sessions.get(session_id)
+            return driver is not None and driver._is_wanted(method)
+        return super()._is_wanted(method)
+
+    def _handle_msg(self, msg):
+        """处理一条已解析的浏览器信息，带sessionId的信息交给对应的SessionDriver处理
+        :param msg: 信息数据
+        :return: None
+        """
+        session_id = msg.get('sessionId')
+        if session_id:
+            driver = self.sessions.get(session_id)
+            if driver:
+                driver._handle_msg(msg)
+            return
+
+        if msg.get('method') == 'Target.detachedFromTarget':
+            driver = self.sessions.get(msg['params']['sessionId'])
+            if driver:
+                driver._stop()
+        super()._handle_msg(msg)
+
+    def _stop(self):
+        """中断连接，同时中断所有附着在此连接上的session"""
+        for driver in list(self.sessions.values()):
+            driver._stop()
+        return super()._stop()
+
+
+class SessionDriver(Driver):
+    """通过Target.attachToTarget(flatten=True)附着在BrowserDriver连接上的Driver，不单独建立websocket连接"""
+
+    def __init__(self, tab_id, tab_type, address, owner=None, browser_driver=None):
+        """
+        :param tab_id: 标签页id
+        :param tab_type: 标签页类型
+        :param address: 浏览器连接地址
+        :param owner: 创建这个驱动的对象
+        :param browser_driver: 所使用的BrowserDriver对象
+        """
+        self.session_id = None
+        self._browser_driver = browser_driver
+        super().__init__(tab_id, tab_type, address, owner)
+
+    def __repr__(self):
+        return f'<SessionDriver {self.id} {self.session_id}>'
+
+    def start(self):
+        """附着到目标，事件处理线程在收到事件时启动"""
+        self._stopped.clear()
+        r = self._browser_driver.run('Target.attachToTarget', targetId=self.id, flatten=True)
+        if 'error' in r:
+            self._stopped.set()
+            return
+        self.session_id = r['sessionId']
+        self._ws = self._browser_driver._ws
+        self._browser_driver.sessions[self.session_id] = self
+        return True
+
+    def _post(self, message):
+        """发送信息到浏览器，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: 等待结果的PendingResult对象，发送失败返回None
+        """
+        message['sessionId'] = self.session_id
+        return super()._post(message)
+
+    def _close_connection(self):
+        """从目标分离，共用的websocket连接不关闭"""
+        self._browser_driver.sessions.pop(self.session_id, None)
+        if self._ws and not self._browser_driver._stopped.is_set():
+            self._browser_driver.run('Target.detachFromTarget', sessionId=self.session_id, _timeout=0)
+        self._ws = None
@@ -5,14 +5,16 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from queue import Queue
-from threading import Thread, Event
-from typing import Union, Callable, Dict, Optional
+from subprocess import Popen
+from threading import Thread, Event, Lock
+from typing import Union, Callable, Dict, Optional, List, Tuple, Any
 
 from requests import Response, Session
 from websocket import WebSocket
 
 from .browser import Browser
+from .dispatcher import EventDispatcher
+from .stats import DriverStats
 
 
 class GenericAttr(object):
@@ -23,6 +25,41 @@ class GenericAttr(object):
     def __setattr__(self, key: str, value: Callable) -> None: ...
 
 
+class PendingResult(object):
+    id: int
+    method: str
+    result: Optional[dict]
+    _lock: Lock
+
+    def __init__(self, ws_id: int, method: str): ...
+
+    def set_result(self, result: dict) -> None: ...
+
+    def wait(self, timeout: float = None) -> bool: ...
+
+
+class PipeConnection(object):
+    CONNECTIONS: Dict[str, PipeConnection] = ...
+    id: Optional[str] = ...
+    process: Optional[Popen] = ...
+    connected: bool = ...
+    _read_fd: Optional[int] = ...
+    _write_fd: int = ...
+    _buffer: bytearray = ...
+    _searched: int = ...
+    _lock: Lock = ...
+
+    def __init__(self, read_fd: int, write_fd: int, process: Popen = None): ...
+
+    def send(self, data: Union[str, bytes]) -> None: ...
+
+    def recv(self, timeout: float = None) -> str: ...
+
+    def close(self) -> None: ...
+
+    def _close_read(self) -> None: ...
+
+
 class Driver(object):
     id: str
     address: str
@@ -31,37 +68,60 @@ class Driver(object):
     alert_flag: bool
     _websocket_url: str
     _cur_id: int
-    _ws: Optional[WebSocket]
+    _ws: Union[WebSocket, PipeConnection, None]
+    _codec: str
+    _loads: Callable[[Union[str, bytes]], dict]
+    _dumps: Callable[[dict], str]
     _recv_th: Thread
-    _handle_event_th: Thread
-    _handle_immediate_event_th: Optional[Thread]
     _stopped: Event
     event_handlers: dict
     immediate_event_handlers: dict
-    method_results: dict
-    event_queue: Queue
-    immediate_event_queue: Queue
+    method_results: Dict[int, PendingResult]
+    dispatcher: EventDispatcher
+    _observers: Tuple[Any, ...]
+    _stats: Optional[DriverStats]
 
     def __init__(self, tab_id: str, tab_type: str, address: str, owner=None): ...
 
     def _send(self, message: dict, timeout: float = None) -> dict: ...
 
+    def _post(self, message: dict) -> Optional[PendingResult]: ...
+
+    def _get_result(self, pending: PendingResult, end_time: float = None) -> dict: ...
+
+    def _wake_pending(self, result: dict, methods: Union[str, Tuple[str, ...], None] = None) -> None: ...
+
     def _recv_loop(self) -> None: ...
 
-    def _handle_event_loop(self) -> None: ...
+    def _observe_recv(self, session_id: Optional[str], raw: str, msg: Optional[dict]) -> None: ...
 
-    def _handle_immediate_event_loop(self): ...
+    def _is_wanted(self, method: str, session_id: Optional[str] = None) -> bool: ...
 
-    def _handle_immediate_event(self, function: Callable, kwargs: dict): ...
+    def _handle_msg(self, msg: dict) -> None: ...
 
     def run(self, _method: str, **kwargs) -> dict: ...
 
+    def run_many(self, cmds: List[Union[str, Tuple[str, dict]]], timeout: float = None) -> List[dict]: ...
+
+    @staticmethod
+    def _make_result(result: dict, method: str, kwargs: dict, timeout: Optional[float]) -> dict: ...
+
     def start(self) -> bool: ...
 
     def stop(self) -> bool: ...
 
     def _stop(self) -> None: ...
 
+    def _close_connection(self) -> None: ...
+
+    def add_observer(self, observer: Any) -> None: ...
+
+    def remove_observer(self, observer: Any) -> None: ...
+
+    def enable_stats(self, on_off: bool = True) -> None: ...
+
+    def stats(self, as_json: bool = False, reset: bool = False) -> Union[dict, str, None]: ...
+
     def set_callback(self, event: str, callback: Union[Callable, None], immediate: bool = False) -> None: ...
 
 
@@ -69,9 +129,32 @@ class BrowserDriver(Driver):
     BROWSERS: Dict[str, Driver] = ...
     owner: Browser = ...
     _control_session: Session = ...
+    sessions: Dict[str, SessionDriver] = ...
 
     def __new__(cls, tab_id: str, tab_type: str, address: str, owner: Browser): ...
 
     def __init__(self, tab_id: str, tab_type: str, address: str, owner: Browser): ...
 
+    def start(self) -> Optional[bool]: ...
+
     def get(self, url) -> Response: ...
+
+    def _observe_recv(self, session_id: Optional[str], raw: str, msg: Optional[dict]) -> None: ...
+
+    def _is_wanted(self, method: str, session_id: Optional[str] = None) -> bool: ...
+
+    def _handle_msg(self, msg: dict) -> None: ...
+
+    def _stop(self) -> None: ...
+
+
+class SessionDriver(Driver):
+    session_id: Optional[str] = ...
+    _browser_driver: BrowserDriver = ...
+
+    def __init__(self, tab_id: str, tab_type: str, address: str, owner=None,
+                 browser_driver: BrowserDriver = None): ...
+
+    def _post(self, message: dict) -> Optional[PendingResult]: ...
+
+    def _close_connection(self) -> None: ...
@@ -0,0 +1,319 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from gzip import open as gzip_open
+from json import dumps, loads
+from threading import Lock
+from time import perf_counter, sleep
+from weakref import WeakKeyDictionary
+
+from .driver import Driver, PendingResult
+from .._functions.json_codec import peek_event
+
+FORMAT = 'cdp-traffic'
+VERSION = 1
+
+
+def _open(path, mode):
+    """以文本方式打开文件，.gz结尾的使用gzip压缩"""
+    path = str(path)
+    if path.endswith('.gz'):
+        return gzip_open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class TrafficRecorder(object):
+    """Driver观察者，按顺序记录收发的cdp命令、结果和事件及其时间，可保存为文件供ReplayDriver回放
+    同一个观察者可添加到多个Driver，每个Driver的信息记录为一个通道
+    每条记录为[毫秒时间, 通道名, 类型, 数据]，类型：'c'通道信息，'s'发出的命令，'r'收到的信息，'t'命令超时
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._names = WeakKeyDictionary()
+        self.begin_time = perf_counter()
+        self.records = []
+
+    def on_send(self, driver, msg_id, method, raw):
+        """发出命令时调用
+        :param driver: 发出命令的Driver对象
+        :param msg_id: 命令id
+        :param method: cdp方法名
+        :param raw: 发出的json文本
+        :return: None
+        """
+        self._add(driver, 's', raw)
+
+    def on_recv(self, driver, raw, msg):
+        """收到信息时调用
+        :param driver: 接收信息的Driver对象
+        :param raw: 收到的json文本
+        :param msg: 解析后的信息，没有完整解析的事件为None
+        :return: None
+        """
+        self._add(driver, 'r', raw)
+
+    def on_timeout(self, driver, msg_id, method):
+        """命令等待超时时调用
+        :param driver: 发出命令的Driver对象
+        :param msg_id: 命令id
+        :param method: cdp方法名
+        :return: None
+        """
+        self._add(driver, 't', [msg_id, method])
+
+    def save(self, path):
+        """保存记录，每行一条json，路径以.gz结尾时压缩保存
+        :param path: 文件路径
+        :return: 记录条数
+        """
+        with self._lock:
+            records = list(self.records)
+        with _open(path, 'w') as f:
+            f.write(dumps({'format': FORMAT, 'version': VERSION}) + '\n')
+            for r in records:
+                f.write(dumps(r, ensure_ascii=False, separators=(',', ':')) + '\n')
+        return len(records)
+
+    def clear(self):
+        """清空记录，通道信息在各Driver的下一条记录前重新写入"""
+        with self._lock:
+            self.records.clear()
+            self._names = WeakKeyDictionary()
+            self.begin_time = perf_counter()
+
+    def _add(self, driver, kind, data):
+        """添加一条记录
+        :param driver: 所属Driver对象
+        :param kind: 记录类型
+        :param data: 记录数据
+        :return: None
+        """
+        t = round((perf_counter() - self.begin_time) * 1000, 3)
+        with self._lock:
+            name = self._names.get(driver)
+            if name is None:
+                name = str(driver.id)
+                used = set(self._names.values())
+                n = 1
+                while name in used:
+                    n += 1
+                    name = f'{driver.id}#{n}'
+                self._names[driver] = name
+                self.records.append([t, name, 'c', {'id': driver.id, 'type': driver.type,
+                                                    'address': driver.address}])
+            self.records.append([t, name, kind, data])
+
+
+class TrafficRecording(object):
+    """读取TrafficRecorder保存的记录文件"""
+
+    def __init__(self, path):
+        """
+        :param path: 记录文件路径
+        """
+        self.path = str(path)
+        self.channels = {}
+        self.records = []
+        with _open(path, 'r') as f:
+            header = loads(f.readline())
+            if header.get('format') != FORMAT:
+                raise ValueError(f'{path}不是cdp记录文件。')
+            for line in f:
+                if not line.strip():
+                    continue
+                r = loads(line)
+                if r[2] == 'c':
+                    self.channels.setdefault(r[1], r[3])
+                self.records.append(r)
+
+    def __repr__(self):
+        return f'<TrafficRecording {self.path} channels={list(self.channels)}>'
+
+    def channel_records(self, channel):
+        """返回一个通道的记录
+        :param channel: 通道名
+        :return: [毫秒时间, 类型, 数据]组成的列表
+        """
+        if channel not in self.channels:
+            raise KeyError(f'记录中没有通道{channel}，可用的有{list(self.channels)}。')
+        return [[r[0], r[2], r[3]] for r in self.records if r[1] == channel and r[2] != 'c']
+
+
+class ReplayDriver(Driver):
+    """按记录回放cdp信息的Driver，不连接浏览器，可代替页面对象的Driver测试上层逻辑的性能
+    发出命令时，按顺序找到记录中下一条同名命令，把记录中到它的结果为止的事件和结果依次交给处理，
+    事件顺序与记录时一致，结果的id换成本次命令的id。记录中找不到的命令立即返回错误，并计入misses
+    """
+
+    def __init__(self, recording, channel=None, owner=None, realtime=False):
+        """
+        :param recording: TrafficRecording对象或记录文件路径
+        :param channel: 要回放的通道名，为None时使用第一个通道
+        :param owner: 创建这个驱动的对象
+        :param realtime: 是否按记录的往返时间延迟返回结果，为False时尽快返回
+        """
+        if not isinstance(recording, TrafficRecording):
+            recording = TrafficRecording(recording)
+        if channel is None:
+            if not recording.channels:
+                raise ValueError('记录中没有任何通道。')
+            channel = next(iter(recording.channels))
+        info = recording.channels.get(channel)
+        if info is None:
+            raise KeyError(f'记录中没有通道{channel}，可用的有{list(recording.channels)}。')
+
+        self.recording = recording
+        self.channel = channel
+        self.realtime = realtime
+        self.misses = []
+        self._replay_lock = Lock()
+        self._load(recording.channel_records(channel))
+        super().__init__(info['id'], info['type'], info['address'], owner)
+
+    def __repr__(self):
+        return f'<ReplayDriver {self.channel}>'
+
+    def start(self):
+        """回放不需要连接"""
+        self._stopped.clear()
+        return True
+
+    def flush(self):
+        """把记录中剩余的事件和结果全部交给处理"""
+        with self._replay_lock:
+            self._deliver(len(self._inbound))
+
+    def _load(self, records):
+        """整理一个通道的记录
+        :param records: channel_records()返回的记录
+        :return: None
+        """
+        self._inbound = []  # [(毫秒时间, json文本, 记录中的命令id或None)]
+        self._sends = []  # [[方法名, 记录中的命令id, 毫秒时间, 结果位置, 是否已使用]]
+        responses = {}
+        for t, kind, data in records:
+            if kind == 's':
+                msg = loads(data)
+                self._sends.append([msg['method'], msg['id'], t, None, False])
+            elif kind == 'r':
+                rec_id = None
+                if not peek_event(data)[0]:
+                    msg = loads(data)
+                    rec_id = msg.get('id') if 'method' not in msg else None
+                if rec_id is not None:
+                    responses[rec_id] = len(self._inbound)
+                self._inbound.append((t, data, rec_id))
+
+        received = 0
+        inbound_times = [i[0] for i in self._inbound]
+        for send in self._sends:
+            pos = responses.get(send[1])
+            if pos is None:
+                # 记录时超时或未返回的命令，只交付发出前已收到的信息
+                while received < len(inbound_times) and inbound_times[received] <= send[2]:
+                    received += 1
+                send[3] = (received, None)
+            else:
+                send[3] = (pos + 1, self._inbound[pos][0] - send[2])
+
+        self._next_send = 0
+        self._cursor = 0
+        self._waiting = {}  # 记录中的命令id: PendingResult
+        self._early = {}  # 记录中的命令id: 已交付但命令还未发出的结果
+
+    def _post(self, message):
+        """按记录回放一条命令，不等待返回
+        :param message: 发送给浏览器的数据
+        :return: 等待结果的PendingResult对象
+        """
+        self._cur_id += 1
+        ws_id = self._cur_id
+        message['id'] = ws_id
+        method = message['method']
+        pending = PendingResult(ws_id, method)
+        self.method_results[ws_id] = pending
+        if self._observers:
+            message_json = self._dumps(message)
+            for observer in self._observers:
+                observer.on_send(self, ws_id, method, message_json)
+
+        with self._replay_lock:
+            send = self._find_send(method)
+            if send is None:
+                self.misses.append(method)
+                self.method_results.pop(ws_id, None)
+                pending.set_result({'error': {'message': f'记录中没有对应的{method}命令。'}})
+                return pending
+
+            rec_id = send[1]
+            until, rtt = send[3]
+            early = self._early.pop(rec_id, None)
+            if early is not None:
+                self._resolve(pending, early)
+            else:
+                self._waiting[rec_id] = pending
+            if self.realtime and rtt:
+                sleep(rtt / 1000)
+            self._deliver(until)
+        return pending
+
+    def _find_send(self, method):
+        """在锁内调用，找到记录中下一条未使用的同名命令
+        :param method: cdp方法名
+        :return: 命令记录，找不到返回None
+        """
+        sends = self._sends
+        for i in range(self._next_send, len(sends)):
+            send = sends[i]
+            if not send[4] and send[0] == method:
+                send[4] = True
+                while self._next_send < len(sends) and sends[self._next_send][4]:
+                    self._next_send += 1
+                return send
+        return None
+
+    def _deliver(self, until):
+        """在锁内调用，把记录中到指定位置为止的信息交给处理
+        :param until: 结束位置（不含）
+        :return: None
+        """
+        while self._cursor < until:
+            t, raw, rec_id = self._inbound[self._cursor]
+            self._cursor += 1
+            if rec_id is None:
+                method = peek_event(raw)[0]
+                if method and not self._is_wanted(method):
+                    self._observe_recv(None, raw, None)
+                    continue
+                msg = self._loads(raw)
+                self._observe_recv(None, raw, msg)
+                self._handle_msg(msg)
+                continue
+
+            msg = self._loads(raw)
+            pending = self._waiting.pop(rec_id, None)
+            if pending is None:
+                self._early[rec_id] = msg
+            else:
+                self._resolve(pending, msg)
+
+    def _resolve(self, pending, msg):
+        """以记录的结果唤醒命令
+        :param pending: 本次命令的PendingResult对象
+        :param msg: 记录中的结果
+        :return: None
+        """
+        msg = dict(msg, id=pending.id)
+        for observer in self._observers:
+            observer.on_recv(self, self._dumps(msg), msg)
+        self.method_results.pop(pending.id, None)
+        pending.set_result(msg)
+
+    def _close_connection(self):
+        """回放没有连接需要关闭"""
+        pass
@@ -0,0 +1,86 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Union, Any, Tuple, TextIO
+from weakref import WeakKeyDictionary
+
+from .driver import Driver, PendingResult
+
+FORMAT: str = ...
+VERSION: int = ...
+
+
+def _open(path: Union[str, Path], mode: str) -> TextIO: ...
+
+
+class TrafficRecorder(object):
+    _lock: Lock = ...
+    _names: WeakKeyDictionary = ...
+    begin_time: float = ...
+    records: List[list] = ...
+
+    def __init__(self): ...
+
+    def on_send(self, driver: Driver, msg_id: int, method: str, raw: str) -> None: ...
+
+    def on_recv(self, driver: Driver, raw: str, msg: Optional[dict]) -> None: ...
+
+    def on_timeout(self, driver: Driver, msg_id: int, method: str) -> None: ...
+
+    def save(self, path: Union[str, Path]) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def _add(self, driver: Driver, kind: str, data: Any) -> None: ...
+
+
+class TrafficRecording(object):
+    path: str = ...
+    channels: Dict[str, dict] = ...
+    records: List[list] = ...
+
+    def __init__(self, path: Union[str, Path]): ...
+
+    def channel_records(self, channel: str) -> List[list]: ...
+
+
+class ReplayDriver(Driver):
+    recording: TrafficRecording = ...
+    channel: str = ...
+    realtime: bool = ...
+    misses: List[str] = ...
+    _replay_lock: Lock = ...
+    _inbound: List[Tuple[float, str, Optional[int]]] = ...
+    _sends: List[list] = ...
+    _next_send: int = ...
+    _cursor: int = ...
+    _waiting: Dict[int, PendingResult] = ...
+    _early: Dict[int, dict] = ...
+
+    def __init__(self,
+                 recording: Union[TrafficRecording, str, Path],
+                 channel: str = None,
+                 owner=None,
+                 realtime: bool = False): ...
+
+    def start(self) -> bool: ...
+
+    def flush(self) -> None: ...
+
+    def _load(self, records: List[list]) -> None: ...
+
+    def _post(self, message: dict) -> PendingResult: ...
+
+    def _find_send(self, method: str) -> Optional[list]: ...
+
+    def _deliver(self, until: int) -> None: ...
+
+    def _resolve(self, pending: PendingResult, msg: dict) -> None: ...
+
+    def _close_connection(self) -> None: ...
@@ -0,0 +1,129 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import dumps
+from threading import Lock
+from time import perf_counter
+
+from .._functions.json_codec import peek_event
+
+# 延迟直方图各档上限（毫秒），最后一档为超过最大值的次数
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class DriverStats(object):
+    """Driver观察者，按cdp方法统计调用次数、延迟分布、超时、收发数据量和事件数
+    数据量按json文本字符数计算，cdp信息基本是ascii，与字节数相近
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._sent = {}
+        self.begin_time = perf_counter()
+        self.commands = {}
+        self.events = {}
+
+    def on_send(self, driver, msg_id, method, raw):
+        """发出命令时调用
+        :param driver: 发出命令的Driver对象
+        :param msg_id: 命令id
+        :param method: cdp方法名
+        :param raw: 发出的json文本
+        :return: None
+        """
+        with self._lock:
+            self._sent[msg_id] = (method, perf_counter())
+            r = self._get_command(method)
+            r['count'] += 1
+            r['request_bytes'] += len(raw)
+
+    def on_recv(self, driver, raw, msg):
+        """收到信息时调用
+        :param driver: 接收信息的Driver对象
+        :param raw: 收到的json文本
+        :param msg: 解析后的信息，没有完整解析的事件为None
+        :return: None
+        """
+        if msg is None or 'method' in msg:
+            method = msg['method'] if msg else peek_event(raw)[0]
+            with self._lock:
+                r = self.events.setdefault(method, {'count': 0, 'bytes': 0})
+                r['count'] += 1
+                r['bytes'] += len(raw)
+            return
+
+        with self._lock:
+            sent = self._sent.pop(msg.get('id'), None)
+            if not sent:
+                return
+            r = self._get_command(sent[0])
+            r['response_bytes'] += len(raw)
+            if 'error' in msg:
+                r['errors'] += 1
+            ms = (perf_counter() - sent[1]) * 1000
+            r['total_ms'] += ms
+            if ms > r['max_ms']:
+                r['max_ms'] = ms
+            for i, limit in enumerate(BUCKETS):
+                if ms <= limit:
+                    r['histogram'][i] += 1
+                    break
+            else:
+                r['histogram'][-1] += 1
+
+    def on_timeout(self, driver, msg_id, method):
+        """命令等待超时时调用
+        :param driver: 发出命令的Driver对象
+        :param msg_id: 命令id
+        :param method: cdp方法名
+        :return: None
+        """
+        with self._lock:
+            self._sent.pop(msg_id, None)
+            self._get_command(method)['timeouts'] += 1
+
+    def as_dict(self):
+        """返回统计结果
+        :return: {'seconds': 统计时长, 'buckets_ms': 直方图各档上限, 'commands': {方法名: 统计}, 'events': {事件名: 统计}}
+        """
+        with self._lock:
+            commands = {}
+            for method, r in self.commands.items():
+                r = dict(r, histogram=list(r['histogram']))
+                done = sum(r['histogram'])
+                r['avg_ms'] = r['total_ms'] / done if done else None
+                commands[method] = r
+            return {'seconds': perf_counter() - self.begin_time, 'buckets_ms': list(BUCKETS),
+                    'commands': commands, 'events': {k: dict(v) for k, v in self.events.items()}}
+
+    def to_json(self, path=None):
+        """以json格式导出统计结果
+        :param path: 保存的文件路径，为None时只返回文本
+        :return: json文本
+        """
+        txt = dumps(self.as_dict(), ensure_ascii=False, indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(txt)
+        return txt
+
+    def reset(self):
+        """清空统计结果"""
+        with self._lock:
+            self._sent.clear()
+            self.commands.clear()
+            self.events.clear()
+            self.begin_time = perf_counter()
+
+    def _get_command(self, method):
+        """在锁内调用，返回一个方法的统计记录"""
+        r = self.commands.get(method)
+        if r is None:
+            r = self.commands[method] = {'count': 0, 'errors': 0, 'timeouts': 0, 'request_bytes': 0,
+                                         'response_bytes': 0, 'total_ms': 0., 'max_ms': 0.,
+                                         'histogram': [0] * (len(BUCKETS) + 1)}
+        return r
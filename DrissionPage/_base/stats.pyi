@@ -0,0 +1,38 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Tuple, Optional, Union
+
+from .driver import Driver
+
+BUCKETS: Tuple[int, ...] = ...
+
+
+class DriverStats(object):
+    _lock: Lock = ...
+    _sent: Dict[int, Tuple[str, float]] = ...
+    begin_time: float = ...
+    commands: Dict[str, dict] = ...
+    events: Dict[str, dict] = ...
+
+    def __init__(self): ...
+
+    def on_send(self, driver: Driver, msg_id: int, method: str, raw: str) -> None: ...
+
+    def on_recv(self, driver: Driver, raw: str, msg: Optional[dict]) -> None: ...
+
+    def on_timeout(self, driver: Driver, msg_id: int, method: str) -> None: ...
+
+    def as_dict(self) -> dict: ...
+
+    def to_json(self, path: Union[str, Path, None] = None) -> str: ...
+
+    def reset(self) -> None: ...
+
+    def _get_command(self, method: str) -> dict: ...
@@ -9,6 +9,7 @@ from pathlib import Path
 from re import search
 
 from .options_manage import OptionsManager
+from .._units.load_state import LOAD_MODES
 
 
 class ChromiumOptions(object):
@@ -45,6 +46,7 @@ class ChromiumOptions(object):
         self._flags = options.get('flags', {})
         self._address = options.get('address', None)
         self._load_mode = options.get('load_mode', 'normal')
+        self._transport = options.get('transport', 'websocket')
         self._system_user_path = options.get('system_user_path', False)
         self._existing_only = options.get('existing_only', False)
 
@@ -104,6 +106,11 @@ class ChromiumOptions(object):
         """返回页面加载策略，'normal', 'eager', 'none'"""
         return self._load_mode
 
+    @property
+    def transport(self):
+        """返回与标签页通讯的方式，'websocket', 'flatten', 'pipe'"""
+        return self._transport
+
     @property
     def timeouts(self):
         """返回timeouts设置"""
@@ -376,16 +383,34 @@ class ChromiumOptions(object):
         return self.set_argument('--proxy-server', proxy)
 
     def set_load_mode(self, value):
-        """设置load_mode，可接收 'normal', 'eager', 'none'
+        """设置load_mode，可接收 'normal', 'eager', 'none', 'network_almost_idle', 'network_idle',
+        'first_meaningful_paint', 'in_flight'
         normal：默认情况下使用, 等待所有资源下载完成
         eager：DOM访问已准备就绪, 但其他资源 (如图像) 可能仍在加载中
         none：完全不阻塞
-        :param value: 可接收 'normal', 'eager', 'none'
+        network_almost_idle、network_idle、first_meaningful_paint：DOM可用且浏览器报告对应生命周期事件
+        in_flight：DOM可用且没有进行中的请求持续0.5秒，可用page.set.load_mode.in_flight()修改数量和时长
+        :param value: 加载策略名称
+        :return: 当前对象
+        """
+        value = value.lower()
+        if value not in LOAD_MODES:
+            raise ValueError(f'只能选择 {", ".join(LOAD_MODES)}。')
+        self._load_mode = value
+        return self
+
+    def set_transport(self, value):
+        """设置与标签页通讯的方式，可接收 'websocket', 'flatten', 'pipe'
+        websocket：默认方式，每个标签页、跨域iframe、监听器各自建立websocket连接
+        flatten：所有标签页通过Target.attachToTarget(flatten=True)共用浏览器的一个websocket连接，按sessionId分发信息
+        pipe：以--remote-debugging-pipe启动新浏览器，通过管道以flatten方式通讯，不占用端口，不能接管已有浏览器，只支持Linux和macOS
+        :param value: 可接收 'websocket', 'flatten', 'pipe'
         :return: 当前对象
         """
-        if value not in ('normal', 'eager', 'none'):
-            raise ValueError("只能选择 'normal', 'eager', 'none'。")
-        self._load_mode = value.lower()
+        value = value.lower()
+        if value not in ('websocket', 'flatten', 'pipe'):
+            raise ValueError("只能选择 'websocket', 'flatten', 'pipe'。")
+        self._transport = value
         return self
 
     def set_paths(self, browser_path=None, local_port=None, address=None, download_path=None,
@@ -537,7 +562,7 @@ class ChromiumOptions(object):
             om = OptionsManager(self.ini_path or (Path(__file__).parent / 'configs.ini'))
 
         # 设置chromium_options
-        attrs = ('address', 'browser_path', 'arguments', 'extensions', 'user', 'load_mode',
+        attrs = ('address', 'browser_path', 'arguments', 'extensions', 'user', 'load_mode', 'transport',
                  'auto_port', 'system_user_path', 'existing_only', 'flags')
         for i in attrs:
             om.set_item('chromium_options', i, self.__getattribute__(f'_{i}'))
@@ -20,6 +20,7 @@ class ChromiumOptions(object):
         self._browser_path: str = ...
         self._user: str = ...
         self._load_mode: str = ...
+        self._transport: str = ...
         self._timeouts: dict = ...
         self._proxy: str = ...
         self._address: str = ...
@@ -53,6 +54,9 @@ class ChromiumOptions(object):
     @property
     def load_mode(self) -> str: ...
 
+    @property
+    def transport(self) -> str: ...
+
     @property
     def timeouts(self) -> dict: ...
 
@@ -138,7 +142,10 @@ class ChromiumOptions(object):
 
     def ignore_certificate_errors(self, on_off=True) -> ChromiumOptions: ...
 
-    def set_load_mode(self, value: Literal['normal', 'eager', 'none']) -> ChromiumOptions: ...
+    def set_load_mode(self, value: Literal['normal', 'eager', 'none', 'network_almost_idle', 'network_idle',
+                                           'first_meaningful_paint', 'in_flight']) -> ChromiumOptions: ...
+
+    def set_transport(self, value: Literal['websocket', 'flatten', 'pipe']) -> ChromiumOptions: ...
 
     def set_browser_path(self, path: Union[str, Path]) -> ChromiumOptions: ...
 
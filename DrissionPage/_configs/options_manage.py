@@ -60,6 +60,7 @@ class OptionsManager(object):
                                                        "{'notifications': 2}}")
             self.set_item('chromium_options', 'flags', '{}')
             self.set_item('chromium_options', 'load_mode', 'normal')
+            self.set_item('chromium_options', 'transport', 'websocket')
             self.set_item('chromium_options', 'user', 'Default')
             self.set_item('chromium_options', 'auto_port', 'False')
             self.set_item('chromium_options', 'system_user_path', 'False')
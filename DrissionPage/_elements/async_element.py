@@ -0,0 +1,297 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import get_event_loop, sleep
+from json import loads
+from pathlib import Path
+
+from .chromium_element import make_js_for_find_ele_by_xpath
+from .none_element import NoneElement
+from .session_element import make_session_ele
+from .._functions.locator import get_loc
+from .._functions.settings import Settings
+from .._functions.web import get_ele_txt, is_js_func
+from ..errors import (ContextLostError, ElementLostError, AlertExistsError, JavaScriptError, ElementNotFoundError,
+                      NoRectError)
+
+
+class AsyncChromiumElement(object):
+    """ChromiumElement的异步版本，所有需要与浏览器通讯的属性都以协程方法提供"""
+
+    def __init__(self, owner, obj_id, description=None):
+        """
+        :param owner: 元素所在的AsyncChromiumTab对象
+        :param obj_id: js中的object id
+        :param description: cdp返回的元素描述
+        """
+        self.owner = owner
+        self._obj_id = obj_id
+        self._description = description
+
+    def __repr__(self):
+        return f'<AsyncChromiumElement {self._description or self._obj_id}>'
+
+    async def __call__(self, locator, index=1, timeout=None):
+        """在内部查找元素
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 超时时间（秒）
+        :return: AsyncChromiumElement对象或属性、文本
+        """
+        return await self.ele(locator, index=index, timeout=timeout)
+
+    async def tag(self):
+        """返回元素tag"""
+        return (await self.property('tagName')).lower()
+
+    async def html(self):
+        """返回元素outerHTML文本"""
+        return await self.run_js('return this.outerHTML;')
+
+    async def inner_html(self):
+        """返回元素innerHTML文本"""
+        return await self.run_js('return this.innerHTML;')
+
+    async def text(self):
+        """返回元素经格式化的文本，格式与ChromiumElement.text一致"""
+        return get_ele_txt(make_session_ele(await self.html()))
+
+    async def raw_text(self):
+        """返回未格式化处理的元素内文本"""
+        return await self.property('innerText')
+
+    async def attrs(self):
+        """返回元素所有attribute属性"""
+        return await self.run_js('let r={};for(let a of this.attributes){r[a.name]=a.value;}return r;')
+
+    async def attr(self, name):
+        """返回一个attribute属性值
+        :param name: 属性名
+        :return: 属性值文本，没有该属性返回None
+        """
+        return await self.run_js('return this.getAttribute(arguments[0]);', name)
+
+    async def property(self, name):
+        """获取一个property属性值
+        :param name: 属性名
+        :return: 属性值文本
+        """
+        return await self.run_js('function(n){return this[n];}', name)
+
+    async def value(self):
+        """返回元素的value值"""
+        return await self.property('value')
+
+    async def is_displayed(self):
+        """返回元素是否显示"""
+        return await self.run_js('let s=getComputedStyle(this);return s.visibility!="hidden"&&s.display!="none"'
+                                 '&&this.getClientRects().length>0;')
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        """对本元素执行javascript代码
+        :param script: js文本，文本中用this表示本元素
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用页面timeouts.script设置
+        :return: 运行的结果
+        """
+        return await async_run_js(self, script, as_expr, self.owner.timeouts.script if timeout is None else timeout,
+                                  args)
+
+    async def ele(self, locator, index=1, timeout=None):
+        """返回当前元素下级符合条件的一个元素、属性或节点文本
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找元素超时时间（秒），默认与元素所在页面等待时间一致
+        :return: AsyncChromiumElement对象或属性、文本
+        """
+        r = await async_find(self, locator, index, self.owner.timeout if timeout is None else timeout)
+        return make_none_ele(self.owner, 'ele()', {'locator': locator, 'index': index}) if r is None else r
+
+    async def eles(self, locator, timeout=None):
+        """获取所有符合条件的元素、属性或节点文本
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param timeout: 查找元素超时时间（秒），默认与元素所在页面等待时间一致
+        :return: AsyncChromiumElement对象或属性、文本组成的列表
+        """
+        return await async_find(self, locator, None, self.owner.timeout if timeout is None else timeout) or []
+
+    async def click(self, by_js=False):
+        """点击元素，默认模拟鼠标点击元素中点
+        :param by_js: 是否用js点击
+        :return: None
+        """
+        if by_js:
+            await self.run_js('this.click();')
+            return
+
+        rect = await self.run_js('this.scrollIntoViewIfNeeded?this.scrollIntoViewIfNeeded():this.scrollIntoView();'
+                                 'let r=this.getBoundingClientRect();return [r.x,r.y,r.width,r.height];')
+        if not rect[2] or not rect[3]:
+            raise NoRectError
+        x, y = rect[0] + rect[2] / 2, rect[1] + rect[3] / 2
+        await self.owner.run_cdp_batch([
+            ('Input.dispatchMouseEvent', {'type': 'mouseMoved', 'x': x, 'y': y}),
+            ('Input.dispatchMouseEvent', {'type': 'mousePressed', 'x': x, 'y': y, 'button': 'left', 'clickCount': 1}),
+            ('Input.dispatchMouseEvent', {'type': 'mouseReleased', 'x': x, 'y': y, 'button': 'left',
+                                          'clickCount': 1})])
+
+    async def input(self, vals, clear=False):
+        """输入文本
+        :param vals: 文本值
+        :param clear: 输入前是否清空文本框
+        :return: None
+        """
+        await self.run_js('this.focus();' + ('this.value="";' if clear else ''))
+        await self.owner.run_cdp('Input.insertText', text=str(vals))
+
+
+def make_none_ele(page, method, args):
+    """按Settings设置返回NoneElement或抛出异常
+    :param page: 异步页面对象
+    :param method: 调用的方法名
+    :param args: 调用的参数
+    :return: NoneElement对象
+    """
+    if Settings.raise_when_ele_not_found:
+        raise ElementNotFoundError(None, method, args)
+    return NoneElement(page, method, args)
+
+
+async def async_find(ele, locator, index, timeout):
+    """在页面或元素中查找元素
+    :param ele: AsyncChromiumTab或AsyncChromiumElement对象
+    :param locator: 元素定位元组或字符串
+    :param index: 第几个结果，从1开始，可传入负数获取倒数第几个，为None返回所有
+    :param timeout: 超时时间（秒）
+    :return: AsyncChromiumElement、文本或其组成的列表，找不到返回None
+    """
+    if not isinstance(locator, (str, tuple)):
+        raise ValueError(f"定位符必须为str或长度为2的tuple对象。现在是：{locator}")
+    xpath = get_loc(locator, True)[1]
+    if xpath.lstrip().startswith('/'):
+        xpath = f'.{xpath}'
+    js = make_js_for_find_ele_by_xpath(xpath, '9' if index == 1 else '7', 'this')
+    page = ele.owner if isinstance(ele, AsyncChromiumElement) else ele
+
+    loop = get_event_loop()
+    end_time = loop.time() + timeout
+    while True:
+        try:
+            r = await async_run_js(ele, js, False, page.timeouts.script, parse=False)
+        except ContextLostError:
+            r = None
+        if r is not None:
+            if index in (1, None):
+                return r
+            if abs(index) <= len(r):
+                return r[index - 1 if index > 0 else index]
+
+        if loop.time() >= end_time:
+            return None
+        await sleep(.1)
+
+
+async def async_run_js(page_or_ele, script, as_expr, timeout, args=None, parse=True):
+    """运行javascript代码
+    :param page_or_ele: 异步页面对象或元素对象
+    :param script: js文本或js文件路径
+    :param as_expr: 是否作为表达式运行，为True时args无效
+    :param timeout: 超时时间（秒）
+    :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+    :param parse: 是否解析结果，为False时只解析元素和元素列表，空结果返回None
+    :return: js执行结果
+    """
+    if isinstance(page_or_ele, AsyncChromiumElement):
+        page = page_or_ele.owner
+        obj_id = page_or_ele._obj_id
+        is_page = False
+    else:
+        page = page_or_ele
+        obj_id = await page._get_root_id()
+        is_page = True
+
+    try:
+        if Path(script).exists():
+            with open(script, 'r', encoding='utf-8') as f:
+                script = f.read()
+    except OSError:
+        pass
+
+    try:
+        if as_expr:
+            res = await page.run_cdp('Runtime.evaluate', expression=script, returnByValue=False, awaitPromise=True,
+                                     userGesture=True, _timeout=timeout, _ignore=AlertExistsError)
+        else:
+            if not is_js_func(script):
+                script = f'function(){{{script}}}'
+            res = await page.run_cdp('Runtime.callFunctionOn', functionDeclaration=script, objectId=obj_id,
+                                     arguments=[convert_argument(arg) for arg in args or ()], returnByValue=False,
+                                     awaitPromise=True, userGesture=True, _timeout=timeout, _ignore=AlertExistsError)
+    except ContextLostError:
+        if is_page:
+            page._root_id = None
+            raise ContextLostError('页面已被刷新，请尝试等待页面加载完成再执行操作。')
+        raise ElementLostError('原来获取到的元素对象已不在页面内。')
+
+    if not res:
+        return None
+    if res.get('exceptionDetails'):
+        raise JavaScriptError(f'\njavascript运行错误：\n{script}\n错误信息: \n{res["exceptionDetails"]}')
+    return await parse_js_result(page, res['result'], parse)
+
+
+async def parse_js_result(page, result, parse=True):
+    """解析js返回的结果
+    :param page: 异步页面对象
+    :param result: cdp返回的结果
+    :param parse: 是否解析普通对象
+    :return: 解析后的结果
+    """
+    if 'unserializableValue' in result:
+        return result['unserializableValue']
+
+    the_type = result['type']
+    if the_type == 'object':
+        sub_type = result.get('subtype', None)
+        if sub_type == 'null':
+            return None
+
+        elif sub_type == 'node':
+            return AsyncChromiumElement(page, result['objectId'], result.get('description'))
+
+        elif sub_type == 'array':
+            r = (await page.run_cdp('Runtime.getProperties', objectId=result['objectId'],
+                                    ownProperties=True))['result']
+            r = [await parse_js_result(page, i['value'], parse) for i in r if i['name'].isdigit()]
+            return r if r or parse else None
+
+        elif 'objectId' in result and parse:
+            js = 'function(){return JSON.stringify(this);}'
+            r = await page.run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=result['objectId'],
+                                   returnByValue=True, _ignore=AlertExistsError)
+            return loads(r['result']['value'])
+
+        else:
+            return result.get('value', result)
+
+    elif the_type == 'undefined':
+        return None
+
+    else:
+        return result['value']
+
+
+def convert_argument(arg):
+    """把参数转换成js能够接收的形式"""
+    if isinstance(arg, AsyncChromiumElement):
+        return {'objectId': arg._obj_id}
+
+    elif isinstance(arg, (int, float, str, bool, dict, list)) or arg is None:
+        return {'value': arg}
+
+    raise TypeError(f'不支持参数{arg}的类型：{type(arg)}')
@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Union, Tuple, List, Any, Optional
+
+from .none_element import NoneElement
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncChromiumElement(object):
+    owner: AsyncChromiumTab
+    _obj_id: str
+    _description: Optional[str]
+
+    def __init__(self, owner: AsyncChromiumTab, obj_id: str, description: str = None): ...
+
+    async def __call__(self,
+                       locator: Union[Tuple[str, str], str],
+                       index: int = 1,
+                       timeout: float = None) -> Union[AsyncChromiumElement, str, NoneElement]: ...
+
+    async def tag(self) -> str: ...
+
+    async def html(self) -> str: ...
+
+    async def inner_html(self) -> str: ...
+
+    async def text(self) -> str: ...
+
+    async def raw_text(self) -> str: ...
+
+    async def attrs(self) -> dict: ...
+
+    async def attr(self, name: str) -> Optional[str]: ...
+
+    async def property(self, name: str) -> Any: ...
+
+    async def value(self) -> Any: ...
+
+    async def is_displayed(self) -> bool: ...
+
+    async def run_js(self, script: str, *args, as_expr: bool = False, timeout: float = None) -> Any: ...
+
+    async def ele(self,
+                  locator: Union[Tuple[str, str], str],
+                  index: int = 1,
+                  timeout: float = None) -> Union[AsyncChromiumElement, str, NoneElement]: ...
+
+    async def eles(self,
+                   locator: Union[Tuple[str, str], str],
+                   timeout: float = None) -> List[Union[AsyncChromiumElement, str]]: ...
+
+    async def click(self, by_js: bool = False) -> None: ...
+
+    async def input(self, vals: Any, clear: bool = False) -> None: ...
+
+
+def make_none_ele(page: AsyncChromiumTab, method: str, args: dict) -> NoneElement: ...
+
+
+async def async_find(ele: Union[AsyncChromiumTab, AsyncChromiumElement],
+                     locator: Union[Tuple[str, str], str],
+                     index: Optional[int],
+                     timeout: float) -> Union[AsyncChromiumElement, str, List[Union[AsyncChromiumElement, str]], None]: ...
+
+
+async def async_run_js(page_or_ele: Union[AsyncChromiumTab, AsyncChromiumElement],
+                       script: str,
+                       as_expr: bool,
+                       timeout: float,
+                       args: Union[tuple, list] = None,
+                       parse: bool = True) -> Any: ...
+
+
+async def parse_js_result(page: AsyncChromiumTab, result: dict, parse: bool = True) -> Any: ...
+
+
+def convert_argument(arg: Any) -> dict: ...
@@ -5,6 +5,7 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from collections import namedtuple
 from json import loads
 from os.path import basename
 from pathlib import Path
@@ -27,22 +28,43 @@ from .._units.selector import SelectElement
 from .._units.setter import ChromiumElementSetter
 from .._units.states import ElementStates, ShadowRootStates
 from .._units.waiter import ElementWaiter
+from .._units.walker import ElementWalker
 from ..errors import (ContextLostError, ElementLostError, JavaScriptError, ElementNotFoundError,
                       CDPError, NoResourceError, AlertExistsError)
 
 __FRAME_ELEMENT__ = ('iframe', 'frame')
 
+# 元素基本信息快照，size为(宽, 高)，location为左上角绝对坐标，text与ChromiumElement.text格式一致
+ElementSnapshot = namedtuple('ElementSnapshot',
+                             ('tag', 'attrs', 'text', 'size', 'location', 'is_displayed', 'is_enabled'))
+
+# 在页面中收集元素快照数据的js方法，判断显示和可用的规则与ElementStates一致
+SNAPSHOT_JS = '''function snap(el){
+    const r = el.getBoundingClientRect();
+    const s = window.getComputedStyle(el);
+    const v = window.visualViewport;
+    const attrs = {};
+    for(const a of el.attributes){attrs[a.name] = a.value;}
+    return [el.localName, attrs, el.outerHTML, [r.width, r.height],
+            [r.left + (v ? v.pageLeft : window.scrollX), r.top + (v ? v.pageTop : window.scrollY)],
+            !(s.visibility === 'hidden' || el.offsetParent === null || s.display === 'none' || el.hidden),
+            !el.disabled];
+}'''
+
 
 class ChromiumElement(DrissionElement):
     """控制浏览器元素的对象"""
 
-    def __init__(self, owner, node_id=None, obj_id=None, backend_id=None):
-        """node_id、obj_id和backend_id必须至少传入一个
+    def __init__(self, owner, node_id=None, obj_id=None, backend_id=None, tag=None):
+        """node_id、obj_id和backend_id必须至少传入一个，其余id在第一次使用时才向浏览器获取
         :param owner: 元素所在页面对象
         :param node_id: cdp中的node id
         :param obj_id: js中的object id
         :param backend_id: backend id
+        :param tag: 已知的元素tag
         """
+        if not (node_id or obj_id or backend_id):
+            raise ElementLostError
         super().__init__(owner)
         self.tab = self.owner.tab
         self._select = None
@@ -52,31 +74,17 @@ class ChromiumElement(DrissionElement):
         self._states = None
         self._pseudo = None
         self._clicker = None
-        self._tag = None
+        self._tag = tag.lower() if tag else None
         self._wait = None
         self._type = 'ChromiumElement'
 
-        if node_id and obj_id and backend_id:
-            self._node_id = node_id
-            self._obj_id = obj_id
-            self._backend_id = backend_id
-        elif node_id:
-            self._node_id = node_id
-            self._obj_id = self._get_obj_id(node_id)
-            self._backend_id = self._get_backend_id(self._node_id)
-        elif obj_id:
-            self._node_id = self._get_node_id(obj_id)
-            self._obj_id = obj_id
-            self._backend_id = self._get_backend_id(self._node_id)
-        elif backend_id:
-            self._obj_id = self._get_obj_id(backend_id=backend_id)
-            self._node_id = self._get_node_id(obj_id=self._obj_id)
-            self._backend_id = backend_id
-        else:
-            raise ElementLostError
-
-        doc = self.run_js('return this.ownerDocument;')
-        self._doc_id = doc['objectId'] if doc else None
+        self._n_id = node_id
+        self._o_id = obj_id
+        self._b_id = backend_id
+        self._d_id = False  # False表示未获取，None表示没有所属文档
+        self._paths = None  # (DOM版本, {模式: 路径})
+        if obj_id:
+            owner._object_groups.track(self)
 
     def __repr__(self):
         attrs = [f"{k}='{v}'" for k, v in self.attrs.items()]
@@ -109,6 +117,52 @@ class ChromiumElement(DrissionElement):
                                            backendNodeId=self._backend_id)['node']['localName'].lower()
         return self._tag
 
+    @property
+    def _node_id(self):
+        """返回cdp中的node id"""
+        if not self._n_id:
+            self._n_id = self._get_node_id(obj_id=self._obj_id)
+        return self._n_id
+
+    @_node_id.setter
+    def _node_id(self, node_id):
+        self._n_id = node_id
+
+    @property
+    def _obj_id(self):
+        """返回js中的object id"""
+        if not self._o_id:
+            self._o_id = (self._get_obj_id(backend_id=self._b_id) if self._b_id
+                          else self._get_obj_id(node_id=self._n_id))
+            self.owner._object_groups.track(self)
+        return self._o_id
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id):
+        self._o_id = obj_id
+        self.owner._object_groups.track(self)
+
+    @property
+    def _backend_id(self):
+        """返回backend id"""
+        if not self._b_id:
+            self._b_id = (self._get_backend_id(obj_id=self._o_id) if self._o_id
+                          else self._get_backend_id(self._n_id))
+        return self._b_id
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id):
+        self._b_id = backend_id
+
+    @property
+    def _doc_id(self):
+        """返回元素所在文档的object id"""
+        if self._d_id is False:
+            doc = self.run_js('return this.ownerDocument;')
+            self._d_id = doc['objectId'] if doc else None
+            self.owner._object_groups.track(self)
+        return self._d_id
+
     @property
     def html(self):
         """返回元素outerHTML文本"""
@@ -368,6 +422,16 @@ class ChromiumElement(DrissionElement):
         """
         return super().afters(locator, timeout, ele_only=ele_only)
 
+    def walk(self, step=None, *args):
+        """返回从当前元素出发的相对定位链，所有步骤在页面中一次执行，结果元素批量生成，不等待
+        例：ele.walk('parent', 2).children('t:td').eles()
+        :param step: 第一步的方法名，如'parent'、'next'、'children'，为None时不添加
+        :param args: 第一步的参数
+        :return: ElementWalker对象
+        """
+        walker = ElementWalker(self)
+        return getattr(walker, step)(*args) if step else walker
+
     def attr(self, attr):
         """返回一个attribute属性值
         :param attr: 属性名
@@ -475,6 +539,12 @@ class ChromiumElement(DrissionElement):
         """
         return make_session_ele(self, locator, index=None)
 
+    def snapshot(self):
+        """用一次js调用获取元素tag、attrs、text、大小、位置、是否显示和是否可用
+        :return: ElementSnapshot对象
+        """
+        return make_snapshot(loads(self.run_js(f'function(){{{SNAPSHOT_JS}\nreturn JSON.stringify(snap(this));}}')))
+
     def _find_elements(self, locator, timeout=None, index=1, relative=False, raise_err=None):
         """返回当前元素下级符合条件的子元素、属性或节点文本，默认返回第一个
         :param locator: 元素的定位信息，可以是loc元组，或查询字符串
@@ -728,25 +798,35 @@ class ChromiumElement(DrissionElement):
             return self.owner.run_cdp('DOM.requestNode', objectId=obj_id)['nodeId']
         else:
             n = self.owner.run_cdp('DOM.describeNode', backendNodeId=backend_id)['node']
-            self._tag = n['localName']
+            self._tag = n['localName'].lower()
             return n['nodeId']
 
-    def _get_backend_id(self, node_id):
-        """根据传入node id获取backend id
-        :param node_id:
+    def _get_backend_id(self, node_id=None, obj_id=None):
+        """根据传入node id或object id获取backend id
+        :param node_id: cdp中的node id
+        :param obj_id: js中的object id
         :return: backend id
         """
-        n = self.owner.run_cdp('DOM.describeNode', nodeId=node_id)['node']
-        self._tag = n['localName']
+        if node_id:
+            n = self.owner.run_cdp('DOM.describeNode', nodeId=node_id)['node']
+        else:
+            n = self.owner.run_cdp('DOM.describeNode', objectId=obj_id)['node']
+        self._tag = n['localName'].lower()
         return n['backendNodeId']
 
     def _refresh_id(self):
-        """根据backend id刷新其它id"""
-        self._obj_id = self._get_obj_id(backend_id=self._backend_id)
-        self._node_id = self._get_node_id(obj_id=self._obj_id)
+        """根据backend id刷新其它id，node id在使用时再获取"""
+        self._o_id = self._get_obj_id(backend_id=self._backend_id)
+        self.owner._object_groups.track(self)
+        self._n_id = None
+        self._paths = None
 
     def _get_ele_path(self, mode):
-        """返获取绝对的css路径或xpath路径"""
+        """返获取绝对的css路径或xpath路径，页面DOM版本可知且没有变化时返回上次获取的结果"""
+        version = self.owner._dom_version
+        if version is not None and self._paths and self._paths[0] == version and mode in self._paths[1]:
+            return self._paths[1][mode]
+
         if mode == 'xpath':
             txt1 = 'let tag = el.nodeName.toLowerCase();'
             txt3 = ''' && sib.nodeName.toLowerCase()==tag'''
@@ -783,7 +863,12 @@ class ChromiumElement(DrissionElement):
         return e(this);}
         '''
         t = self.run_js(js)
-        return f'{t}' if mode == 'css' else t
+        t = f'{t}' if mode == 'css' else t
+        if version is not None:
+            if not self._paths or self._paths[0] != version:
+                self._paths = (version, {})
+            self._paths[1][mode] = t
+        return t
 
     def _set_file_input(self, files):
         """对上传控件写入路径
@@ -816,6 +901,7 @@ class ShadowRoot(BaseElement):
             self._obj_id = obj_id
             self._node_id = self._get_node_id(obj_id)
             self._backend_id = self._get_backend_id(self._node_id)
+        self.owner._object_groups.track(self)
         self._states = None
         self._type = 'ShadowRoot'
 
@@ -1126,7 +1212,7 @@ class ShadowRoot(BaseElement):
         end_time = perf_counter() + timeout
         result = do_find()
         while result is None and perf_counter() <= end_time:
-            sleep(.1)
+            wait_for_mutation(self.owner, self._obj_id, loc[1] if loc[0] == 'css selector' else None, end_time)
             result = do_find()
 
         if result:
@@ -1219,9 +1305,12 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
             res = ele.owner.run_cdp('Runtime.getProperties', objectId=res['result']['objectId'],
                                     ownProperties=True)['result'][:-1]
             if index is None:
-                r = [make_chromium_eles(ele.owner, _ids=i['value']['objectId'], is_obj_id=True)
-                     if i['value']['type'] == 'object' else i['value']['value'] for i in res]
-                return None if False in r else r
+                obj_ids = [i['value']['objectId'] for i in res if i['value']['type'] == 'object']
+                nodes = make_chromium_eles(ele.owner, _ids=obj_ids, index=None, is_obj_id=True)
+                if nodes is False or len(nodes) != len(obj_ids):
+                    return None
+                nodes.reverse()
+                return [nodes.pop() if i['value']['type'] == 'object' else i['value']['value'] for i in res]
 
             else:
                 eles_count = len(res)
@@ -1239,7 +1328,7 @@ def find_by_xpath(ele, xpath, index, timeout, relative=True):
     end_time = perf_counter() + timeout
     result = do_find()
     while result is None and perf_counter() < end_time:
-        sleep(.1)
+        wait_for_mutation(ele.owner, ele._obj_id, xpath, end_time, by_xpath=True, node_txt=node_txt)
         result = do_find()
 
     if result:
@@ -1255,6 +1344,7 @@ def find_by_css(ele, selector, index, timeout):
     :param timeout: 超时时间（秒）
     :return: ChromiumElement或其组成的列表
     """
+    raw_selector = selector
     selector = selector.replace('"', r'\"')
     find_all = '' if index == 1 else 'All'
     node_txt = 'this.contentDocument' if ele.tag in ('iframe', 'frame', 'shadow-root') else 'this'
@@ -1285,7 +1375,7 @@ def find_by_css(ele, selector, index, timeout):
     end_time = perf_counter() + timeout
     result = do_find()
     while result is None and perf_counter() < end_time:
-        sleep(.1)
+        wait_for_mutation(ele.owner, ele._obj_id, raw_selector, end_time, node_txt=node_txt)
         result = do_find()
 
     if result:
@@ -1293,6 +1383,62 @@ def find_by_css(ele, selector, index, timeout):
     return NoneElement(ele.owner) if index is not None else []
 
 
+def wait_for_mutation(page, obj_id, selector, end_time, by_xpath=False, node_txt='this', max_wait=None):
+    """在页面中用MutationObserver等待元素内出现能匹配定位符的节点，代替查找元素时的轮询间隔
+    未开启Settings.wait_by_mutation、执行出错或开始等待时已能匹配时，退回等待0.1秒
+    :param page: 元素所在页面对象
+    :param obj_id: 要观察的节点的object id
+    :param selector: css selector或xpath，为None时发生任何变化即返回
+    :param end_time: 查找结束时间点
+    :param by_xpath: selector是否xpath
+    :param node_txt: 观察的节点，'this'或'this.contentDocument'
+    :param max_wait: 每次最多等待的秒数，用于观察不到变化的位置，为None时等到结束时间
+    :return: None
+    """
+    timeout = end_time - perf_counter()
+    if timeout <= 0:
+        return
+    if max_wait is not None:
+        timeout = min(timeout, max_wait)
+    if not Settings.wait_by_mutation or not obj_id:
+        sleep(min(.1, timeout))
+        return
+
+    js = f'''function(sel, byXpath, ms){{
+    const root = {node_txt};
+    const doc = root.ownerDocument || root;
+    function found(){{
+        if(sel === null){{return false;}}
+        try{{
+            if(byXpath){{return doc.evaluate(sel, root, null, 9, null).singleNodeValue !== null;}}
+            return root.querySelector(sel) !== null;
+        }}catch(e){{return true;}}
+    }}
+    if(found()){{return 'now';}}
+    return new Promise(resolve => {{
+        const ob = new MutationObserver(() => {{
+            if(sel === null || found()){{ob.disconnect(); clearTimeout(t); resolve('mutation');}}
+        }});
+        const t = setTimeout(() => {{ob.disconnect(); resolve('timeout');}}, ms);
+        ob.observe(root, {{childList: true, subtree: true, attributes: true, characterData: true}});
+    }});
+}}'''
+    res = page.driver.run('Runtime.callFunctionOn', functionDeclaration=js, objectId=obj_id, awaitPromise=True,
+                          returnByValue=True, arguments=[{'value': selector}, {'value': by_xpath},
+                                                         {'value': int(timeout * 1000)}], _timeout=timeout + 1)
+    if 'error' in res or 'exceptionDetails' in res or res['result'].get('value') == 'now':
+        sleep(min(.1, max(end_time - perf_counter(), 0)))
+
+
+def make_snapshot(data):
+    """根据SNAPSHOT_JS返回的数据生成快照对象
+    :param data: [tag, attrs, outerHTML, 大小, 位置, 是否显示, 是否可用]
+    :return: ElementSnapshot对象
+    """
+    return ElementSnapshot(data[0], data[1], get_ele_txt(make_session_ele(data[2])), tuple(data[3]), tuple(data[4]),
+                           data[5], data[6])
+
+
 def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
     """根据node id或object id生成相应元素对象
     :param page: ChromiumPage对象
@@ -1321,10 +1467,11 @@ def make_chromium_eles(page, _ids, index=1, is_obj_id=True, ele_only=False):
             obj_id = _ids[index - 1]
             return get_node_func(page, obj_id, ele_only)
 
-    else:  # 获取全部
+    else:  # 获取全部，所有describeNode命令一次发出
+        id_type = 'objectId' if is_obj_id else 'nodeId'
         nodes = []
-        for obj_id in _ids:
-            tmp = get_node_func(page, obj_id, ele_only)
+        for _id, node in zip(_ids, _get_nodes_info(page, id_type, _ids)):
+            tmp = _make_node(page, _id if is_obj_id else None, node, ele_only)
             if tmp is False:
                 return False
             elif tmp is not None:
@@ -1342,10 +1489,21 @@ def _get_node_info(page, id_type, _id):
     return node
 
 
-def _get_node_by_obj_id(page, obj_id, ele_only):
-    """根据obj id返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
-    node = _get_node_info(page, 'objectId', obj_id)
-    if node is False:
+def _get_nodes_info(page, id_type, ids):
+    """批量获取节点信息，只等待一次往返时间
+    :param page: 页面对象
+    :param id_type: 'objectId'或'nodeId'
+    :param ids: id组成的列表
+    :return: describeNode结果组成的列表，失败的项为False
+    """
+    results = page.driver.run_many([('DOM.describeNode', {id_type: i}) for i in ids if i])
+    results.reverse()
+    return [results.pop() if i else False for i in ids]
+
+
+def _make_node(page, obj_id, node, ele_only):
+    """根据describeNode结果返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
+    if node is False or 'error' in node:
         return False
     if node['node']['nodeName'] in ('#text', '#comment'):
         return None if ele_only else node['node']['nodeValue']
@@ -1353,24 +1511,20 @@ def _get_node_by_obj_id(page, obj_id, ele_only):
         return _make_ele(page, obj_id, node)
 
 
+def _get_node_by_obj_id(page, obj_id, ele_only):
+    """根据obj id返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
+    return _make_node(page, obj_id, _get_node_info(page, 'objectId', obj_id), ele_only)
+
+
 def _get_node_by_node_id(page, node_id, ele_only):
     """根据node id返回元素对象或文本，ele_only时如果是文本返回None，出错返回False"""
-    node = _get_node_info(page, 'nodeId', node_id)
-    if node is False:
-        return False
-    if node['node']['nodeName'] in ('#text', '#comment'):
-        return None if ele_only else node['node']['nodeValue']
-    else:
-        obj_id = page.driver.run('DOM.resolveNode', nodeId=node_id)
-        if 'error' in obj_id:
-            return False
-        obj_id = obj_id['object']['objectId']
-        return _make_ele(page, obj_id, node)
+    return _make_node(page, None, _get_node_info(page, 'nodeId', node_id), ele_only)
 
 
 def _make_ele(page, obj_id, node):
+    """根据describeNode结果生成元素对象，没有的id在使用时再获取"""
     ele = ChromiumElement(page, obj_id=obj_id, node_id=node['node']['nodeId'],
-                          backend_id=node['node']['backendNodeId'])
+                          backend_id=node['node']['backendNodeId'], tag=node['node']['localName'])
     if ele.tag in __FRAME_ELEMENT__:
         from .._pages.chromium_frame import ChromiumFrame
         ele = ChromiumFrame(page, ele, node)
@@ -6,7 +6,7 @@
 @License  : BSD 3-Clause.
 """
 from pathlib import Path
-from typing import Union, Tuple, List, Any, Literal, Optional
+from typing import Union, Tuple, List, Any, Literal, Optional, NamedTuple, Dict
 
 from .._base.base import DrissionElement, BaseElement
 from .._elements.session_element import SessionElement
@@ -22,22 +22,40 @@ from .._units.selector import SelectElement
 from .._units.setter import ChromiumElementSetter
 from .._units.states import ShadowRootStates, ElementStates
 from .._units.waiter import ElementWaiter
+from .._units.walker import ElementWalker
 
 PIC_TYPE = Literal['jpg', 'jpeg', 'png', 'webp', True]
+SNAPSHOT_JS: str = ...
+
+
+class ElementSnapshot(NamedTuple):
+    tag: str
+    attrs: dict
+    text: str
+    size: Tuple[float, float]
+    location: Tuple[float, float]
+    is_displayed: bool
+    is_enabled: bool
 
 
 class ChromiumElement(DrissionElement):
 
-    def __init__(self, owner: ChromiumBase, node_id: int = None, obj_id: str = None, backend_id: int = None):
+    def __init__(self,
+                 owner: ChromiumBase,
+                 node_id: int = None,
+                 obj_id: str = None,
+                 backend_id: int = None,
+                 tag: str = None):
         self._tag: str = ...
         # self.page: Union[ChromiumPage, WebPage] = ...
         self.owner: ChromiumBase = ...
         self.page: Union[ChromiumPage, WebPage] = ...
         self.tab: Union[ChromiumPage, ChromiumTab] = ...
-        self._node_id: int = ...
-        self._obj_id: str = ...
-        self._backend_id: int = ...
-        self._doc_id: str = ...
+        self._n_id: Optional[int] = ...
+        self._o_id: Optional[str] = ...
+        self._b_id: Optional[int] = ...
+        self._d_id: Union[str, None, bool] = ...
+        self._paths: Optional[Tuple[int, Dict[str, str]]] = ...
         self._scroll: ElementScroller = ...
         self._clicker: Clicker = ...
         self._select: SelectElement = ...
@@ -61,6 +79,27 @@ class ChromiumElement(DrissionElement):
     @property
     def tag(self) -> str: ...
 
+    @property
+    def _node_id(self) -> int: ...
+
+    @_node_id.setter
+    def _node_id(self, node_id: Optional[int]) -> None: ...
+
+    @property
+    def _obj_id(self) -> str: ...
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id: Optional[str]) -> None: ...
+
+    @property
+    def _backend_id(self) -> int: ...
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id: Optional[int]) -> None: ...
+
+    @property
+    def _doc_id(self) -> Optional[str]: ...
+
     @property
     def html(self) -> str: ...
 
@@ -160,6 +199,10 @@ class ChromiumElement(DrissionElement):
                timeout: float = None,
                ele_only: bool = True) -> List[Union[ChromiumElement, str]]: ...
 
+    def walk(self,
+             step: Literal['parent', 'child', 'children', 'next', 'nexts', 'prev', 'prevs', 'after', 'before'] = None,
+             *args: Union[int, str, Tuple[str, str]]) -> ElementWalker: ...
+
     @property
     def wait(self) -> ElementWaiter: ...
 
@@ -196,6 +239,8 @@ class ChromiumElement(DrissionElement):
 
     def s_eles(self, locator: Union[Tuple[str, str], str] = None) -> List[SessionElement]: ...
 
+    def snapshot(self) -> ElementSnapshot: ...
+
     def _find_elements(self,
                        locator: Union[Tuple[str, str], str],
                        timeout: float = None,
@@ -241,7 +286,7 @@ class ChromiumElement(DrissionElement):
 
     def _get_node_id(self, obj_id: str = None, backend_id: int = None) -> int: ...
 
-    def _get_backend_id(self, node_id: int) -> int: ...
+    def _get_backend_id(self, node_id: int = None, obj_id: str = None) -> int: ...
 
     def _refresh_id(self) -> None: ...
 
@@ -361,6 +406,18 @@ def find_by_css(ele: ChromiumElement,
                 timeout: float) -> Union[ChromiumElement, List[ChromiumElement],]: ...
 
 
+def make_snapshot(data: list) -> ElementSnapshot: ...
+
+
+def wait_for_mutation(page: Union[ChromiumBase, ChromiumPage, WebPage, ChromiumTab, ChromiumFrame],
+                      obj_id: Optional[str],
+                      selector: Optional[str],
+                      end_time: float,
+                      by_xpath: bool = False,
+                      node_txt: str = 'this',
+                      max_wait: float = None) -> None: ...
+
+
 def make_chromium_eles(page: Union[ChromiumBase, ChromiumPage, WebPage, ChromiumTab, ChromiumFrame],
                        _ids: Union[tuple, list, str, int],
                        index: Optional[int] = 1,
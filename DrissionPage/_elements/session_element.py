@@ -8,12 +8,12 @@
 from html import unescape
 from re import match, sub, DOTALL, search
 
-from lxml.etree import tostring
+from lxml.etree import tostring, Element
 from lxml.html import HtmlElement, fromstring
 
 from .none_element import NoneElement
 from .._base.base import DrissionElement, BasePage, BaseElement
-from .._functions.locator import get_loc
+from .._functions.locator import get_loc, compile_loc
 from .._functions.web import get_ele_txt, make_absolute_link
 
 
@@ -27,6 +27,7 @@ class SessionElement(DrissionElement):
         """
         super().__init__(owner)
         self._inner_ele = ele
+        self._paths = {}  # {模式: 路径}，lxml对象不会变化，获取后一直使用
         self._type = 'SessionElement'
 
     @property
@@ -48,6 +49,8 @@ class SessionElement(DrissionElement):
         return self.ele(locator, index=index)
 
     def __eq__(self, other):
+        if isinstance(other, SessionElement) and self._inner_ele is other._inner_ele:
+            return True
         return self.xpath == getattr(other, 'xpath', None)
 
     def __getattr__(self, item):
@@ -277,20 +280,26 @@ class SessionElement(DrissionElement):
         :param mode: 'css' 或 'xpath'
         :return: css路径或xpath路径
         """
+        if mode in self._paths:
+            return self._paths[mode]
+
         path_str = ''
-        ele = self
+        ele = self._inner_ele
 
-        while ele:
+        while ele is not None:
+            tag = ele.tag
             if mode == 'css':
-                brothers = len(ele.eles(f'xpath:./preceding-sibling::*'))
-                path_str = f'>{ele.tag}:nth-child({brothers + 1}){path_str}'
+                brothers = sum(1 for _ in ele.itersiblings(Element, preceding=True))
+                path_str = f'>{tag}:nth-child({brothers + 1}){path_str}'
             else:
-                brothers = len(ele.eles(f'xpath:./preceding-sibling::{ele.tag}'))
-                path_str = f'/{ele.tag}[{brothers + 1}]{path_str}' if brothers > 0 else f'/{ele.tag}{path_str}'
+                brothers = sum(1 for _ in ele.itersiblings(tag, preceding=True))
+                path_str = f'/{tag}[{brothers + 1}]{path_str}' if brothers > 0 else f'/{tag}{path_str}'
 
-            ele = ele.parent()
+            ele = ele.getparent()
 
-        return f'{path_str[1:]}' if mode == 'css' else path_str
+        path_str = f'{path_str[1:]}' if mode == 'css' else path_str
+        self._paths[mode] = path_str
+        return path_str
 
 
 def make_session_ele(html_or_ele, loc=None, index=1):
@@ -353,22 +362,18 @@ def make_session_ele(html_or_ele, loc=None, index=1):
         page = html_or_ele.owner
         xpath = html_or_ele.xpath
         # ChromiumElement，兼容传入的元素在iframe内的情况
-        html = html_or_ele.owner.run_cdp('DOM.getOuterHTML', objectId=html_or_ele._doc_id)['outerHTML'] \
-            if html_or_ele._doc_id else html_or_ele.owner.html
-        html_or_ele = fromstring(html)
-        html_or_ele = html_or_ele.xpath(xpath)[0]
-
-    elif html_or_ele._type == 'ChromiumFrame':
-        page = html_or_ele
-        html_or_ele = fromstring(html_or_ele.inner_html)
+        if html_or_ele._doc_id:
+            doc = _get_doc_tree(page, html_or_ele._doc_id)
+        elif page._type == 'ChromiumFrame':
+            doc = fromstring(page.html)
+        else:
+            doc = _get_doc_tree(page)
+        html_or_ele = doc.xpath(xpath)[0]
 
-    # 各种页面对象
+    # ChromiumFrame和各种页面对象
     elif isinstance(html_or_ele, BasePage):
         page = html_or_ele
-        html = html_or_ele.html
-        if html.startswith('<?xml '):
-            html = sub(r'^<\?xml.*?>', '', html)
-        html_or_ele = fromstring(html)
+        html_or_ele = _get_doc_tree(page)
 
     # ShadowRoot
     elif isinstance(html_or_ele, BaseElement):
@@ -384,10 +389,7 @@ def make_session_ele(html_or_ele, loc=None, index=1):
 
     # ---------------执行查找-----------------
     try:
-        if loc[0] == 'xpath':  # 用lxml内置方法获取lxml的元素对象列表
-            eles = html_or_ele.xpath(loc[1])
-        else:  # 用css selector获取元素对象列表
-            eles = html_or_ele.cssselect(loc[1])
+        eles = compile_loc(loc)(html_or_ele)  # 用缓存的XPath或CSSSelector对象获取lxml的元素对象列表
 
         if not isinstance(eles, list):  # 结果不是列表，如数字
             return eles
@@ -418,3 +420,36 @@ def make_session_ele(html_or_ele, loc=None, index=1):
             raise SyntaxError(f'无效的css select语句：{loc}')
 
         raise e
+
+
+def _get_doc_tree(page, doc_id=None):
+    """返回页面文档解析后的lxml对象，文档版本没有变化时返回上次解析的对象
+    :param page: 页面对象或ChromiumFrame对象
+    :param doc_id: 元素所在文档的object id，为None时使用页面的文档
+    :return: lxml的HtmlElement对象
+    """
+    if doc_id is None:
+        mirror = getattr(page, '_dom_mirror', None)
+        if mirror is not None and mirror.listening:
+            tree = mirror.tree
+            if tree is not None:  # 镜像连接已断开时从浏览器获取
+                return tree
+        version = page._doc_version()
+    else:  # 同一文档的版本相同，页面和元素的查找共用缓存
+        version = page._obj_doc_version(doc_id)
+
+    cache = page._doc_tree
+    if version is not None and cache is not None and cache[0] == version:
+        return cache[1]
+
+    if doc_id is not None:
+        html = page.run_cdp('DOM.getOuterHTML', objectId=doc_id)['outerHTML']
+    elif page._type == 'ChromiumFrame':
+        html = page.inner_html
+    else:
+        html = page.html
+        if html.startswith('<?xml '):
+            html = sub(r'^<\?xml.*?>', '', html)
+    tree = fromstring(html)
+    page._doc_tree = None if version is None else (version, tree)
+    return tree
@@ -5,7 +5,7 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import Union, List, Tuple, Optional
+from typing import Union, List, Tuple, Optional, Dict
 
 from lxml.html import HtmlElement
 
@@ -20,6 +20,7 @@ class SessionElement(DrissionElement):
 
     def __init__(self, ele: HtmlElement, owner: Union[SessionPage, None] = None):
         self._inner_ele: HtmlElement = ...
+        self._paths: Dict[str, str] = ...
         self.owner: SessionPage = ...
         self.page: SessionPage = ...
 
@@ -5,9 +5,10 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from json import load, dump, JSONDecodeError
-from os import environ
+from json import load, dump, dumps, loads, JSONDecodeError
+from os import environ, pipe, close
 from pathlib import Path
+from platform import system
 from subprocess import Popen, DEVNULL
 from tempfile import gettempdir
 from time import perf_counter, sleep
@@ -57,6 +58,67 @@ def connect_browser(option):
     return False
 
 
+def run_browser_with_pipe(option, timeout=30):
+    """以--remote-debugging-pipe方式启动浏览器，不使用端口和websocket，只支持Linux和macOS
+    :param option: ChromiumOptions对象
+    :param timeout: 等待浏览器可用的超时时间（秒）
+    :return: 浏览器id
+    """
+    if system().lower() == 'windows':
+        raise BrowserConnectError('pipe方式只支持Linux和macOS系统。')
+    from .._base.driver import PipeConnection
+
+    args = get_launch_args(option)
+    set_prefs(option)
+    set_flags(option)
+    try:
+        conn = _run_browser_with_pipe(option.browser_path, args)
+
+    # 传入的路径找不到，主动在ini文件、注册表、系统变量中找
+    except FileNotFoundError:
+        browser_path = get_chrome_path(option.ini_path)
+        if not browser_path:
+            raise FileNotFoundError('无法找到浏览器可执行文件路径，请手动配置。')
+        conn = _run_browser_with_pipe(browser_path, args)
+
+    conn.id = f'pipe_{conn.process.pid}'
+    try:
+        _wait_pipe_ready(conn, timeout)
+    except BrowserConnectError:
+        conn.close()
+        conn.process.kill()
+        raise
+    PipeConnection.CONNECTIONS[conn.id] = conn
+    return conn.id
+
+
+def _wait_pipe_ready(conn, timeout):
+    """等待管道连接的浏览器出现可用标签页，作用与test_connect()相同
+    :param conn: PipeConnection对象
+    :param timeout: 超时时间（秒）
+    :return: None
+    """
+    end_time = perf_counter() + timeout
+    msg_id = 0
+    try:
+        while perf_counter() < end_time:
+            msg_id -= 1  # 用负数id，不与Driver的id冲突
+            conn.send(dumps({'id': msg_id, 'method': 'Target.getTargets'}))
+            while True:
+                r = loads(conn.recv(timeout=max(end_time - perf_counter(), 0)))
+                if r.get('id') == msg_id:
+                    break
+            for tab in r.get('result', {}).get('targetInfos', ()):
+                if tab['type'] in ('page', 'webview'):
+                    return
+            sleep(.2)
+    except (OSError, ValueError):
+        pass
+    raise BrowserConnectError('\n浏览器无法通过管道连接。\n请确认：\n1、用户文件夹没有和已打开的浏览器冲突\n'
+                              '2、如为无界面系统，请添加\'--headless=new\'参数\n'
+                              '3、如果是Linux系统，可能还要添加\'--no-sandbox\'启动参数')
+
+
 def get_launch_args(opt):
     """从ChromiumOptions获取命令行启动参数
     :param opt: ChromiumOptions
@@ -239,6 +301,38 @@ def _run_browser(port, path: str, args) -> Popen:
         raise FileNotFoundError('未找到浏览器，请手动指定浏览器可执行文件路径。')
 
 
+def _run_browser_with_pipe(path, args):
+    """创建以管道通讯的浏览器进程，浏览器从fd 3读取、向fd 4写入
+    管道作为子进程的标准输入输出传入，再由/bin/sh复制到3、4后exec浏览器，子进程中不执行Python代码
+    :param path: 浏览器路径
+    :param args: 启动参数
+    :return: PipeConnection对象
+    """
+    from shutil import which
+    from .._base.driver import PipeConnection
+
+    p = Path(path)
+    p = which(str(p / 'chrome') if p.is_dir() else str(path))
+    if not p:
+        raise FileNotFoundError('未找到浏览器，请手动指定浏览器可执行文件路径。')
+    arguments = ['/bin/sh', '-c', 'exec "$0" "$@" 3<&0 4>&1 0</dev/null 1>/dev/null', p, '--remote-debugging-pipe']
+    arguments.extend(args)
+
+    to_browser_r, to_browser_w = pipe()
+    from_browser_r, from_browser_w = pipe()
+    try:
+        process = Popen(arguments, shell=False, stdin=to_browser_r, stdout=from_browser_w, stderr=DEVNULL,
+                        close_fds=True)
+    except Exception:
+        close(to_browser_w)
+        close(from_browser_r)
+        raise
+    finally:
+        close(to_browser_r)
+        close(from_browser_w)
+    return PipeConnection(from_browser_r, to_browser_w, process)
+
+
 def _make_leave_in_dict(target_dict: dict, src: list, num: int, end: int) -> None:
     """把prefs中a.b.c形式的属性转为a['b']['c']形式
     :param target_dict: 要处理的字典
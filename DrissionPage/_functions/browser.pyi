@@ -7,12 +7,19 @@
 """
 from typing import Union
 
+from .._base.driver import PipeConnection
 from .._configs.chromium_options import ChromiumOptions
 
 
 def connect_browser(option: ChromiumOptions) -> bool: ...
 
 
+def run_browser_with_pipe(option: ChromiumOptions, timeout: float = 30) -> str: ...
+
+
+def _wait_pipe_ready(conn: PipeConnection, timeout: float) -> None: ...
+
+
 def get_launch_args(opt: ChromiumOptions) -> list: ...
 
 
@@ -25,4 +32,7 @@ def set_flags(opt: ChromiumOptions) -> None: ...
 def test_connect(ip: str, port: Union[int, str], timeout: float = 30) -> None: ...
 
 
+def _run_browser_with_pipe(path: str, args: list) -> PipeConnection: ...
+
+
 def get_chrome_path(ini_path: str) -> Union[str, None]: ...
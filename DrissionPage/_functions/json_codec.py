@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from json import dumps as _json_dumps, loads as _json_loads
+
+_CODECS = {}
+_METHOD_HEAD = '{"method":"'
+_SESSION_TAIL = ',"sessionId":"'
+
+
+def _json_codec():
+    return _json_loads, _json_dumps
+
+
+def _orjson_codec():
+    from orjson import loads, dumps
+    return _with_fallback(loads, lambda obj: dumps(obj).decode('utf-8'))
+
+
+def _ujson_codec():
+    from ujson import loads, dumps
+    return _with_fallback(loads, dumps)
+
+
+def _with_fallback(loads, dumps):
+    """第三方库不支持的数据（如超过64位的整数）改用标准库处理
+    :param loads: 第三方库的loads方法
+    :param dumps: 第三方库的dumps方法
+    :return: (loads方法, dumps方法)
+    """
+
+    def safe_loads(raw):
+        try:
+            return loads(raw)
+        except ValueError:
+            return _json_loads(raw)
+
+    def safe_dumps(obj):
+        try:
+            return dumps(obj)
+        except (TypeError, ValueError, OverflowError):
+            return _json_dumps(obj)
+
+    return safe_loads, safe_dumps
+
+
+_FACTORIES = {'orjson': _orjson_codec, 'ujson': _ujson_codec, 'json': _json_codec}
+
+
+def get_codec(name=None):
+    """获取json编解码方法，解码失败时抛出ValueError或其子类
+    :param name: 'orjson', 'ujson', 'json'，为None时使用标准库json；第三方库不支持的数据自动改用标准库处理
+    :return: (名称, loads方法, dumps方法)组成的元组，dumps返回str
+    """
+    name = name or 'json'
+    if name in _CODECS:
+        return _CODECS[name]
+
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"name只能是 'orjson', 'ujson', 'json' 或None，现在是：{name}")
+    _CODECS[name] = (name,) + factory()
+    return _CODECS[name]
+
+
+def peek_event(raw):
+    """不完整解析信息，从原始文本中读取事件名和sessionId，用于跳过无人处理的事件
+    依赖浏览器输出事件时method在最前、sessionId在最后的顺序，无法识别时视为需要完整解析
+    :param raw: 浏览器发来的原始json文本
+    :return: (事件名, sessionId)组成的元组，不是事件时返回(None, None)，没有sessionId时其为None，
+             文本中有sessionId但无法确定时其为False，调用者应完整解析
+    """
+    if not raw.startswith(_METHOD_HEAD):
+        return None, None
+    end = raw.find('"', 11)
+    if end < 0:
+        return None, None
+
+    session_id = None
+    if raw.endswith('"}'):
+        i = raw.rfind(_SESSION_TAIL, max(end, len(raw) - 80))
+        if i > 0:
+            session_id = raw[i + 14:-2]
+            if '"' in session_id:
+                session_id = False
+    if session_id is None and _SESSION_TAIL in raw:
+        session_id = False
+    return raw[11:end], session_id
@@ -0,0 +1,22 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Callable, Optional, Tuple, Literal, Any, Union
+
+_CODECS: dict = ...
+_FACTORIES: dict = ...
+
+
+def _with_fallback(loads: Callable[[Union[str, bytes]], Any],
+                   dumps: Callable[[Any], str]) -> Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]: ...
+
+
+def get_codec(name: Optional[Literal['orjson', 'ujson', 'json']] = None
+              ) -> Tuple[str, Callable[[Union[str, bytes]], Any], Callable[[Any], str]]: ...
+
+
+def peek_event(raw: str) -> Tuple[Optional[str], Union[str, None, bool]]: ...
@@ -5,9 +5,13 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from functools import lru_cache
 from re import split
+
 from .by import By
 
+LOC_CACHE_SIZE = 1024  # 定位符解析结果和lxml编译结果各自缓存的数量
+
 
 def is_loc(text):
     """返回text是否定位符"""
@@ -22,15 +26,20 @@ def get_loc(loc, translate_css=False, css_mode=False):
     :param css_mode: 是否尽量用css selector方式
     :return: DrissionPage定位元组
     """
+    if not isinstance(loc, (tuple, str)):
+        raise TypeError('loc参数只能是tuple或str。')
+    return _get_loc(loc, translate_css, css_mode)
+
+
+@lru_cache(maxsize=LOC_CACHE_SIZE)
+def _get_loc(loc, translate_css, css_mode):
+    """get_loc()的实际执行者，结果按参数缓存"""
     if isinstance(loc, tuple):
         loc = translate_css_loc(loc) if css_mode else translate_loc(loc)
 
     elif isinstance(loc, str):
         loc = str_to_css_loc(loc) if css_mode else str_to_xpath_loc(loc)
 
-    else:
-        raise TypeError('loc参数只能是tuple或str。')
-
     if loc[0] == 'css selector' and translate_css:
         from lxml.cssselect import CSSSelector, ExpressionError
         try:
@@ -43,6 +52,32 @@ def get_loc(loc, translate_css=False, css_mode=False):
     return loc
 
 
+@lru_cache(maxsize=LOC_CACHE_SIZE)
+def compile_loc(loc):
+    """把标准定位元组编译为lxml的XPath或CSSSelector对象，结果按定位元组缓存
+    :param loc: get_loc()返回的定位元组
+    :return: 可传入lxml元素调用的查询对象
+    """
+    if loc[0] == 'xpath':
+        from lxml.etree import XPath
+        return XPath(loc[1])
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(loc[1], translator='html')
+
+
+def loc_cache_info():
+    """返回定位符解析缓存和lxml编译缓存的命中情况
+    :return: {'loc': {...}, 'compiled': {...}}，每项含hits、misses、maxsize、currsize
+    """
+    return {'loc': _get_loc.cache_info()._asdict(), 'compiled': compile_loc.cache_info()._asdict()}
+
+
+def clear_loc_cache():
+    """清空定位符解析缓存和lxml编译缓存"""
+    _get_loc.cache_clear()
+    compile_loc.cache_clear()
+
+
 def str_to_xpath_loc(loc):
     """处理元素查找语句
     :param loc: 查找语法字符串
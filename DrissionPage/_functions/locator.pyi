@@ -5,7 +5,12 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
-from typing import Union
+from typing import Union, Dict
+
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
+
+LOC_CACHE_SIZE: int = ...
 
 
 def is_loc(text: str) -> bool: ...
@@ -14,6 +19,15 @@ def is_loc(text: str) -> bool: ...
 def get_loc(loc: Union[tuple, str], translate_css: bool = False, css_mode: bool = False) -> tuple: ...
 
 
+def compile_loc(loc: tuple) -> Union[XPath, CSSSelector]: ...
+
+
+def loc_cache_info() -> Dict[str, Dict[str, int]]: ...
+
+
+def clear_loc_cache() -> None: ...
+
+
 def str_to_xpath_loc(loc: str) -> tuple: ...
 
 
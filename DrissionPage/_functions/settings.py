@@ -14,3 +14,10 @@ class Settings(object):
     singleton_tab_obj = True
     cdp_timeout = 30
     auto_handle_alert = None
+    event_workers = 1  # 每个Driver处理普通事件的线程数，大于1时不同顺序键的事件回调并行执行，彼此间不保证顺序
+    event_order_key = 'domain'  # 事件顺序键，'domain'、事件参数名（如'requestId'、'frameId'）或方法
+    event_queue_size = 0  # 每个Driver积压普通事件的上限，为0时不限制
+    event_queue_policy = 'drop_oldest'  # 超出上限时的处理方式，'block'、'drop_oldest'、'drop_newest'、'coalesce'
+    cdp_stats = False  # 是否为新建的Driver开启cdp调用统计，可用driver.stats()获取
+    json_codec = None  # 'orjson', 'ujson', 'json'，为None时使用标准库json，可指定已安装的更快的库
+    wait_by_mutation = False  # 查找元素时是否用页面中的MutationObserver等待元素出现，代替每0.1秒重新查找
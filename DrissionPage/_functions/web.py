@@ -37,51 +37,72 @@ def get_ele_txt(e):
     if e.tag in noText_list:
         return e.raw_text
 
-    def get_node_txt(ele, pre: bool = False):
+    str_list = []
+
+    def enter(ele, pre):
+        """开始处理一个元素，返回其处理状态，不需要处理子节点时返回None"""
         tag = ele.tag
         if tag == 'br':
-            return [True]
+            str_list.append(True)
+            return None
         if not pre and tag == 'pre':
             pre = True
-
-        str_list = []
         if tag in noText_list and not pre:  # 标签内的文本不返回
-            return str_list
+            return None
+        # [tag, 是否在pre内, 本元素文本在str_list中的起点, 上一个子元素tag, 子节点迭代器]
+        return [tag, pre, len(str_list), '', _child_nodes(ele)]
+
+    stack = [enter(e.inner_ele, False)]
+    if stack[0] is None:
+        stack.clear()
+    while stack:
+        state = stack[-1]
+        tag, pre, begin = state[:3]
+        node = next(state[4], None)
+
+        if node is None:  # 子节点处理完毕
+            stack.pop()
+            if tag in wrap_after_list and len(str_list) > begin and str_list[-1] not in ('\n', True):  # 有些元素后面要添加回车
+                str_list.append('\n')
+
+        elif isinstance(node, str):  # 字符节点
+            if node == '\n':
+                continue
+            if pre:
+                str_list.append(node)
+            elif node.strip(' \n\t\r'):  # 字符除了回车和空格还有其它内容
+                txt = node.replace('\r\n', ' ').replace('\n', ' ').strip(' ')
+                str_list.append(sub(r' {2,}', ' ', txt) if '  ' in txt else txt)
+
+        else:  # 元素节点
+            node_tag = node.tag
+            if node_tag not in nowrap_list and len(str_list) > begin and str_list[-1] != '\n':  # 元素间换行的情况
+                str_list.append('\n')
+            if node_tag in tab_list and state[3] in tab_list:  # 表格的行
+                str_list.append('\t')
+            state[3] = node_tag
+            child = enter(node, pre)
+            if child:
+                stack.append(child)
+
+    if str_list and str_list[-1] == '\n':
+        str_list.pop()
+    re_str = ''.join([i if i is not True else '\n' for i in str_list])
+    return format_html(re_str)
 
-        nodes = ele.eles('xpath:./text() | *')
-        prev_ele = ''
-        for el in nodes:
-            if isinstance(el, str):  # 字符节点
-                if pre:
-                    str_list.append(el)
 
-                else:
-                    if sub('[ \n\t\r]', '', el) != '':  # 字符除了回车和空格还有其它内容
-                        txt = el
-                        if not pre:
-                            txt = txt.replace('\r\n', ' ').replace('\n', ' ').strip(' ')
-                            txt = sub(r' {2,}', ' ', txt)
-                        str_list.append(txt)
-
-            else:  # 元素节点
-                if el.tag not in nowrap_list and str_list and str_list[-1] != '\n':  # 元素间换行的情况
-                    str_list.append('\n')
-                if el.tag in tab_list and prev_ele in tab_list:  # 表格的行
-                    str_list.append('\t')
-
-                str_list.extend(get_node_txt(el, pre))
-                prev_ele = el.tag
-
-        if tag in wrap_after_list and str_list and str_list[-1] not in ('\n', True):  # 有些元素后面要添加回车
-            str_list.append('\n')
-
-        return str_list
-
-    re_str = get_node_txt(e)
-    if re_str and re_str[-1] == '\n':
-        re_str.pop()
-    re_str = ''.join([i if i is not True else '\n' for i in re_str])
-    return format_html(re_str)
+def _child_nodes(ele):
+    """按文档顺序返回lxml元素下的文本节点和元素节点，与xpath的'./text() | *'结果一致
+    :param ele: lxml元素对象
+    :return: 文本或lxml元素对象的生成器
+    """
+    if ele.text is not None:
+        yield ele.text
+    for child in ele:
+        if isinstance(child.tag, str):  # 注释等非元素节点只取其后的文本
+            yield child
+        if child.tail is not None:
+            yield child.tail
 
 
 def format_html(text):
@@ -0,0 +1,254 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Event, wait_for, TimeoutError as AsyncTimeoutError
+
+from .chromium_base import Timeout
+from .._base.async_driver import AsyncDriver, get_json
+from .._elements.async_element import async_run_js, async_find, make_none_ele
+from .._functions.tools import raise_error
+from .._units.async_listener import AsyncListener
+from .._units.async_waiter import AsyncTabWaiter
+from ..errors import BrowserConnectError, ContextLostError
+
+
+class AsyncChromiumTab(object):
+    """基于asyncio的标签页对象，一个事件循环可同时操作大量标签页，不需为每个连接创建线程
+    用法：
+        async with AsyncChromiumTab('127.0.0.1:9222') as tab:
+            await tab.get('https://www.example.com')
+            ele = await tab.ele('tag:h1')
+    """
+
+    def __init__(self, address, tab_id=None, timeout=None, load_mode='normal'):
+        """
+        :param address: 浏览器地址，ip:port
+        :param tab_id: 要控制的标签页id，为None时控制第一个标签页
+        :param timeout: 默认超时时间（秒）
+        :param load_mode: 加载模式，'normal'或'eager'
+        """
+        if load_mode not in ('normal', 'eager'):
+            raise ValueError("load_mode只能是'normal'或'eager'。")
+        self.address = address
+        self.driver = None
+        self.timeouts = Timeout(self, base=timeout)
+        self._target_id = tab_id
+        self._frame_id = None
+        self._root_id = None
+        self._load_mode = load_mode
+        self._loaded = None
+        self._load_started = None
+        self._listener = None
+        self._wait = None
+        self._none_ele_value = None
+        self._none_ele_return_value = False
+
+    def __repr__(self):
+        return f'<AsyncChromiumTab browser_address={self.address} tab_id={self._target_id}>'
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    @property
+    def tab_id(self):
+        """返回当前标签页id"""
+        return self._target_id
+
+    @property
+    def timeout(self):
+        """返回通用timeout设置"""
+        return self.timeouts.base
+
+    @property
+    def listen(self):
+        """返回用于聆听数据包的对象"""
+        if self._listener is None:
+            self._listener = AsyncListener(self)
+        return self._listener
+
+    @property
+    def wait(self):
+        """返回用于等待的对象"""
+        if self._wait is None:
+            self._wait = AsyncTabWaiter(self)
+        return self._wait
+
+    async def connect(self):
+        """连接标签页
+        :return: 当前对象
+        """
+        if not self._target_id:
+            try:
+                tabs = await get_json(self.address, '/json')
+            except OSError:
+                raise BrowserConnectError(f'\n浏览器连接失败，地址：{self.address}')
+            for tab in tabs:
+                if tab['type'] == 'page' and not tab['url'].startswith('devtools://'):
+                    self._target_id = tab['id']
+                    break
+            else:
+                raise BrowserConnectError('浏览器中没有可用的标签页。')
+
+        self._loaded = Event()
+        self._load_started = Event()
+        self.driver = AsyncDriver(self._target_id, 'page', self.address, self)
+        await self.driver.start()
+        self.driver.set_callback('Page.frameStartedLoading', self._onFrameStartedLoading)
+        self.driver.set_callback('Page.frameNavigated', self._onFrameNavigated)
+        self.driver.set_callback('Page.domContentEventFired', self._onDomContentEventFired)
+        self.driver.set_callback('Page.loadEventFired', self._onLoadEventFired)
+        self.driver.set_callback('Page.frameStoppedLoading', self._onFrameStoppedLoading)
+
+        r = await self.run_cdp_batch(['Page.enable', 'Page.getFrameTree',
+                                      ('Runtime.evaluate', {'expression': 'document.readyState',
+                                                            'returnByValue': True})])
+        self._frame_id = r[1]['frameTree']['frame']['id']
+        state = r[2]['result']['value']
+        if state == 'complete' or (state == 'interactive' and self._load_mode == 'eager'):
+            self._loaded.set()
+        return self
+
+    async def disconnect(self):
+        """断开与标签页的连接，不关闭标签页"""
+        if self.driver:
+            await self.driver.stop()
+
+    async def close(self):
+        """关闭标签页"""
+        await self.run_cdp('Page.close', _ignore=Exception)
+        await self.disconnect()
+
+    async def run_cdp(self, cmd, **cmd_args):
+        """执行Chrome DevTools Protocol语句
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 执行的结果
+        """
+        ignore = cmd_args.pop('_ignore', None)
+        r = await self.driver.run(cmd, **cmd_args)
+        return r if 'error' not in r else raise_error(r, ignore)
+
+    async def run_cdp_batch(self, cmds):
+        """批量执行Chrome DevTools Protocol语句，所有语句连续发出后统一等待结果
+        :param cmds: 语句组成的列表，每项为(协议项目, 参数dict)元组或协议项目字符串
+        :return: 执行结果组成的列表，顺序与cmds一致
+        """
+        return [r if 'error' not in r else raise_error(r) for r in await self.driver.run_many(cmds)]
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        """运行javascript代码
+        :param script: js文本或js文件路径
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用页面timeouts.script设置
+        :return: 运行的结果
+        """
+        return await async_run_js(self, script, as_expr, self.timeouts.script if timeout is None else timeout, args)
+
+    async def get(self, url, show_errmsg=False, timeout=None):
+        """访问url，等待页面加载完成
+        :param url: 目标url
+        :param show_errmsg: 是否显示和抛出异常
+        :param timeout: 连接超时时间（秒），为None时使用页面timeouts.page_load设置
+        :return: 目标url是否可用
+        """
+        timeout = self.timeouts.page_load if timeout is None else timeout
+        self._loaded.clear()
+        self._root_id = None
+        r = await self.run_cdp('Page.navigate', url=url, _timeout=timeout)
+        if r.get('errorText'):
+            self._loaded.set()
+            if show_errmsg:
+                raise ConnectionError(r['errorText'])
+            return False
+        if not r.get('loaderId'):  # 同文档跳转不会触发加载
+            self._loaded.set()
+
+        try:
+            await wait_for(self._loaded.wait(), timeout)
+        except AsyncTimeoutError:
+            await self.run_cdp('Page.stopLoading', _ignore=Exception)
+            if show_errmsg:
+                raise TimeoutError(f'页面连接超时（等待{timeout}秒）。')
+            return False
+        return True
+
+    async def ele(self, locator, index=1, timeout=None):
+        """获取一个符合条件的元素、属性或节点文本
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找元素超时时间（秒），默认与页面等待时间一致
+        :return: AsyncChromiumElement对象或属性、文本
+        """
+        r = await async_find(self, locator, index, self.timeout if timeout is None else timeout)
+        return make_none_ele(self, 'ele()', {'locator': locator, 'index': index}) if r is None else r
+
+    async def eles(self, locator, timeout=None):
+        """获取所有符合条件的元素、属性或节点文本
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param timeout: 查找元素超时时间（秒），默认与页面等待时间一致
+        :return: AsyncChromiumElement对象或属性、文本组成的列表
+        """
+        return await async_find(self, locator, None, self.timeout if timeout is None else timeout) or []
+
+    async def url(self):
+        """返回当前页面url"""
+        return (await self.run_cdp('Target.getTargetInfo', targetId=self._target_id))['targetInfo']['url']
+
+    async def title(self):
+        """返回当前页面title"""
+        return (await self.run_cdp('Target.getTargetInfo', targetId=self._target_id))['targetInfo']['title']
+
+    async def html(self):
+        """返回当前页面html文本"""
+        return await self.run_js('return document.documentElement.outerHTML;')
+
+    async def _get_root_id(self):
+        """返回当前document的object id，页面刷新后重新获取"""
+        if self._root_id is None:
+            await self.wait.doc_loaded()
+            r = await self.run_cdp('Runtime.evaluate', expression='document', returnByValue=False)
+            if 'objectId' not in r.get('result', {}):
+                raise ContextLostError
+            self._root_id = r['result']['objectId']
+        return self._root_id
+
+    def _onFrameStartedLoading(self, **kwargs):
+        """页面开始加载时执行"""
+        if kwargs['frameId'] == self._frame_id:
+            self._root_id = None
+            self._loaded.clear()
+            self._load_started.set()
+
+    def _onFrameNavigated(self, **kwargs):
+        """页面跳转时执行"""
+        if not kwargs['frame'].get('parentId'):
+            self._frame_id = kwargs['frame']['id']
+            self._root_id = None
+
+    async def _onDomContentEventFired(self, **kwargs):
+        """eager模式下DOM加载完成即视为加载完成"""
+        if self._load_mode == 'eager':
+            await self.run_cdp('Page.stopLoading', _ignore=Exception)
+            self._loaded.set()
+
+    def _onLoadEventFired(self, **kwargs):
+        """页面加载完成时执行"""
+        self._loaded.set()
+
+    def _onFrameStoppedLoading(self, **kwargs):
+        """页面停止加载时执行"""
+        if kwargs['frameId'] == self._frame_id:
+            self._loaded.set()
+
+    def _on_disconnect(self):
+        """连接断开时释放等待"""
+        if self._loaded:
+            self._loaded.set()
@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Event
+from typing import Union, Tuple, List, Any, Optional, Literal
+
+from .chromium_base import Timeout
+from .._base.async_driver import AsyncDriver
+from .._elements.async_element import AsyncChromiumElement
+from .._elements.none_element import NoneElement
+from .._units.async_listener import AsyncListener
+from .._units.async_waiter import AsyncTabWaiter
+
+
+class AsyncChromiumTab(object):
+    address: str
+    driver: Optional[AsyncDriver]
+    timeouts: Timeout
+    _target_id: Optional[str]
+    _frame_id: Optional[str]
+    _root_id: Optional[str]
+    _load_mode: str
+    _loaded: Optional[Event]
+    _load_started: Optional[Event]
+    _listener: Optional[AsyncListener]
+    _wait: Optional[AsyncTabWaiter]
+    _none_ele_value: Any
+    _none_ele_return_value: bool
+
+    def __init__(self,
+                 address: str,
+                 tab_id: str = None,
+                 timeout: float = None,
+                 load_mode: Literal['normal', 'eager'] = 'normal'): ...
+
+    async def __aenter__(self) -> AsyncChromiumTab: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def tab_id(self) -> str: ...
+
+    @property
+    def timeout(self) -> float: ...
+
+    @property
+    def listen(self) -> AsyncListener: ...
+
+    @property
+    def wait(self) -> AsyncTabWaiter: ...
+
+    async def connect(self) -> AsyncChromiumTab: ...
+
+    async def disconnect(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def run_cdp(self, cmd: str, **cmd_args) -> dict: ...
+
+    async def run_cdp_batch(self, cmds: List[Union[str, Tuple[str, dict]]]) -> List[dict]: ...
+
+    async def run_js(self, script: str, *args, as_expr: bool = False, timeout: float = None) -> Any: ...
+
+    async def get(self, url: str, show_errmsg: bool = False, timeout: float = None) -> bool: ...
+
+    async def ele(self,
+                  locator: Union[Tuple[str, str], str],
+                  index: int = 1,
+                  timeout: float = None) -> Union[AsyncChromiumElement, str, NoneElement]: ...
+
+    async def eles(self,
+                   locator: Union[Tuple[str, str], str],
+                   timeout: float = None) -> List[Union[AsyncChromiumElement, str]]: ...
+
+    async def url(self) -> str: ...
+
+    async def title(self) -> str: ...
+
+    async def html(self) -> str: ...
+
+    async def _get_root_id(self) -> str: ...
+
+    def _onFrameStartedLoading(self, **kwargs) -> None: ...
+
+    def _onFrameNavigated(self, **kwargs) -> None: ...
+
+    async def _onDomContentEventFired(self, **kwargs) -> None: ...
+
+    def _onLoadEventFired(self, **kwargs) -> None: ...
+
+    def _onFrameStoppedLoading(self, **kwargs) -> None: ...
+
+    def _on_disconnect(self) -> None: ...
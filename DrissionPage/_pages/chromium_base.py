@@ -9,13 +9,12 @@ from json import loads, JSONDecodeError
 from os.path import sep
 from pathlib import Path
 from re import findall
-from threading import Thread
 from time import perf_counter, sleep
 
 from DataRecorder.tools import make_valid_name
 
 from .._base.base import BasePage
-from .._elements.chromium_element import run_js, make_chromium_eles
+from .._elements.chromium_element import run_js, make_chromium_eles, wait_for_mutation, make_snapshot, SNAPSHOT_JS
 from .._elements.none_element import NoneElement
 from .._elements.session_element import make_session_ele
 from .._functions.locator import get_loc, is_loc
@@ -23,7 +22,11 @@ from .._functions.settings import Settings
 from .._functions.tools import raise_error
 from .._functions.web import location_in_viewport
 from .._units.actions import Actions
+from .._units.dom_mirror import DomMirror
+from .._units.dom_snapshot import DomSnapshot
 from .._units.listener import Listener
+from .._units.load_state import LoadState, NetworkIdle, LIFECYCLE_MODES, timers
+from .._units.object_groups import ObjectGroups
 from .._units.rect import TabRect
 from .._units.screencast import Screencast
 from .._units.scroller import PageScroller
@@ -33,6 +36,17 @@ from .._units.waiter import BaseWaiter
 from ..errors import ContextLostError, CDPError, PageDisconnectedError, ElementNotFoundError, ElementLostError
 
 __ERROR__ = 'error'
+# 在文档上记录一个随机标识和DOM变化次数，第一次调用时开始记录，返回[标识, 次数]
+# 同一文档的不同object id得到相同的标识，可用来判断元素是否在同一文档中
+DOC_VERSION_JS = '''function(){
+    const k = Symbol.for('DrissionPage.docVersion');
+    if(this[k] === undefined){
+        const v = this[k] = {id: Math.random().toString(36).slice(2), n: 0};
+        new MutationObserver(() => {v.n++;}).observe(this,
+            {subtree: true, childList: true, attributes: true, characterData: true});
+    }
+    return [this[k].id, this[k].n];
+}'''
 
 
 class ChromiumBase(BasePage):
@@ -45,6 +59,11 @@ class ChromiumBase(BasePage):
         :param timeout: 超时时间（秒）
         """
         super().__init__()
+        if not hasattr(self, '_load_state'):
+            self._load_state = LoadState()
+        self._eager_task = None  # eager模式下超时停止加载的计时任务
+        self._load_events = None  # 加载策略已开启的事件，'lifecycle'、'network'或None
+        self._network_idle = None
         self._is_loading = None
         self._root_id = None  # object id
         self._set = None
@@ -64,6 +83,9 @@ class ChromiumBase(BasePage):
         self._type = 'ChromiumBase'
         if not hasattr(self, '_listener'):
             self._listener = None
+        if not hasattr(self, '_object_groups'):
+            self._object_groups = ObjectGroups(self)
+        self._dom_mirror = None
 
         if isinstance(address, int) or (isinstance(address, str) and address.isdigit()):
             address = f'127.0.0.1:{address}'
@@ -84,6 +106,7 @@ class ChromiumBase(BasePage):
     def _d_set_runtime_settings(self):
         self._timeouts = Timeout(self)
         self._load_mode = 'normal'
+        self._idle_rule = (0, .5)
 
     def _connect_browser(self, tab_id=None):
         """连接浏览器，在第一次时运行
@@ -93,7 +116,7 @@ class ChromiumBase(BasePage):
         self._is_reading = False
 
         if not tab_id:
-            tabs = self.browser.driver.get(f'http://{self.address}/json').json()
+            tabs = self.browser._get_tabs_info()
             tabs = [(i['id'], i['url']) for i in tabs
                     if i['type'] in ('page', 'webview') and not i['url'].startswith('devtools://')]
             dialog = None
@@ -147,6 +170,46 @@ class ChromiumBase(BasePage):
         self._driver.set_callback('Page.frameStoppedLoading', self._onFrameStoppedLoading)
         self._driver.set_callback('Page.frameAttached', self._onFrameAttached)
         self._driver.set_callback('Page.frameDetached', self._onFrameDetached)
+        self._load_events = None
+        self._apply_load_mode()
+
+    def _set_load_mode(self, mode, rule=None):
+        """设置加载策略
+        :param mode: 加载策略
+        :param rule: in_flight策略的(请求数, 持续秒数)
+        :return: None
+        """
+        self._load_mode = mode
+        if rule:
+            self._idle_rule = rule
+        self._apply_load_mode()
+
+    def _apply_load_mode(self):
+        """按加载策略开启所需的生命周期事件或网络事件，并关闭不再需要的"""
+        mode = self._load_mode
+        need = 'lifecycle' if mode in LIFECYCLE_MODES else 'network' if mode == 'in_flight' else None
+        if need == self._load_events and need != 'network':  # network时重新开始以使用新的规则
+            return
+
+        if self._load_events == 'lifecycle':
+            self._driver.set_callback('Page.lifecycleEvent', None)
+            self._driver.run('Page.setLifecycleEventsEnabled', enabled=False)
+        elif self._load_events == 'network':  # 其它功能也可能用到Network域，只解除回调
+            for event in ('Network.requestWillBeSent', 'Network.loadingFinished', 'Network.loadingFailed'):
+                self._driver.set_callback(event, None)
+            self._network_idle = None
+
+        if need == 'lifecycle':
+            self._driver.set_callback('Page.lifecycleEvent', self._onLifecycleEvent)
+            self._driver.run('Page.setLifecycleEventsEnabled', enabled=True)
+        elif need == 'network':
+            self._network_idle = NetworkIdle(self._load_state, *self._idle_rule)
+            self._driver.set_callback('Network.requestWillBeSent', self._network_idle._onRequestWillBeSent)
+            self._driver.set_callback('Network.loadingFinished', self._network_idle._onLoadingFinished)
+            self._driver.set_callback('Network.loadingFailed', self._network_idle._onLoadingFinished)
+            self._driver.run('Network.enable')
+            self._network_idle.reset()
+        self._load_events = need
 
     def _get_document(self, timeout=10):
         """获取页面文档
@@ -163,8 +226,8 @@ class ChromiumBase(BasePage):
                 b_id = self.run_cdp('DOM.getDocument', _timeout=timeout)['root']['backendNodeId']
                 timeout = end_time - perf_counter()
                 timeout = 1 if timeout <= 1 else timeout
-                self._root_id = self.run_cdp('DOM.resolveNode', backendNodeId=b_id,
-                                             _timeout=timeout)['object']['objectId']
+                self._root_id = self.run_cdp('DOM.resolveNode', backendNodeId=b_id, _timeout=timeout,
+                                             objectGroup=self._object_groups.root_group)['object']['objectId']
                 result = True
                 break
 
@@ -199,13 +262,13 @@ class ChromiumBase(BasePage):
         self.browser._frames[kwargs['frameId']] = self.tab_id
         if kwargs['frameId'] == self._frame_id:
             self._doc_got = False
+            self._load_state.set(lifecycle=frozenset())
             self._ready_state = 'connecting'
             self._is_loading = True
             self._load_end_time = perf_counter() + self.timeouts.page_load
             if self._load_mode == 'eager':
-                t = Thread(target=self._wait_to_stop)
-                t.daemon = True
-                t.start()
+                timers.cancel(self._eager_task)
+                self._eager_task = timers.schedule(self.timeouts.page_load, self._wait_to_stop)
 
     def _onFrameNavigated(self, **kwargs):
         """页面跳转时执行"""
@@ -213,6 +276,16 @@ class ChromiumBase(BasePage):
             self._doc_got = False
             self._ready_state = 'loading'
             self._is_loading = True
+            self._object_groups.new_load()
+            if self._network_idle:
+                self._network_idle.reset(kwargs['frame'].get('loaderId'))
+
+    def _onLifecycleEvent(self, **kwargs):
+        """记录主框架的生命周期事件，init表示新文档开始"""
+        if kwargs['frameId'] == self._frame_id:
+            name = kwargs['name']
+            self._load_state.set(lifecycle=frozenset((name,)) if name == 'init'
+                                 else self._load_state.lifecycle | {name})
 
     def _onDomContentEventFired(self, **kwargs):
         """在页面刷新、变化后重新读取页面内容"""
@@ -259,12 +332,13 @@ class ChromiumBase(BasePage):
         return self.ele(locator, index, timeout)
 
     def _wait_to_stop(self):
-        """eager策略超时时使页面停止加载"""
-        end_time = perf_counter() + self.timeouts.page_load
-        while perf_counter() < end_time:
-            sleep(.1)
+        """eager策略超时时使页面停止加载，由计时器线程调用，不等待停止结果"""
+        self._eager_task = None
         if self._ready_state in ('interactive', 'complete') and self._is_loading:
-            self.stop_loading()
+            try:
+                self.run_cdp('Page.stopLoading')
+            except (PageDisconnectedError, CDPError):
+                pass
 
     # ----------挂件----------
     @property
@@ -303,6 +377,24 @@ class ChromiumBase(BasePage):
             self._listener = Listener(self)
         return self._listener
 
+    @property
+    def _dom_version(self):
+        """返回不需与浏览器通讯就能得知的DOM版本，DOM镜像同步中时为镜像的版本，否则为None"""
+        mirror = self._dom_mirror
+        return mirror.version if mirror is not None and mirror.listening else None
+
+    @property
+    def dom_mirror(self):
+        """返回本地DOM镜像对象，调用其start()后html、s_ele()、s_eles()使用本地镜像"""
+        if self._dom_mirror is None:
+            self._dom_mirror = DomMirror(self)
+        return self._dom_mirror
+
+    @property
+    def object_groups(self):
+        """返回管理远程对象组的对象，可查看未释放的对象数"""
+        return self._object_groups
+
     @property
     def states(self):
         """返回用于获取状态信息的对象"""
@@ -362,9 +454,30 @@ class ChromiumBase(BasePage):
     @property
     def html(self):
         """返回当前页面html文本"""
+        if self._dom_mirror is not None and self._dom_mirror.listening:
+            html = self._dom_mirror.html
+            if html is not None:  # 镜像连接已断开时从浏览器获取
+                return html
         self.wait.doc_loaded()
         return self.run_cdp('DOM.getOuterHTML', objectId=self._root_id)['outerHTML']
 
+    def _doc_version(self):
+        """返回当前文档的版本，由文档标识和页面中记录的DOM变化次数组成，无法获取时返回None"""
+        self.wait.doc_loaded()
+        return self._obj_doc_version(self._root_id)
+
+    def _obj_doc_version(self, doc_id):
+        """返回指定文档的版本，由文档标识和记录的DOM变化次数组成，无法获取时返回None
+        :param doc_id: 文档的object id
+        :return: (文档标识, 变化次数)或None
+        """
+        try:
+            r = self.run_cdp('Runtime.callFunctionOn', functionDeclaration=DOC_VERSION_JS,
+                             objectId=doc_id, returnByValue=True)
+            return tuple(r['result']['value'])
+        except Exception:
+            return None
+
     @property
     def json(self):
         """当返回内容是json格式时，返回对应的字典，非json格式时返回None"""
@@ -403,6 +516,24 @@ class ChromiumBase(BasePage):
         """返回等待上传文件列表"""
         return self._upload_list
 
+    @property
+    def _is_loading(self):
+        """返回页面是否正在加载"""
+        return self._load_state.is_loading
+
+    @_is_loading.setter
+    def _is_loading(self, is_loading):
+        self._load_state.set(is_loading=is_loading)
+
+    @property
+    def _ready_state(self):
+        """返回事件记录的页面加载状态"""
+        return self._load_state.ready_state
+
+    @_ready_state.setter
+    def _ready_state(self, state):
+        self._load_state.set(ready_state=state)
+
     @property
     def _js_ready_state(self):
         """返回js获取的ready state信息"""
@@ -420,8 +551,45 @@ class ChromiumBase(BasePage):
         :return: 执行的结果
         """
         ignore = cmd_args.pop('_ignore', None)
+        group = self._object_groups.prepare(cmd, cmd_args)
         r = self.driver.run(cmd, **cmd_args)
-        return r if __ERROR__ not in r else raise_error(r, ignore)
+        if __ERROR__ in r:
+            return raise_error(r, ignore)
+        if group:
+            self._object_groups.record(group, r)
+        return r
+
+    def run_cdp_batch(self, cmds, raise_err=True):
+        """批量执行Chrome DevTools Protocol语句，所有语句连续发出后统一等待结果
+        :param cmds: 语句组成的列表，每项为(协议项目, 参数dict)元组或协议项目字符串，参数中可使用_ignore和_timeout
+        :param raise_err: 有语句出错时是否抛出异常，为False时在该语句对应位置返回异常对象
+        :return: 执行结果组成的列表，顺序与cmds一致
+        """
+        ignores = []
+        groups = []
+        to_run = []
+        for cmd in cmds:
+            if isinstance(cmd, str):
+                cmd = (cmd, None)
+            args = dict(cmd[1]) if len(cmd) > 1 and cmd[1] else {}
+            ignores.append(args.pop('_ignore', None))
+            groups.append(self._object_groups.prepare(cmd[0], args))
+            to_run.append((cmd[0], args))
+
+        results = []
+        for r, ignore, group in zip(self.driver.run_many(to_run), ignores, groups):
+            if __ERROR__ not in r:
+                if group:
+                    self._object_groups.record(group, r)
+                results.append(r)
+                continue
+            try:
+                results.append(raise_error(r, ignore))
+            except Exception as e:
+                if raise_err:
+                    raise
+                results.append(e)
+        return results
 
     def run_cdp_loaded(self, cmd, **cmd_args):
         """执行Chrome DevTools Protocol语句，执行前等待页面加载完毕
@@ -432,6 +600,14 @@ class ChromiumBase(BasePage):
         self.wait.doc_loaded()
         return self.run_cdp(cmd, **cmd_args)
 
+    def scope(self):
+        """返回远程对象作用域，with块中生成的元素、js对象等在退出时一并在浏览器中释放
+        块中获取的元素退出后仍可使用，会重新获取object id；js返回的非元素对象则不再可用
+        例：with page.scope(): links = page.eles('t:a')
+        :return: ObjectScope对象
+        """
+        return self._object_groups.scope()
+
     def run_js(self, script, *args, as_expr=False, timeout=None):
         """运行javascript代码
         :param script: js文本或js文件路径
@@ -533,6 +709,40 @@ class ChromiumBase(BasePage):
         """
         return make_session_ele(self, locator, index=None)
 
+    def snapshot_eles(self, locator):
+        """用一次js调用获取所有符合条件元素的tag、attrs、text、大小、位置、是否显示和是否可用，不生成元素对象，不等待
+        :param locator: 定位符，只支持css selector和返回元素的xpath
+        :return: ElementSnapshot对象组成的列表
+        """
+        loc_type, loc = get_loc(locator, css_mode=True)
+        js = f'''function(sel, byXpath){{
+{SNAPSHOT_JS}
+    const r = [];
+    if(byXpath){{
+        const e = (this.ownerDocument || this).evaluate(sel, this, null, 7, null);
+        for(let i = 0; i < e.snapshotLength; i++){{
+            const n = e.snapshotItem(i);
+            if(n.nodeType === 1){{r.push(snap(n));}}
+        }}
+    }}else{{
+        for(const n of this.querySelectorAll(sel)){{r.push(snap(n));}}
+    }}
+    return JSON.stringify(r);
+}}'''
+        self.wait.doc_loaded()
+        return [make_snapshot(i) for i in loads(self.run_js(js, loc, loc_type == 'xpath'))]
+
+    def dom_snapshot(self, styles=None, rects=False):
+        """用DOMSnapshot.captureSnapshot一次获取整个页面（含iframe）的节点、属性、文本和布局信息
+        :param styles: 要获取的计算样式名称，可传入str或列表，为None时不获取
+        :param rects: 是否获取offset、client、scroll矩形
+        :return: 页面主文档的DomSnapshot对象
+        """
+        styles = [styles] if isinstance(styles, str) else list(styles or ())
+        self.wait.doc_loaded()
+        r = self.run_cdp('DOMSnapshot.captureSnapshot', computedStyles=styles, includeDOMRects=rects)
+        return DomSnapshot(self, r, 0, styles)
+
     def _find_elements(self, locator, timeout=None, index=1, relative=False, raise_err=None):
         """执行元素查找
         :param locator: 定位符或元素对象
@@ -543,7 +753,7 @@ class ChromiumBase(BasePage):
         :return: ChromiumElement对象或元素对象组成的列表
         """
         if isinstance(locator, (str, tuple)):
-            loc = get_loc(locator)[1]
+            loc_type, loc = get_loc(locator)
         elif locator._type in ('ChromiumElement', 'ChromiumFrame'):
             return locator
         else:
@@ -588,7 +798,8 @@ class ChromiumBase(BasePage):
             if perf_counter() >= end_time:
                 return NoneElement(self) if index is not None else []
 
-            sleep(.1)
+            # performSearch还会查找shadow root和iframe，这些位置的变化观察不到，每次最多等待0.5秒
+            wait_for_mutation(self, self._root_id, loc, end_time, by_xpath=loc_type == 'xpath', max_wait=.5)
             timeout = end_time - perf_counter()
             timeout = .5 if timeout <= 0 else timeout
             result = self.driver.run('DOM.performSearch', query=loc, _timeout=timeout, includeUserAgentShadowDOM=True)
@@ -654,9 +865,7 @@ class ChromiumBase(BasePage):
         """页面停止加载"""
         try:
             self.run_cdp('Page.stopLoading')
-            end_time = perf_counter() + 5
-            while self._ready_state != 'complete' and perf_counter() < end_time:
-                sleep(.1)
+            self._load_state.wait(lambda: self._ready_state == 'complete', 5)
         except (PageDisconnectedError, CDPError):
             pass
         finally:
@@ -957,15 +1166,8 @@ class ChromiumBase(BasePage):
         :return: 是否成功，超时返回False
         """
         timeout = timeout if timeout is not None else self.timeouts.page_load
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if self._ready_state == 'complete':
-                return True
-            elif self._load_mode == 'eager' and self._ready_state in ('interactive',
-                                                                      'complete') and not self._is_loading:
-                return True
-
-            sleep(.1)
+        if self._load_state.wait(self._is_loaded, timeout):
+            return True
 
         try:
             self.stop_loading()
@@ -973,6 +1175,23 @@ class ChromiumBase(BasePage):
             pass
         return False
 
+    def _is_loaded(self, doc=False):
+        """返回按当前加载策略页面是否已加载完成，生命周期和网络空闲策略还需文档已可用
+        :param doc: 是否用于wait.doc_loaded()，为True时其它策略只需已获取文档
+        :return: 是否已加载完成
+        """
+        mode = self._load_mode
+        if mode in LIFECYCLE_MODES or mode == 'in_flight':
+            if self._ready_state not in ('interactive', 'complete') or (doc and self._is_loading is not False):
+                return False
+            return (self._load_state.network_idle if mode == 'in_flight'
+                    else LIFECYCLE_MODES[mode] in self._load_state.lifecycle)
+        elif doc:
+            return self._is_loading is False
+        elif self._ready_state == 'complete':
+            return True
+        return mode == 'eager' and self._ready_state == 'interactive' and not self._is_loading
+
     def _d_connect(self, to_url, times=0, interval=1, show_errmsg=False, timeout=None):
         """尝试连接，重试若干次
         :param to_url: 要访问的url
@@ -1000,9 +1219,8 @@ class ChromiumBase(BasePage):
                     sleep(interval)
                     if show_errmsg:
                         print(f'重试{t + 1} {to_url}')
-                end_time1 = end_time - perf_counter()
-                while self._ready_state not in ('loading', 'complete') and perf_counter() < end_time1:  # 等待出错信息显示
-                    sleep(.1)
+                self._load_state.wait(lambda: self._ready_state in ('loading', 'complete'),
+                                      end_time - perf_counter())  # 等待出错信息显示
                 self.stop_loading()
                 continue
 
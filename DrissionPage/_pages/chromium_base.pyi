@@ -12,12 +12,16 @@ from .chromium_tab import ChromiumTab
 from .._base.base import BasePage
 from .._base.browser import Browser
 from .._base.driver import Driver
-from .._elements.chromium_element import ChromiumElement
+from .._elements.chromium_element import ChromiumElement, ElementSnapshot
 from .._elements.session_element import SessionElement
 from .._pages.chromium_frame import ChromiumFrame
 from .._pages.chromium_page import ChromiumPage
 from .._units.actions import Actions
+from .._units.dom_mirror import DomMirror
+from .._units.dom_snapshot import DomSnapshot
 from .._units.listener import Listener
+from .._units.load_state import LoadState, NetworkIdle
+from .._units.object_groups import ObjectGroups, ObjectScope
 from .._units.rect import TabRect
 from .._units.screencast import Screencast
 from .._units.scroller import Scroller, PageScroller
@@ -26,6 +30,7 @@ from .._units.states import PageStates
 from .._units.waiter import BaseWaiter
 
 PIC_TYPE = Literal['jpg', 'jpeg', 'png', 'webp', True]
+DOC_VERSION_JS: str = ...
 
 
 class ChromiumBase(BasePage):
@@ -43,6 +48,11 @@ class ChromiumBase(BasePage):
         self._is_timeout: bool = ...
         self._timeouts: Timeout = ...
         self._first_run: bool = ...
+        self._load_state: LoadState = ...
+        self._eager_task: Optional[list] = ...
+        self._load_events: Optional[str] = ...
+        self._network_idle: Optional[NetworkIdle] = ...
+        self._idle_rule: Tuple[int, float] = ...
         self._is_loading: bool = ...
         self._load_mode: str = ...
         self._scroll: Scroller = ...
@@ -54,6 +64,8 @@ class ChromiumBase(BasePage):
         self._screencast: Screencast = ...
         self._actions: Actions = ...
         self._listener: Listener = ...
+        self._dom_mirror: Optional[DomMirror] = ...
+        self._object_groups: ObjectGroups = ...
         self._states: PageStates = ...
         self._alert: Alert = ...
         self._has_alert: bool = ...
@@ -68,10 +80,16 @@ class ChromiumBase(BasePage):
 
     def _driver_init(self, tab_id: str) -> None: ...
 
+    def _set_load_mode(self, mode: str, rule: Tuple[int, float] = None) -> None: ...
+
+    def _apply_load_mode(self) -> None: ...
+
     def _get_document(self, timeout: float = 10) -> bool: ...
 
     def _wait_loaded(self, timeout: float = None) -> bool: ...
 
+    def _is_loaded(self, doc: bool = False) -> bool: ...
+
     def _onFrameDetached(self, **kwargs) -> None: ...
 
     def _onFrameAttached(self, **kwargs) -> None: ...
@@ -80,6 +98,8 @@ class ChromiumBase(BasePage):
 
     def _onFrameNavigated(self, **kwargs): ...
 
+    def _onLifecycleEvent(self, **kwargs): ...
+
     def _onDomContentEventFired(self, **kwargs): ...
 
     def _onLoadEventFired(self, **kwargs): ...
@@ -120,6 +140,10 @@ class ChromiumBase(BasePage):
     @property
     def html(self) -> str: ...
 
+    def _doc_version(self) -> Optional[Tuple[str, int]]: ...
+
+    def _obj_doc_version(self, doc_id: str) -> Optional[Tuple[str, int]]: ...
+
     @property
     def json(self) -> Union[dict, None]: ...
 
@@ -165,6 +189,15 @@ class ChromiumBase(BasePage):
     @property
     def listen(self) -> Listener: ...
 
+    @property
+    def _dom_version(self) -> Optional[int]: ...
+
+    @property
+    def dom_mirror(self) -> DomMirror: ...
+
+    @property
+    def object_groups(self) -> ObjectGroups: ...
+
     @property
     def states(self) -> PageStates: ...
 
@@ -195,6 +228,11 @@ class ChromiumBase(BasePage):
 
     def s_eles(self, locator: Union[Tuple[str, str], str]) -> List[SessionElement]: ...
 
+    def snapshot_eles(self, locator: Union[Tuple[str, str], str]) -> List[ElementSnapshot]: ...
+
+    def dom_snapshot(self, styles: Union[str, List[str], Tuple[str, ...], None] = None,
+                     rects: bool = False) -> DomSnapshot: ...
+
     def _find_elements(self,
                        locator: Union[Tuple[str, str], str, ChromiumElement, ChromiumFrame],
                        timeout: float = None,
@@ -226,8 +264,14 @@ class ChromiumBase(BasePage):
 
     def run_cdp(self, cmd: str, **cmd_args) -> dict: ...
 
+    def run_cdp_batch(self,
+                      cmds: List[Union[str, Tuple[str, dict]]],
+                      raise_err: bool = True) -> List[Union[dict, None, Exception]]: ...
+
     def run_cdp_loaded(self, cmd: str, **cmd_args) -> dict: ...
 
+    def scope(self) -> ObjectScope: ...
+
     def session_storage(self, item: str = None) -> Union[str, dict, None]: ...
 
     def local_storage(self, item: str = None) -> Union[str, dict, None]: ...
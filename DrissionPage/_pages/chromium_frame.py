@@ -10,7 +10,7 @@ from re import search, findall, DOTALL
 from time import sleep, perf_counter
 
 from .._elements.chromium_element import ChromiumElement
-from .._pages.chromium_base import ChromiumBase
+from .._pages.chromium_base import ChromiumBase, DOC_VERSION_JS
 from .._units.listener import FrameListener
 from .._units.rect import FrameRect
 from .._units.scroller import FrameScroller
@@ -88,6 +88,7 @@ class ChromiumFrame(ChromiumBase):
             self.retry_times = self._target_page.retry_times
             self.retry_interval = self._target_page.retry_interval
             self._download_path = self._target_page.download_path
+            self._idle_rule = self._target_page._idle_rule
         self._load_mode = self._target_page._load_mode if not self._is_diff_domain else 'normal'
 
     def _driver_init(self, tab_id, is_init=True):
@@ -98,7 +99,7 @@ class ChromiumFrame(ChromiumBase):
         try:
             super()._driver_init(tab_id)
         except:
-            self.browser.driver.get(f'http://{self.address}/json')
+            self.browser._get_tabs_info()
             super()._driver_init(tab_id)
         self._driver.set_callback('Inspector.detached', self._onInspectorDetached, immediate=True)
         self._driver.set_callback('Page.frameDetached', None)
@@ -169,7 +170,8 @@ class ChromiumFrame(ChromiumBase):
                 b_id = self.run_cdp('DOM.getDocument', _timeout=timeout)['root']['backendNodeId']
                 self.doc_ele = ChromiumElement(self, backend_id=b_id)
 
-            self._root_id = self.doc_ele._obj_id
+            with self.doc_ele.owner._object_groups.pin():  # 根对象不随作用域释放
+                self._root_id = self.doc_ele._obj_id
 
             r = self.run_cdp('Page.getFrameTree')
             for i in findall(r"'id': '(.*?)'", str(r)):
@@ -291,6 +293,13 @@ class ChromiumFrame(ChromiumBase):
         """返回元素innerHTML文本"""
         return self.doc_ele.run_js('return this.documentElement.outerHTML;')
 
+    def _doc_version(self):
+        """返回frame中文档的版本，由文档标识和记录的DOM变化次数组成，无法获取时返回None"""
+        try:
+            return tuple(self.doc_ele.run_js(DOC_VERSION_JS))
+        except Exception:
+            return None
+
     @property
     def title(self):
         """返回页面title"""
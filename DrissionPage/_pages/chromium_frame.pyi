@@ -86,6 +86,8 @@ class ChromiumFrame(ChromiumBase):
     @property
     def inner_html(self) -> str: ...
 
+    def _doc_version(self) -> Optional[Tuple[str, int]]: ...
+
     @property
     def title(self) -> str: ...
 
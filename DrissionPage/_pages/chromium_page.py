@@ -13,7 +13,7 @@ from requests import Session
 
 from .._base.browser import Browser
 from .._configs.chromium_options import ChromiumOptions
-from .._functions.browser import connect_browser
+from .._functions.browser import connect_browser, run_browser_with_pipe
 from .._functions.settings import Settings
 from .._functions.tools import PortFinder
 from .._functions.web import save_page
@@ -93,6 +93,7 @@ class ChromiumPage(ChromiumBase):
         if self._chromium_options.timeouts['base'] is not None:
             self._timeout = self._chromium_options.timeouts['base']
         self._load_mode = self._chromium_options.load_mode
+        self._idle_rule = (0, .5)
         self._download_path = None if self._chromium_options.download_path is None \
             else str(Path(self._chromium_options.download_path).absolute())
         self.retry_times = self._chromium_options.retry_times
@@ -339,6 +340,9 @@ def handle_options(addr_or_opts):
 
 def run_browser(chromium_options):
     """连接浏览器"""
+    if chromium_options.transport == 'pipe':
+        return False, run_browser_with_pipe(chromium_options)
+
     is_exist = connect_browser(chromium_options)
     try:
         s = Session()
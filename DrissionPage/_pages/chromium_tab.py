@@ -58,6 +58,7 @@ class ChromiumTab(ChromiumBase):
         self.retry_times = self.page.retry_times
         self.retry_interval = self.page.retry_interval
         self._load_mode = self.page._load_mode
+        self._idle_rule = self.page._idle_rule
         self._download_path = self.page.download_path
 
     def close(self):
@@ -174,6 +175,13 @@ class WebPageTab(SessionPage, ChromiumTab, BasePage):
         elif self._mode == 'd':
             return super(SessionPage, self).html if self._has_driver else ''
 
+    def _doc_version(self):
+        """返回当前模式下文档的版本"""
+        if self._mode == 's':
+            return super()._doc_version()
+        elif self._mode == 'd':
+            return super(SessionPage, self)._doc_version() if self._has_driver else None
+
     @property
     def json(self):
         """当返回内容是json格式时，返回对应的字典"""
@@ -99,6 +99,8 @@ class WebPageTab(SessionPage, ChromiumTab):
     @property
     def html(self) -> str: ...
 
+    def _doc_version(self) -> Any: ...
+
     @property
     def json(self) -> dict: ...
 
@@ -111,6 +111,10 @@ class SessionPage(BasePage):
         """返回页面的html文本"""
         return self.response.text if self.response else ''
 
+    def _doc_version(self):
+        """以当前响应对象作为文档版本，收到新的响应后缓存的解析结果失效"""
+        return self.response
+
     @property
     def json(self):
         """当返回内容是json格式时，返回对应的字典，非json格式时返回None"""
@@ -61,6 +61,8 @@ class SessionPage(BasePage):
     @property
     def html(self) -> str: ...
 
+    def _doc_version(self) -> Optional[Response]: ...
+
     @property
     def json(self) -> Union[dict, None]: ...
 
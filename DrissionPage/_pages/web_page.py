@@ -108,6 +108,13 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
         elif self._mode == 'd':
             return super(SessionPage, self).html if self._has_driver else ''
 
+    def _doc_version(self):
+        """返回当前模式下文档的版本"""
+        if self._mode == 's':
+            return super()._doc_version()
+        elif self._mode == 'd':
+            return super(SessionPage, self)._doc_version() if self._has_driver else None
+
     @property
     def json(self):
         """当返回内容是json格式时，返回对应的字典"""
@@ -57,6 +57,8 @@ class WebPage(SessionPage, ChromiumPage, BasePage):
     @property
     def html(self) -> str: ...
 
+    def _doc_version(self) -> Any: ...
+
     @property
     def json(self) -> dict: ...
 
@@ -0,0 +1,231 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Queue, wait_for, sleep, get_event_loop, TimeoutError as AsyncTimeoutError
+from re import search
+
+from .listener import Listener, DataPacket
+from .._functions.settings import Settings
+from ..errors import WaitTimeoutError
+
+
+class AsyncListener(Listener):
+    """Listener的异步版本，直接使用页面的AsyncDriver连接，不另开连接和线程"""
+
+    def __init__(self, owner):
+        """
+        :param owner: AsyncChromiumTab对象
+        """
+        super().__init__(owner)
+        self._method = {'GET', 'POST'}
+        self._body_tasks = set()
+
+    async def start(self, targets=None, is_regex=None, method=None, res_type=None):
+        """拦截目标请求，每次拦截前清空结果
+        :param targets: 要匹配的数据包url特征，可用list等传入多个，为True时获取所有
+        :param is_regex: 设置的target是否正则表达式，为None时保持原来设置
+        :param method: 设置监听的请求类型，可指定多个，默认('GET', 'POST')，为True时监听全部，为None时保持原来设置
+        :param res_type: 设置监听的资源类型，可指定多个，默认为True时监听全部，为None时保持原来设置
+        :return: None
+        """
+        if targets is not None:
+            if is_regex is None:
+                is_regex = False
+        if targets or is_regex is not None or method or res_type:
+            self.set_targets(targets, is_regex, method, res_type)
+        self.clear()
+
+        if self.listening:
+            return
+
+        self._driver = self._owner.driver
+        await self._owner.run_cdp('Network.enable')
+        self._set_callback()
+        self.listening = True
+
+    async def wait(self, count=1, timeout=None, fit_count=True, raise_err=None):
+        """等待符合要求的数据包到达指定数量
+        :param count: 需要捕捉的数据包数量
+        :param timeout: 超时时间，为None无限等待
+        :param fit_count: 是否必须满足总数要求，发生超时，为True返回False，为False返回已捕捉到的数据包
+        :param raise_err: 超时时是否抛出错误，为None时根据Settings设置
+        :return: count为1时返回数据包对象，大于1时返回列表，超时且fit_count为True时返回False
+        """
+        if not self.listening:
+            raise RuntimeError('监听未启动或已暂停。')
+
+        loop = get_event_loop()
+        end_time = loop.time() + timeout if timeout else None
+        packets = []
+        try:
+            while len(packets) < count:
+                packets.append(await wait_for(self._caught.get(),
+                                              None if end_time is None else max(end_time - loop.time(), 0)))
+        except AsyncTimeoutError:
+            if fit_count or not packets:
+                for p in packets:
+                    self._caught.put_nowait(p)
+                if raise_err is True or Settings.raise_when_wait_failed is True:
+                    raise WaitTimeoutError(f'等待数据包失败（等待{timeout}秒）。')
+                return False
+            return packets
+
+        return packets[0] if count == 1 else packets
+
+    async def steps(self, count=None, timeout=None, gap=1):
+        """用于单步操作，可实现每收到若干个数据包执行一步操作（如翻页）
+        :param count: 需捕获的数据包总数，为None表示无限
+        :param timeout: 每个数据包等待时间，为None表示无限
+        :param gap: 每接收到多少个数据包返回一次数据
+        :return: 用于在接收到监听目标时触发动作的异步可迭代对象
+        """
+        caught = 0
+        while True:
+            r = await self.wait(gap, timeout=timeout, raise_err=False)
+            if r is False or not self._driver.is_running:
+                return
+            yield r
+            caught += gap
+            if count and caught >= count:
+                return
+
+    async def stop(self):
+        """停止监听，清空已监听到的列表"""
+        if self.listening:
+            self.pause()
+            self.clear()
+            await self._owner.run_cdp('Network.disable', _ignore=Exception)
+        for task in self._body_tasks:
+            task.cancel()
+        self._body_tasks.clear()
+        self._driver = None
+
+    def pause(self, clear=True):
+        """暂停监听
+        :param clear: 是否清空已获取队列
+        :return: None
+        """
+        if self.listening:
+            for event in ('Network.requestWillBeSent', 'Network.requestWillBeSentExtraInfo',
+                          'Network.responseReceived', 'Network.responseReceivedExtraInfo',
+                          'Network.loadingFinished', 'Network.loadingFailed'):
+                self._driver.set_callback(event, None)
+            self.listening = False
+        if clear:
+            self.clear()
+
+    def clear(self):
+        """清空结果"""
+        super().clear()
+        self._caught = Queue()
+
+    async def wait_silent(self, timeout=None, targets_only=False, limit=0):
+        """等待所有请求结束
+        :param timeout: 超时，为None时无限等待
+        :param targets_only: 是否只等待targets指定的请求结束
+        :param limit: 剩下多少个连接时视为结束
+        :return: 返回是否等待成功
+        """
+        if not self.listening:
+            raise RuntimeError('监听未启动或已暂停。')
+        loop = get_event_loop()
+        end_time = loop.time() + timeout if timeout is not None else None
+        while ((not targets_only and self._running_requests > limit)
+               or (targets_only and self._running_targets > limit)):
+            if end_time is not None and loop.time() >= end_time:
+                return False
+            await sleep(.1)
+        return True
+
+    def _requestWillBeSent(self, **kwargs):
+        """接收到请求时的回调函数，post数据在请求完成时获取"""
+        self._running_requests += 1
+        p = None
+        url = kwargs['request']['url']
+        if ((self._method is True or kwargs['request']['method'] in self._method)
+                and (self._res_type is True or kwargs.get('type', '').upper() in self._res_type)):
+            if self._targets is True:
+                p = self._request_ids.setdefault(kwargs['requestId'], DataPacket(self._owner.tab_id, True))
+            else:
+                for target in self._targets:
+                    if (self._is_regex and search(target, url)) or (not self._is_regex and target in url):
+                        p = self._request_ids.setdefault(kwargs['requestId'], DataPacket(self._owner.tab_id, target))
+                        break
+            if p:
+                self._running_targets += 1
+                p._raw_request = kwargs
+
+        self._extra_info_ids.setdefault(kwargs['requestId'], {})['obj'] = p if p else False
+
+    def _loading_finished(self, **kwargs):
+        """请求完成时处理方法，数据包的响应体在单独的任务中获取，不阻塞其它事件的回调"""
+        driver = self._driver
+        if driver is None:  # 已停止监听
+            return
+        self._running_requests -= 1
+        rid = kwargs['requestId']
+        packet = self._request_ids.pop(rid, None)
+        if packet:
+            task = get_event_loop().create_task(self._get_body(driver, rid, packet))
+            self._body_tasks.add(task)
+            task.add_done_callback(self._body_tasks.discard)
+        else:
+            self._take_extra_info(rid)
+
+    async def _get_body(self, driver, rid, packet):
+        """获取响应体和post数据后把数据包放入结果队列
+        :param driver: 监听使用的AsyncDriver对象
+        :param rid: 请求id
+        :param packet: DataPacket对象
+        :return: None
+        """
+        r = await driver.run('Network.getResponseBody', requestId=rid)
+        if 'body' in r:
+            packet._raw_body = r['body']
+            packet._base64_body = r['base64Encoded']
+        else:
+            packet._raw_body = ''
+            packet._base64_body = False
+
+        if (packet._raw_request['request'].get('hasPostData', None)
+                and not packet._raw_request['request'].get('postData', None)):
+            r = await driver.run('Network.getRequestPostData', requestId=rid, _timeout=1)
+            packet._raw_post_data = r.get('postData', None)
+
+        self._take_extra_info(rid)
+        self._caught.put_nowait(packet)
+        self._running_targets -= 1
+
+    def _loading_failed(self, **kwargs):
+        """请求失败时的回调方法"""
+        self._running_requests -= 1
+        rid = kwargs['requestId']
+        packet = self._request_ids.pop(rid, None)
+        if packet:
+            packet._raw_fail_info = kwargs
+            packet._resource_type = kwargs['type']
+            packet.is_failed = True
+
+        self._take_extra_info(rid)
+        if packet:
+            self._caught.put_nowait(packet)
+            self._running_targets -= 1
+
+    def _take_extra_info(self, rid):
+        """请求结束时把已收到的额外信息交给数据包
+        :param rid: 请求id
+        :return: None
+        """
+        r = self._extra_info_ids.get(rid, None)
+        if r:
+            obj = r.get('obj', None)
+            if isinstance(obj, DataPacket) and r.get('response'):
+                obj._requestExtraInfo = r.get('request')
+                obj._responseExtraInfo = r['response']
+                self._extra_info_ids.pop(rid, None)
+            elif obj is False:
+                self._extra_info_ids.pop(rid, None)
@@ -0,0 +1,57 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import Queue, Task
+from typing import Union, List, Optional, AsyncIterator, Set
+
+from .listener import Listener, DataPacket, __RES_TYPE__
+from .._base.async_driver import AsyncDriver
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncListener(Listener):
+    _owner: AsyncChromiumTab = ...
+    _driver: Optional[AsyncDriver] = ...
+    _caught: Queue = ...
+    _body_tasks: Set[Task] = ...
+
+    def __init__(self, owner: AsyncChromiumTab): ...
+
+    async def start(self,
+                    targets: Union[str, list, tuple, set, bool, None] = None,
+                    is_regex: Optional[bool] = None,
+                    method: Union[str, list, tuple, set, bool, None] = None,
+                    res_type: Union[__RES_TYPE__, list, tuple, set, bool, None] = None) -> None: ...
+
+    async def wait(self,
+                   count: int = 1,
+                   timeout: float = None,
+                   fit_count: bool = True,
+                   raise_err: bool = None) -> Union[List[DataPacket], DataPacket, bool]: ...
+
+    async def steps(self,
+                    count: int = None,
+                    timeout: float = None,
+                    gap: int = 1) -> AsyncIterator[Union[DataPacket, List[DataPacket]]]: ...
+
+    async def stop(self) -> None: ...
+
+    def pause(self, clear: bool = True) -> None: ...
+
+    def clear(self) -> None: ...
+
+    async def wait_silent(self, timeout: float = None, targets_only: bool = False, limit: int = 0) -> bool: ...
+
+    def _requestWillBeSent(self, **kwargs) -> None: ...
+
+    def _loading_finished(self, **kwargs) -> None: ...
+
+    async def _get_body(self, driver: AsyncDriver, rid: str, packet: DataPacket) -> None: ...
+
+    def _loading_failed(self, **kwargs) -> None: ...
+
+    def _take_extra_info(self, rid: str) -> None: ...
@@ -0,0 +1,180 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from asyncio import sleep, wait_for, get_event_loop, TimeoutError as AsyncTimeoutError
+
+from .._functions.settings import Settings
+from ..errors import WaitTimeoutError
+
+
+class AsyncTabWaiter(object):
+    """TabWaiter的异步版本"""
+
+    def __init__(self, owner):
+        """
+        :param owner: AsyncChromiumTab对象
+        """
+        self._owner = owner
+
+    async def __call__(self, second, scope=None):
+        """等待若干秒，如传入两个参数，等待时间为这两个数间的一个随机数
+        :param second: 秒数
+        :param scope: 随机数范围
+        :return: None
+        """
+        if scope is None:
+            await sleep(second)
+        else:
+            from random import uniform
+            await sleep(uniform(second, scope))
+
+    async def doc_loaded(self, timeout=None, raise_err=None):
+        """等待页面加载完成
+        :param timeout: 超时时间，为None时使用页面timeouts.page_load设置
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        timeout = self._owner.timeouts.page_load if timeout is None else timeout
+        try:
+            await wait_for(self._owner._loaded.wait(), timeout)
+            return True
+        except AsyncTimeoutError:
+            return self._fail(raise_err, f'等待页面加载失败（等待{timeout}秒）。')
+
+    async def load_start(self, timeout=None, raise_err=None):
+        """等待页面开始加载
+        :param timeout: 超时时间，为None时使用页面timeout属性
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        if not self._owner._loaded.is_set():
+            return True
+        timeout = self._owner.timeout if timeout is None else timeout
+        self._owner._load_started.clear()
+        try:
+            await wait_for(self._owner._load_started.wait(), timeout)
+            return True
+        except AsyncTimeoutError:
+            return self._fail(raise_err, f'等待页面开始加载失败（等待{timeout}秒）。')
+
+    async def ele_displayed(self, locator, timeout=None, raise_err=None):
+        """等待元素变成显示状态
+        :param locator: 要等待的元素，可以是已有元素、定位符
+        :param timeout: 超时时间，默认读取页面超时时间
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        async def check():
+            ele = await self._get_ele(locator)
+            return ele and await ele.is_displayed()
+
+        return await self._wait(check, timeout, raise_err, f'等待元素显示失败（等待{timeout}秒）。')
+
+    async def ele_hidden(self, locator, timeout=None, raise_err=None):
+        """等待元素变成隐藏状态
+        :param locator: 要等待的元素，可以是已有元素、定位符
+        :param timeout: 超时时间，默认读取页面超时时间
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        async def check():
+            ele = await self._get_ele(locator)
+            return ele and not await ele.is_displayed()
+
+        return await self._wait(check, timeout, raise_err, f'等待元素隐藏失败（等待{timeout}秒）。')
+
+    async def ele_deleted(self, locator, timeout=None, raise_err=None):
+        """等待元素从DOM中删除
+        :param locator: 要等待的元素，可以是已有元素、定位符
+        :param timeout: 超时时间，默认读取页面超时时间
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        async def check():
+            if isinstance(locator, (str, tuple)):
+                return not await self._get_ele(locator)
+            try:
+                return not await locator.run_js('return this.isConnected;')
+            except Exception:
+                return True
+
+        return await self._wait(check, timeout, raise_err, f'等待元素删除失败（等待{timeout}秒）。')
+
+    async def eles_loaded(self, locators, timeout=None, any_one=False, raise_err=None):
+        """等待元素加载到DOM，可等待全部或任意一个
+        :param locators: 要等待的元素，输入定位符，用list输入多个
+        :param timeout: 超时时间，默认读取页面超时时间
+        :param any_one: 是否等待到一个就返回
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 成功返回True，失败返回False
+        """
+        if isinstance(locators, str) or (isinstance(locators, tuple) and len(locators) == 2
+                                         and isinstance(locators[0], str) and isinstance(locators[1], str)):
+            locators = (locators,)
+        method = any if any_one else all
+
+        async def check():
+            return method([bool(await self._get_ele(loc)) for loc in locators])
+
+        return await self._wait(check, timeout, raise_err, f'等待元素{locators}加载失败（等待{timeout}秒）。')
+
+    async def url_change(self, text, exclude=False, timeout=None, raise_err=None):
+        """等待url变成包含或不包含指定文本
+        :param text: 用于识别的文本
+        :param exclude: 是否排除，为True时当url不包含text指定文本时返回True
+        :param timeout: 超时时间（秒）
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        async def check():
+            return (text not in await self._owner.url()) if exclude else (text in await self._owner.url())
+
+        return await self._wait(check, timeout, raise_err, f'等待url变化失败（等待{timeout}秒）。')
+
+    async def title_change(self, text, exclude=False, timeout=None, raise_err=None):
+        """等待title变成包含或不包含指定文本
+        :param text: 用于识别的文本
+        :param exclude: 是否排除，为True时当title不包含text指定文本时返回True
+        :param timeout: 超时时间（秒）
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :return: 是否等待成功
+        """
+        async def check():
+            return (text not in await self._owner.title()) if exclude else (text in await self._owner.title())
+
+        return await self._wait(check, timeout, raise_err, f'等待title变化失败（等待{timeout}秒）。')
+
+    async def _get_ele(self, locator):
+        """以0超时查找元素，找不到返回None"""
+        if not isinstance(locator, (str, tuple)):
+            return locator
+        from .._elements.async_element import async_find
+        return await async_find(self._owner, locator, 1, 0)
+
+    async def _wait(self, check, timeout, raise_err, err_text):
+        """循环检查条件直到成立或超时
+        :param check: 返回bool值的协程函数
+        :param timeout: 超时时间，为None时使用页面timeout属性
+        :param raise_err: 等待失败时是否报错，为None时根据Settings设置
+        :param err_text: 报错信息
+        :return: 是否等待成功
+        """
+        loop = get_event_loop()
+        end_time = loop.time() + (self._owner.timeout if timeout is None else timeout)
+        while True:
+            if await check():
+                return True
+            if loop.time() >= end_time:
+                return self._fail(raise_err, err_text)
+            await sleep(.05)
+
+    @staticmethod
+    def _fail(raise_err, err_text):
+        """等待失败时根据设置报错或返回False"""
+        if raise_err is True or Settings.raise_when_wait_failed is True:
+            raise WaitTimeoutError(err_text)
+        return False
@@ -0,0 +1,58 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Union, Tuple, Callable, Awaitable, Optional
+
+from .._elements.async_element import AsyncChromiumElement
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncTabWaiter(object):
+    _owner: AsyncChromiumTab
+
+    def __init__(self, owner: AsyncChromiumTab): ...
+
+    async def __call__(self, second: float, scope: float = None) -> None: ...
+
+    async def doc_loaded(self, timeout: float = None, raise_err: bool = None) -> bool: ...
+
+    async def load_start(self, timeout: float = None, raise_err: bool = None) -> bool: ...
+
+    async def ele_displayed(self,
+                            locator: Union[str, tuple, AsyncChromiumElement],
+                            timeout: float = None,
+                            raise_err: bool = None) -> bool: ...
+
+    async def ele_hidden(self,
+                         locator: Union[str, tuple, AsyncChromiumElement],
+                         timeout: float = None,
+                         raise_err: bool = None) -> bool: ...
+
+    async def ele_deleted(self,
+                          locator: Union[str, tuple, AsyncChromiumElement],
+                          timeout: float = None,
+                          raise_err: bool = None) -> bool: ...
+
+    async def eles_loaded(self,
+                          locators: Union[Tuple[str, str], str, list, tuple],
+                          timeout: float = None,
+                          any_one: bool = False,
+                          raise_err: bool = None) -> bool: ...
+
+    async def url_change(self, text: str, exclude: bool = False, timeout: float = None,
+                         raise_err: bool = None) -> bool: ...
+
+    async def title_change(self, text: str, exclude: bool = False, timeout: float = None,
+                           raise_err: bool = None) -> bool: ...
+
+    async def _get_ele(self, locator: Union[str, tuple, AsyncChromiumElement]) -> Optional[AsyncChromiumElement]: ...
+
+    async def _wait(self, check: Callable[[], Awaitable[bool]], timeout: Optional[float], raise_err: Optional[bool],
+                    err_text: str) -> bool: ...
+
+    @staticmethod
+    def _fail(raise_err: Optional[bool], err_text: str) -> bool: ...
@@ -0,0 +1,337 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from re import sub
+from threading import RLock
+
+from lxml.html import fromstring
+
+VOID_ELEMENTS = frozenset(('area', 'base', 'basefont', 'bgsound', 'br', 'col', 'embed', 'frame', 'hr', 'img', 'input',
+                           'keygen', 'link', 'meta', 'param', 'source', 'track', 'wbr'))
+RAW_TEXT_ELEMENTS = frozenset(('script', 'style', 'xmp', 'iframe', 'noembed', 'noframes', 'plaintext', 'noscript'))
+
+
+class DomMirror(object):
+    """用DOM事件保持同步的本地页面文档镜像，开启后页面的html、s_ele()、s_eles()在本地获取，不需每次传输整个页面
+    使用单独的连接，不影响页面对象使用的node id。镜像有变化后第一次读取时才重新生成html和解析
+    DOM事件因队列上限被丢弃或合并时，镜像在下次读取时重新获取整个文档
+    shadow root和伪元素随宿主元素同步，但与DOM.getOuterHTML一样不出现在生成的html中
+    """
+
+    def __init__(self, owner):
+        """
+        :param owner: ChromiumBase对象
+        """
+        self._owner = owner
+        self._driver = None
+        self._lock = RLock()
+        # node id: [nodeType, 名称, 值, attrs dict, 子节点id列表或None, 父节点id, publicId, systemId,
+        #           shadow root和伪元素id列表]
+        self._nodes = {}
+        self._root = None
+        self._html = None
+        self._tree = None
+        self._need_load = True
+        self.listening = False
+        self._version = 0
+
+    @property
+    def version(self):
+        """返回镜像的版本，镜像有变化时增加，需要重新获取文档时返回None"""
+        return None if self._need_load else self._version
+
+    @property
+    def html(self):
+        """返回镜像中的页面html文本，镜像的连接已断开时返回None"""
+        with self._lock:
+            if not self._check_load():
+                return None
+            if self._html is None:
+                self._html = self._serialize(self._root) if self._root else ''
+            return self._html
+
+    @property
+    def tree(self):
+        """返回镜像中页面解析后的lxml对象，镜像没有变化时返回同一个对象，镜像的连接已断开时返回None"""
+        with self._lock:
+            if self._tree is None or not self.listening:
+                html = self.html
+                if html is None:
+                    return None
+                if html.startswith('<?xml '):
+                    html = sub(r'^<\?xml.*?>', '', html)
+                self._tree = fromstring(html)
+            return self._tree
+
+    def start(self):
+        """开始同步"""
+        if self.listening:
+            return
+        if self._owner._type == 'ChromiumFrame' and not self._owner._is_diff_domain:
+            raise RuntimeError('同域frame与所在页面使用同一个target，不支持DOM镜像，请使用所在页面的dom_mirror。')
+        self._driver = self._owner.browser._new_driver(self._owner._target_id, self)
+        self._driver.dispatcher.on_drop = self._on_drop
+        self._driver.run('DOM.enable')
+        for event, callback in (('DOM.documentUpdated', self._document_updated),
+                                ('DOM.setChildNodes', self._set_child_nodes),
+                                ('DOM.childNodeInserted', self._child_node_inserted),
+                                ('DOM.childNodeRemoved', self._child_node_removed),
+                                ('DOM.childNodeCountUpdated', self._child_node_count_updated),
+                                ('DOM.attributeModified', self._attribute_modified),
+                                ('DOM.attributeRemoved', self._attribute_removed),
+                                ('DOM.characterDataModified', self._character_data_modified),
+                                ('DOM.shadowRootPushed', self._shadow_root_pushed),
+                                ('DOM.shadowRootPopped', self._shadow_root_popped),
+                                ('DOM.pseudoElementAdded', self._pseudo_element_added),
+                                ('DOM.pseudoElementRemoved', self._pseudo_element_removed)):
+            self._driver.set_callback(event, callback)
+        self._need_load = True
+        self.listening = True
+
+    def stop(self):
+        """停止同步并清空镜像"""
+        if self._driver:
+            self._driver.stop()
+            self._driver = None
+        self.listening = False
+        with self._lock:
+            self._nodes.clear()
+            self._root = None
+            self._changed()
+
+    def _check_load(self):
+        """在锁内调用，文档已更新时重新获取整个文档
+        :return: 镜像是否可用，连接已断开时返回False
+        """
+        if not self.listening:
+            return False
+        if not self._need_load:
+            return True
+        self._owner.wait.doc_loaded()
+        self._need_load = False  # 获取期间有事件被丢弃时会重新标记
+        driver = self._driver
+        root = driver.run('DOM.getDocument', depth=-1) if driver else {'error': 'connection disconnected'}
+        if 'error' in root:
+            self._need_load = True
+            if driver is None or driver._stopped.is_set():
+                self._on_disconnect()
+                return False
+            raise RuntimeError(f'获取文档失败：{root["error"]}')
+        self._nodes.clear()
+        self._root = root['root']['nodeId']
+        self._add_node(root['root'], None)
+        self._changed()
+        return True
+
+    def _on_disconnect(self):
+        """镜像的连接断开（如标签页关闭）时由Driver调用，停止同步，页面改为从浏览器获取html"""
+        self.listening = False
+        self._driver = None
+        self._need_load = True
+
+    def _changed(self):
+        """在锁内调用，标记镜像已变化"""
+        self._html = None
+        self._tree = None
+        self._version += 1
+
+    def _on_drop(self, method):
+        """在事件分发器的锁内执行，DOM事件未被执行时标记镜像需重新获取，不在这里获取锁以免与等待命令结果的线程互相等待
+        :param method: 事件名
+        :return: None
+        """
+        if method.startswith('DOM.'):
+            self._need_load = True
+
+    def _add_node(self, node, parent_id):
+        """在锁内调用，把cdp节点及其已知的子孙节点加入镜像
+        :param node: cdp中的Node数据
+        :param parent_id: 父节点id
+        :return: None
+        """
+        stack = [(node, parent_id)]
+        while stack:
+            node, parent_id = stack.pop()
+            children = node.get('children')
+            if node.get('templateContent'):
+                children = (children or []) + [node['templateContent']]
+            attrs = node.get('attributes', ())
+            extras = node.get('shadowRoots', []) + node.get('pseudoElements', [])
+            self._nodes[node['nodeId']] = [
+                node['nodeType'], node.get('localName') or node['nodeName'], node.get('nodeValue', ''),
+                {attrs[i]: attrs[i + 1] for i in range(0, len(attrs), 2)},
+                None if children is None else [i['nodeId'] for i in children], parent_id,
+                node.get('publicId'), node.get('systemId'), [i['nodeId'] for i in extras]]
+            if children is None and node.get('childNodeCount'):
+                self._driver.run('DOM.requestChildNodes', nodeId=node['nodeId'], depth=-1, _timeout=0)
+            for child in (children or []) + extras:
+                stack.append((child, node['nodeId']))
+
+    def _remove_node(self, node_id):
+        """在锁内调用，从镜像中删除节点及其子孙节点
+        :param node_id: 节点id
+        :return: None
+        """
+        stack = [node_id]
+        while stack:
+            n = self._nodes.pop(stack.pop(), None)
+            if n:
+                stack.extend(n[4] or ())
+                stack.extend(n[8])
+
+    def _serialize(self, node_id):
+        """在锁内调用，生成节点的html文本，格式与DOM.getOuterHTML一致
+        :param node_id: 节点id
+        :return: html文本
+        """
+        out = []
+        stack = [(node_id, False)]
+        while stack:
+            nid, closing = stack.pop()
+            if closing:
+                out.append(f'</{nid}>')
+                continue
+            n = self._nodes.get(nid)
+            if n is None:
+                continue
+            node_type, name, value, attrs, children = n[:5]
+            if node_type == 1:
+                attrs_txt = ''.join(f' {k}="{_escape_attr(v)}"' for k, v in attrs.items())
+                out.append(f'<{name}{attrs_txt}>')
+                if name in VOID_ELEMENTS:
+                    continue
+                stack.append((name, True))
+                stack.extend((i, False) for i in reversed(children or ()))
+            elif node_type == 3:
+                parent = self._nodes.get(n[5])
+                out.append(value if parent and parent[1] in RAW_TEXT_ELEMENTS else _escape_text(value))
+            elif node_type == 4:
+                out.append(f'<![CDATA[{value}]]>')
+            elif node_type == 8:
+                out.append(f'<!--{value}-->')
+            elif node_type == 10:
+                public_id, system_id = n[6], n[7]
+                ids = f' PUBLIC "{public_id}"' if public_id else (' SYSTEM' if system_id else '')
+                if system_id:
+                    ids = f'{ids} "{system_id}"'
+                out.append(f'<!DOCTYPE {name}{ids}>')
+            else:  # document、document fragment
+                stack.extend((i, False) for i in reversed(children or ()))
+        return ''.join(out)
+
+    def _document_updated(self, **kwargs):
+        with self._lock:
+            self._need_load = True
+            self._changed()
+
+    def _set_child_nodes(self, **kwargs):
+        with self._lock:
+            parent = self._nodes.get(kwargs['parentId'])
+            if parent is None:
+                return
+            for child_id in parent[4] or ():
+                self._remove_node(child_id)
+            parent[4] = [i['nodeId'] for i in kwargs['nodes']]
+            for node in kwargs['nodes']:
+                self._add_node(node, kwargs['parentId'])
+            self._changed()
+
+    def _child_node_inserted(self, **kwargs):
+        with self._lock:
+            parent = self._nodes.get(kwargs['parentNodeId'])
+            if parent is None:
+                return
+            if parent[4] is None:
+                parent[4] = []
+            node = kwargs['node']
+            prev = kwargs.get('previousNodeId')
+            try:
+                index = parent[4].index(prev) + 1 if prev else 0
+            except ValueError:
+                index = len(parent[4])
+            parent[4].insert(index, node['nodeId'])
+            self._add_node(node, kwargs['parentNodeId'])
+            self._changed()
+
+    def _child_node_removed(self, **kwargs):
+        with self._lock:
+            parent = self._nodes.get(kwargs['parentNodeId'])
+            if parent and parent[4] and kwargs['nodeId'] in parent[4]:
+                parent[4].remove(kwargs['nodeId'])
+            self._remove_node(kwargs['nodeId'])
+            self._changed()
+
+    def _child_node_count_updated(self, **kwargs):
+        with self._lock:
+            n = self._nodes.get(kwargs['nodeId'])
+            if n is not None and n[4] is None and kwargs['childNodeCount']:
+                self._driver.run('DOM.requestChildNodes', nodeId=kwargs['nodeId'], depth=-1, _timeout=0)
+
+    def _attribute_modified(self, **kwargs):
+        with self._lock:
+            n = self._nodes.get(kwargs['nodeId'])
+            if n is not None:
+                n[3][kwargs['name']] = kwargs['value']
+                self._changed()
+
+    def _attribute_removed(self, **kwargs):
+        with self._lock:
+            n = self._nodes.get(kwargs['nodeId'])
+            if n is not None:
+                n[3].pop(kwargs['name'], None)
+                self._changed()
+
+    def _character_data_modified(self, **kwargs):
+        with self._lock:
+            n = self._nodes.get(kwargs['nodeId'])
+            if n is not None:
+                n[2] = kwargs['characterData']
+                self._changed()
+
+    def _shadow_root_pushed(self, **kwargs):
+        self._add_extra(kwargs['hostId'], kwargs['root'])
+
+    def _shadow_root_popped(self, **kwargs):
+        self._remove_extra(kwargs['hostId'], kwargs['rootId'])
+
+    def _pseudo_element_added(self, **kwargs):
+        self._add_extra(kwargs['parentId'], kwargs['pseudoElement'])
+
+    def _pseudo_element_removed(self, **kwargs):
+        self._remove_extra(kwargs['parentId'], kwargs['pseudoElementId'])
+
+    def _add_extra(self, host_id, node):
+        """记录宿主元素新增的shadow root或伪元素，它们不出现在html中，不改变镜像版本
+        :param host_id: 宿主元素id
+        :param node: cdp中的Node数据
+        :return: None
+        """
+        with self._lock:
+            host = self._nodes.get(host_id)
+            if host is not None:
+                host[8].append(node['nodeId'])
+                self._add_node(node, host_id)
+
+    def _remove_extra(self, host_id, node_id):
+        """删除宿主元素的shadow root或伪元素
+        :param host_id: 宿主元素id
+        :param node_id: 要删除的节点id
+        :return: None
+        """
+        with self._lock:
+            host = self._nodes.get(host_id)
+            if host is not None and node_id in host[8]:
+                host[8].remove(node_id)
+            self._remove_node(node_id)
+
+
+def _escape_text(txt):
+    return txt.replace('&', '&amp;').replace('\xa0', '&nbsp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attr(txt):
+    return txt.replace('&', '&amp;').replace('\xa0', '&nbsp;').replace('"', '&quot;')
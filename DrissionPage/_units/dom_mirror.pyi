@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import RLock
+from typing import Dict, List, Optional, FrozenSet
+
+from lxml.html import HtmlElement
+
+from .._base.driver import Driver
+from .._pages.chromium_base import ChromiumBase
+
+VOID_ELEMENTS: FrozenSet[str] = ...
+RAW_TEXT_ELEMENTS: FrozenSet[str] = ...
+
+
+class DomMirror(object):
+    _owner: ChromiumBase = ...
+    _driver: Optional[Driver] = ...
+    _lock: RLock = ...
+    _nodes: Dict[int, list] = ...
+    _root: Optional[int] = ...
+    _html: Optional[str] = ...
+    _tree: Optional[HtmlElement] = ...
+    _need_load: bool = ...
+    listening: bool = ...
+    _version: int = ...
+
+    def __init__(self, owner: ChromiumBase): ...
+
+    @property
+    def version(self) -> Optional[int]: ...
+
+    @property
+    def html(self) -> Optional[str]: ...
+
+    @property
+    def tree(self) -> Optional[HtmlElement]: ...
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def _check_load(self) -> bool: ...
+
+    def _on_disconnect(self) -> None: ...
+
+    def _changed(self) -> None: ...
+
+    def _on_drop(self, method: str) -> None: ...
+
+    def _add_node(self, node: dict, parent_id: Optional[int]) -> None: ...
+
+    def _remove_node(self, node_id: int) -> None: ...
+
+    def _serialize(self, node_id: int) -> str: ...
+
+    def _document_updated(self, **kwargs) -> None: ...
+
+    def _set_child_nodes(self, **kwargs) -> None: ...
+
+    def _child_node_inserted(self, **kwargs) -> None: ...
+
+    def _child_node_removed(self, **kwargs) -> None: ...
+
+    def _child_node_count_updated(self, **kwargs) -> None: ...
+
+    def _attribute_modified(self, **kwargs) -> None: ...
+
+    def _attribute_removed(self, **kwargs) -> None: ...
+
+    def _character_data_modified(self, **kwargs) -> None: ...
+
+    def _shadow_root_pushed(self, **kwargs) -> None: ...
+
+    def _shadow_root_popped(self, **kwargs) -> None: ...
+
+    def _pseudo_element_added(self, **kwargs) -> None: ...
+
+    def _pseudo_element_removed(self, **kwargs) -> None: ...
+
+    def _add_extra(self, host_id: int, node: dict) -> None: ...
+
+    def _remove_extra(self, host_id: int, node_id: int) -> None: ...
+
+
+def _escape_text(txt: str) -> str: ...
+
+
+def _escape_attr(txt: str) -> str: ...
@@ -0,0 +1,200 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from .dom_mirror import VOID_ELEMENTS, RAW_TEXT_ELEMENTS, _escape_text, _escape_attr
+from .._elements.session_element import make_session_ele
+
+
+class DomSnapshot(object):
+    """DOMSnapshot.captureSnapshot结果中一个文档的列式数据，各列表按节点序号对齐，序号0为文档节点
+    列表可直接转为numpy数组做向量化筛选，节点序号可用node()、s_ele()等方法转换
+    """
+
+    def __init__(self, owner, data, doc_index=0, styles=()):
+        """
+        :param owner: 页面对象
+        :param data: captureSnapshot的返回数据
+        :param doc_index: 文档序号，0为页面主文档，其它为iframe中的文档
+        :param styles: 获取快照时指定的计算样式名称
+        """
+        self._owner = owner
+        self._data = data
+        self._children = None
+        strings = data['strings']
+        doc = data['documents'][doc_index]
+        nodes = doc['nodes']
+        layout = doc['layout']
+
+        def text_at(i):
+            return strings[i] if i >= 0 else None
+
+        self.doc_index = doc_index
+        self.url = text_at(doc['documentURL'])
+        self.title = text_at(doc['title'])
+        self.public_id = text_at(doc.get('publicId', -1)) or ''
+        self.system_id = text_at(doc.get('systemId', -1)) or ''
+        self.style_names = tuple(styles)
+        self.types = nodes['nodeType']
+        self.names = [strings[i] for i in nodes['nodeName']]
+        self.values = [strings[i] if i >= 0 else '' for i in nodes['nodeValue']]
+        self.parents = nodes['parentIndex']
+        self.backend_ids = nodes['backendNodeId']
+        self.attrs = [{strings[a[i]]: strings[a[i + 1]] for i in range(0, len(a), 2)} for a in nodes['attributes']]
+        self.input_values = {i: strings[v] for i, v in zip(nodes.get('inputValue', {}).get('index', ()),
+                                                          nodes.get('inputValue', {}).get('value', ()))}
+        self.checked = frozenset(nodes.get('inputChecked', {}).get('index', ()))
+        self.clickable = frozenset(nodes.get('isClickable', {}).get('index', ()))
+        self.frames = dict(zip(nodes.get('contentDocumentIndex', {}).get('index', ()),
+                               nodes.get('contentDocumentIndex', {}).get('value', ())))
+
+        count = len(self.types)
+        self.bounds = [None] * count
+        self.layout_texts = [None] * count
+        self.styles = [None] * count if styles else None
+        self.offset_rects = self.client_rects = self.scroll_rects = None
+        for n, i in enumerate(layout['nodeIndex']):
+            self.bounds[i] = tuple(layout['bounds'][n])
+            if layout['text'][n] >= 0:
+                self.layout_texts[i] = strings[layout['text'][n]]
+            if styles:
+                self.styles[i] = {k: strings[v] for k, v in zip(styles, layout['styles'][n])}
+        if 'offsetRects' in layout:
+            self.offset_rects, self.client_rects, self.scroll_rects = [[None] * count for _ in range(3)]
+            for n, i in enumerate(layout['nodeIndex']):
+                for col, name in ((self.offset_rects, 'offsetRects'), (self.client_rects, 'clientRects'),
+                                  (self.scroll_rects, 'scrollRects')):
+                    r = layout[name][n]
+                    col[i] = tuple(r) if r else None
+
+    def __repr__(self):
+        return f'<DomSnapshot {self.url} nodes={len(self.types)}>'
+
+    def __len__(self):
+        return len(self.types)
+
+    def tag(self, index):
+        """返回节点的tag，非元素节点返回节点名称
+        :param index: 节点序号
+        :return: tag文本
+        """
+        return self.names[index].lower() if self.types[index] == 1 else self.names[index]
+
+    def node(self, index):
+        """返回节点的信息
+        :param index: 节点序号
+        :return: 包含type、tag、value、attrs、parent、backend_id、bounds、style的dict
+        """
+        return {'type': self.types[index], 'tag': self.tag(index), 'value': self.values[index],
+                'attrs': self.attrs[index], 'parent': self.parents[index], 'backend_id': self.backend_ids[index],
+                'bounds': self.bounds[index], 'style': self.styles[index] if self.styles else None}
+
+    def children(self, index):
+        """返回节点的子节点序号
+        :param index: 节点序号
+        :return: 序号组成的列表
+        """
+        if self._children is None:
+            self._children = [[] for _ in self.types]
+            for i, p in enumerate(self.parents):
+                if p >= 0:
+                    self._children[p].append(i)
+        return self._children[index]
+
+    def find(self, tag=None, **attrs):
+        """按tag和属性值在本地查找元素节点
+        :param tag: 元素tag，为None时不限制
+        :param attrs: 属性名和属性值，属性名中的_表示-，值为True时只要求有该属性
+        :return: 节点序号组成的列表
+        """
+        tag = tag.lower() if tag else None
+        attrs = {k.replace('_', '-'): v for k, v in attrs.items()}
+        r = []
+        for i, t in enumerate(self.types):
+            if t != 1 or (tag and self.names[i].lower() != tag):
+                continue
+            a = self.attrs[i]
+            if all((k in a) if v is True else a.get(k) == v for k, v in attrs.items()):
+                r.append(i)
+        return r
+
+    def visible(self):
+        """返回有布局且宽高都大于0的节点序号"""
+        return [i for i, b in enumerate(self.bounds) if b and b[2] > 0 and b[3] > 0]
+
+    def text(self, index):
+        """返回节点内所有文本节点的原始文本
+        :param index: 节点序号
+        :return: 文本
+        """
+        out = []
+        stack = [index]
+        while stack:
+            i = stack.pop()
+            if self.types[i] == 3:
+                out.append(self.values[i])
+            stack.extend(reversed(self.children(i)))
+        return ''.join(out)
+
+    def html(self, index=0):
+        """返回节点的html文本
+        :param index: 节点序号，为0时返回整个文档
+        :return: html文本
+        """
+        out = []
+        stack = [(index, False)]
+        while stack:
+            i, closing = stack.pop()
+            if closing:
+                out.append(f'</{i}>')
+                continue
+            node_type = self.types[i]
+            if node_type == 1:
+                name = self.names[i].lower()
+                attrs_txt = ''.join(f' {k}="{_escape_attr(v)}"' for k, v in self.attrs[i].items())
+                out.append(f'<{name}{attrs_txt}>')
+                if name in VOID_ELEMENTS:
+                    continue
+                stack.append((name, True))
+                stack.extend((c, False) for c in reversed(self.children(i)))
+            elif node_type == 3:
+                p = self.parents[i]
+                raw = p >= 0 and self.types[p] == 1 and self.names[p].lower() in RAW_TEXT_ELEMENTS
+                out.append(self.values[i] if raw else _escape_text(self.values[i]))
+            elif node_type == 8:
+                out.append(f'<!--{self.values[i]}-->')
+            elif node_type == 10:
+                ids = f' PUBLIC "{self.public_id}"' if self.public_id else (' SYSTEM' if self.system_id else '')
+                if self.system_id:
+                    ids = f'{ids} "{self.system_id}"'
+                out.append(f'<!DOCTYPE {self.names[i]}{ids}>')
+            else:
+                stack.extend((c, False) for c in reversed(self.children(i)))
+        return ''.join(out)
+
+    def s_ele(self, index=0):
+        """把节点转换为SessionElement
+        :param index: 节点序号，为0时返回整个文档的html元素
+        :return: SessionElement对象
+        """
+        return make_session_ele(self.html(index))
+
+    def s_eles(self, indexes):
+        """把多个节点转换为SessionElement
+        :param indexes: 节点序号组成的列表
+        :return: SessionElement对象组成的列表
+        """
+        return [self.s_ele(i) for i in indexes]
+
+    def frame(self, index):
+        """返回iframe节点中文档的快照
+        :param index: iframe节点序号
+        :return: DomSnapshot对象，不是iframe或无法获取时返回None
+        """
+        doc_index = self.frames.get(index)
+        if doc_index is None:
+            return None
+        return DomSnapshot(self._owner, self._data, doc_index, self.style_names)
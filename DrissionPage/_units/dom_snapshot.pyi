@@ -0,0 +1,65 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Dict, List, Optional, FrozenSet, Tuple, Union, Iterable
+
+from .._elements.session_element import SessionElement
+from .._pages.chromium_base import ChromiumBase
+
+Rect = Tuple[float, float, float, float]
+
+
+class DomSnapshot(object):
+    _owner: ChromiumBase = ...
+    _data: dict = ...
+    _children: Optional[List[List[int]]] = ...
+    doc_index: int = ...
+    url: Optional[str] = ...
+    title: Optional[str] = ...
+    public_id: str = ...
+    system_id: str = ...
+    style_names: Tuple[str, ...] = ...
+    types: List[int] = ...
+    names: List[str] = ...
+    values: List[str] = ...
+    parents: List[int] = ...
+    backend_ids: List[int] = ...
+    attrs: List[Dict[str, str]] = ...
+    input_values: Dict[int, str] = ...
+    checked: FrozenSet[int] = ...
+    clickable: FrozenSet[int] = ...
+    frames: Dict[int, int] = ...
+    bounds: List[Optional[Rect]] = ...
+    layout_texts: List[Optional[str]] = ...
+    styles: Optional[List[Optional[Dict[str, str]]]] = ...
+    offset_rects: Optional[List[Optional[Rect]]] = ...
+    client_rects: Optional[List[Optional[Rect]]] = ...
+    scroll_rects: Optional[List[Optional[Rect]]] = ...
+
+    def __init__(self, owner: ChromiumBase, data: dict, doc_index: int = 0, styles: Iterable[str] = ()): ...
+
+    def __len__(self) -> int: ...
+
+    def tag(self, index: int) -> str: ...
+
+    def node(self, index: int) -> Dict[str, Union[int, str, dict, Rect, None]]: ...
+
+    def children(self, index: int) -> List[int]: ...
+
+    def find(self, tag: str = None, **attrs: Union[str, bool]) -> List[int]: ...
+
+    def visible(self) -> List[int]: ...
+
+    def text(self, index: int) -> str: ...
+
+    def html(self, index: int = 0) -> str: ...
+
+    def s_ele(self, index: int = 0) -> SessionElement: ...
+
+    def s_eles(self, indexes: Iterable[int]) -> List[SessionElement]: ...
+
+    def frame(self, index: int) -> Optional[DomSnapshot]: ...
@@ -13,7 +13,6 @@ from time import perf_counter, sleep
 
 from requests.structures import CaseInsensitiveDict
 
-from .._base.driver import Driver
 from .._functions.settings import Settings
 from ..errors import WaitTimeoutError
 
@@ -110,7 +109,7 @@ class Listener(object):
         if self.listening:
             return
 
-        self._driver = Driver(self._target_id, 'page', self._address)
+        self._driver = self._owner.browser._new_driver(self._target_id)
         self._driver.run('Network.enable')
 
         self._set_callback()
@@ -251,13 +250,14 @@ class Listener(object):
         self._target_id = target_id
         self._address = address
         self._owner = owner
-        debug = False
+        observers = ()
         if self._driver:
-            debug = self._driver._debug
+            observers = self._driver._observers
             self._driver.stop()
         if self.listening:
-            self._driver = Driver(self._target_id, 'page', self._address)
-            self._driver._debug = debug
+            self._driver = self._owner.browser._new_driver(self._target_id)
+            for observer in observers:
+                self._driver.add_observer(observer)
             self._driver.run('Network.enable')
             self._set_callback()
 
@@ -0,0 +1,175 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from heapq import heappush, heappop
+from itertools import count
+from threading import Condition, Thread, Lock
+from time import perf_counter
+from traceback import print_exc
+
+# 以生命周期事件判断加载完成的策略，{策略: Page.lifecycleEvent事件名}
+LIFECYCLE_MODES = {'network_almost_idle': 'networkAlmostIdle',
+                   'network_idle': 'networkIdle',
+                   'first_meaningful_paint': 'firstMeaningfulPaint'}
+LOAD_MODES = ('normal', 'eager', 'none', 'in_flight') + tuple(LIFECYCLE_MODES)
+
+
+class LoadState(object):
+    """页面加载状态，由事件线程修改，状态改变时立即唤醒等待中的线程"""
+
+    def __init__(self):
+        self._cond = Condition()
+        self.is_loading = None
+        self.ready_state = None
+        self.lifecycle = frozenset()  # 当前文档已发生的生命周期事件
+        self.network_idle = False  # 是否满足in_flight策略的网络空闲条件
+
+    def set(self, **kwargs):
+        """修改状态并唤醒等待者
+        :param kwargs: 要修改的状态，可用is_loading、ready_state、lifecycle、network_idle
+        :return: None
+        """
+        with self._cond:
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+            self._cond.notify_all()
+
+    def wait(self, predicate, timeout=None):
+        """等待状态满足条件
+        :param predicate: 无参数的判断函数，在状态改变时重新执行
+        :param timeout: 超时时间（秒），为None时无限等待
+        :return: 是否满足条件
+        """
+        if timeout is not None and timeout < 0:
+            timeout = 0
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
+
+
+class NetworkIdle(object):
+    """根据Network事件统计进行中的请求，不多于指定数量并持续指定时间后视为网络空闲"""
+
+    def __init__(self, state, max_requests=0, duration=.5):
+        """
+        :param state: LoadState对象
+        :param max_requests: 允许的进行中请求数
+        :param duration: 需持续的秒数
+        """
+        self._state = state
+        self.max_requests = max_requests
+        self.duration = duration
+        self._requests = {}  # {requestId: loaderId}
+        self._lock = Lock()
+        self._task = None
+        self._token = 0
+
+    def reset(self, loader_id=None):
+        """新文档开始时调用，清除旧文档的请求记录并重新计时
+        请求事件与跳转事件可能在不同线程执行，新文档的请求可能先被记录，因此按loaderId保留
+        :param loader_id: 新文档的loaderId，为None时清除所有记录
+        :return: None
+        """
+        with self._lock:
+            if loader_id is None:
+                self._requests.clear()
+            else:
+                self._requests = {k: v for k, v in self._requests.items() if v == loader_id}
+            self._cancel()
+            self._update()
+
+    def _onRequestWillBeSent(self, **kwargs):
+        with self._lock:
+            self._requests[kwargs['requestId']] = kwargs.get('loaderId')
+            self._update()
+
+    def _onLoadingFinished(self, **kwargs):
+        with self._lock:
+            self._requests.pop(kwargs['requestId'], None)
+            self._update()
+
+    def _update(self):
+        """请求数变化时调用，满足条件时开始计时，否则取消计时"""
+        if len(self._requests) > self.max_requests:
+            self._cancel()
+        elif self._task is None and not self._state.network_idle:
+            self._token += 1
+            self._task = timers.schedule(self.duration, self._on_quiet, self._token)
+
+    def _cancel(self):
+        """取消计时并标记为不空闲"""
+        timers.cancel(self._task)
+        self._task = None
+        if self._state.network_idle:
+            self._state.set(network_idle=False)
+
+    def _on_quiet(self, token):
+        """计时结束时在计时器线程执行"""
+        with self._lock:
+            if token == self._token and self._task is not None:
+                self._task = None
+                self._state.set(network_idle=True)
+
+
+class TimerService(object):
+    """所有页面共用的计时器，用一个线程按时执行到期的任务"""
+
+    def __init__(self):
+        self._cond = Condition()
+        self._tasks = []  # [(到期时间, 序号, 任务)]
+        self._num = count()
+        self._thread = None
+
+    def schedule(self, delay, func, *args):
+        """在若干秒后执行一个函数，函数在计时器线程中执行，不应长时间阻塞
+        :param delay: 延迟秒数
+        :param func: 要执行的函数
+        :param args: 函数参数
+        :return: 任务对象，可用于cancel()
+        """
+        task = [func, args]
+        with self._cond:
+            heappush(self._tasks, (perf_counter() + delay, next(self._num), task))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return task
+
+    @staticmethod
+    def cancel(task):
+        """取消未执行的任务
+        :param task: schedule()返回的任务对象
+        :return: None
+        """
+        if task:
+            task[0] = None
+
+    def _run(self):
+        """计时器线程"""
+        while True:
+            with self._cond:
+                while True:
+                    while self._tasks and self._tasks[0][2][0] is None:
+                        heappop(self._tasks)
+                    if not self._tasks:
+                        self._cond.wait()
+                        continue
+                    left = self._tasks[0][0] - perf_counter()
+                    if left <= 0:
+                        task = heappop(self._tasks)[2]
+                        break
+                    self._cond.wait(left)
+
+            func, args = task
+            if func is not None:
+                try:
+                    func(*args)
+                except Exception:
+                    print_exc()
+
+
+timers = TimerService()
@@ -0,0 +1,66 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Condition, Thread, Lock
+from typing import Optional, Callable, List, Tuple, Any, Iterator, Dict, FrozenSet
+
+LIFECYCLE_MODES: Dict[str, str] = ...
+LOAD_MODES: Tuple[str, ...] = ...
+
+
+class LoadState(object):
+    def __init__(self):
+        self._cond: Condition = ...
+        self.is_loading: Optional[bool] = ...
+        self.ready_state: Optional[str] = ...
+        self.lifecycle: FrozenSet[str] = ...
+        self.network_idle: bool = ...
+
+    def set(self, **kwargs) -> None: ...
+
+    def wait(self, predicate: Callable[[], Any], timeout: float = None) -> bool: ...
+
+
+class NetworkIdle(object):
+    def __init__(self, state: LoadState, max_requests: int = 0, duration: float = .5):
+        self._state: LoadState = ...
+        self.max_requests: int = ...
+        self.duration: float = ...
+        self._requests: Dict[str, Optional[str]] = ...
+        self._lock: Lock = ...
+        self._task: Optional[list] = ...
+        self._token: int = ...
+
+    def reset(self, loader_id: str = None) -> None: ...
+
+    def _onRequestWillBeSent(self, **kwargs) -> None: ...
+
+    def _onLoadingFinished(self, **kwargs) -> None: ...
+
+    def _update(self) -> None: ...
+
+    def _cancel(self) -> None: ...
+
+    def _on_quiet(self, token: int) -> None: ...
+
+
+class TimerService(object):
+    def __init__(self):
+        self._cond: Condition = ...
+        self._tasks: List[Tuple[float, int, list]] = ...
+        self._num: Iterator[int] = ...
+        self._thread: Optional[Thread] = ...
+
+    def schedule(self, delay: float, func: Callable, *args) -> list: ...
+
+    @staticmethod
+    def cancel(task: Optional[list]) -> None: ...
+
+    def _run(self) -> None: ...
+
+
+timers: TimerService = ...
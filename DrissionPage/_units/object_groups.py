@@ -0,0 +1,201 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from itertools import count
+from threading import Lock, local
+from weakref import ref
+
+# 会在浏览器中生成远程对象并可指定objectGroup的方法
+OBJECT_METHODS = {'Runtime.callFunctionOn', 'Runtime.evaluate', 'DOM.resolveNode'}
+_group_num = count(1)
+
+
+class ObjectGroups(object):
+    """管理页面中远程对象（object id）所属的组
+    默认所有对象归入当前页面加载的组，页面跳转时整组随文档销毁；
+    在with page.scope()块中生成的对象归入该块的组，退出时统一释放
+    页面不跳转时默认组中的对象会一直增加，长时间运行且不跳转的页面应使用scope()，或定期调用release()释放默认组
+    """
+
+    def __init__(self, owner):
+        """
+        :param owner: 页面对象
+        """
+        self._owner = owner
+        self._local = local()  # 每个线程有自己的作用域栈
+        self._lock = Lock()
+        self._counts = {}  # {组名: 远程对象数}
+        self._objs = {}  # {组名: {id(对象): 对象弱引用}}
+        self.released = 0
+        self.root_group = _new_name('root')
+        self.load_group = _new_name('load')
+
+    def __repr__(self):
+        return f'<ObjectGroups live={self.live} released={self.released}>'
+
+    @property
+    def live(self):
+        """返回由本库生成且未释放的远程对象数"""
+        return sum(self._counts.values())
+
+    @property
+    def current(self):
+        """返回当前线程中新对象所属的组名"""
+        stack = self._stack
+        return stack[-1].group if stack else self.load_group
+
+    @property
+    def _stack(self):
+        """返回当前线程的作用域栈"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stats(self):
+        """返回远程对象统计信息
+        :return: {'live': 未释放对象数, 'released': 已释放对象数, 'groups': {组名: 未释放对象数}}
+        """
+        with self._lock:
+            groups = {k: v for k, v in self._counts.items() if v}
+        return {'live': sum(groups.values()), 'released': self.released, 'groups': groups}
+
+    def scope(self):
+        """返回一个作用域，在with块中生成的远程对象在退出时一并释放
+        :return: ObjectScope对象
+        """
+        return ObjectScope(self, _new_name('scope'))
+
+    def pin(self):
+        """返回一个不会被释放的作用域，用于获取文档根对象
+        :return: ObjectScope对象
+        """
+        return ObjectScope(self, self.root_group, release=False)
+
+    def prepare(self, cmd, cmd_args):
+        """执行cdp语句前调用，为会生成对象的语句指定所属组
+        :param cmd: 协议项目
+        :param cmd_args: 参数
+        :return: 结果中对象所属的组名，不会生成对象时返回None
+        """
+        # getProperties生成的对象与原对象同组，原对象所属组未知，不计数
+        return cmd_args.setdefault('objectGroup', self.current) if cmd in OBJECT_METHODS else None
+
+    def record(self, group, result):
+        """记录cdp语句结果中生成的对象数
+        :param group: prepare()返回的组名
+        :param result: cdp语句结果
+        :return: None
+        """
+        res = result.get('result')
+        if 'objectId' in (res if isinstance(res, dict) else result.get('object', ())):
+            with self._lock:
+                self._counts[group] = self._counts.get(group, 0) + 1
+
+    def track(self, obj):
+        """登记持有当前组对象的元素，组被释放时重置其object id
+        :param obj: ChromiumElement或ShadowRoot对象
+        :return: None
+        """
+        group = self.current
+        key = id(obj)
+
+        def remove(r):
+            with self._lock:
+                objs = self._objs.get(group)
+                if objs is not None and objs.get(key) is r:
+                    del objs[key]
+
+        with self._lock:
+            self._objs.setdefault(group, {})[key] = ref(obj, remove)
+
+    def release(self, group=None):
+        """释放一个组的所有远程对象，已登记的元素会在下次使用时重新获取object id
+        :param group: 组名，为None时释放当前页面加载的组
+        :return: 释放的对象数
+        """
+        group = group or self.load_group
+        with self._lock:
+            objs = self._objs.pop(group, {})
+            num = self._counts.pop(group, 0)
+        objs = [o for o in (r() for r in objs.values()) if o is not None]
+
+        for o in objs:  # 释放前记下backend id，以便重新获取object id
+            if o._type == 'ChromiumElement' and not o._b_id and o._o_id:
+                try:
+                    o._backend_id
+                except Exception:
+                    pass
+
+        try:
+            self._owner.driver.run('Runtime.releaseObjectGroup', objectGroup=group)
+        except Exception:
+            pass
+
+        for o in objs:
+            if o._type == 'ChromiumElement':
+                o._o_id = None
+                o._d_id = False
+            elif o._type == 'ShadowRoot':
+                try:
+                    o._obj_id = o._get_obj_id(o._backend_id)
+                except Exception:
+                    pass
+
+        self.released += num
+        return num
+
+    def new_load(self):
+        """页面跳转时调用，原文档的默认组和根对象已随文档销毁，计为已释放，默认组换用新组名
+        作用域的组不在这里处理，仍由作用域退出时释放并计数
+        """
+        with self._lock:
+            for group in (self.load_group, self.root_group):
+                self.released += self._counts.pop(group, 0)
+            self._objs.pop(self.load_group, None)
+            self.load_group = _new_name('load')
+
+
+class ObjectScope(object):
+    """远程对象作用域，with块中在当前线程生成的远程对象归入同一组"""
+
+    def __init__(self, groups, group, release=True):
+        """
+        :param groups: ObjectGroups对象
+        :param group: 组名
+        :param release: 退出时是否释放该组
+        """
+        self._groups = groups
+        self.group = group
+        self._release = release
+
+    def __repr__(self):
+        return f'<ObjectScope {self.group} live={self.live}>'
+
+    def __enter__(self):
+        self._groups._stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        stack = self._groups._stack
+        if self in stack:
+            stack.remove(self)
+        if self._release:
+            self._groups.release(self.group)
+
+    @property
+    def live(self):
+        """返回该组中未释放的远程对象数"""
+        return self._groups._counts.get(self.group, 0)
+
+
+def _new_name(kind):
+    """生成在浏览器中唯一的组名
+    :param kind: 组类型
+    :return: 组名
+    """
+    return f'DrissionPage-{kind}-{next(_group_num)}'
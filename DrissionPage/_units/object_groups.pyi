@@ -0,0 +1,69 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from threading import Lock, local
+from typing import Union, Optional, Dict, List, Set
+from weakref import ref
+
+from .._elements.chromium_element import ChromiumElement, ShadowRoot
+from .._pages.chromium_base import ChromiumBase
+
+OBJECT_METHODS: Set[str] = ...
+
+
+class ObjectGroups(object):
+    def __init__(self, owner: ChromiumBase):
+        self._owner: ChromiumBase = ...
+        self._local: local = ...
+        self._lock: Lock = ...
+        self._counts: Dict[str, int] = ...
+        self._objs: Dict[str, Dict[int, ref]] = ...
+        self.released: int = ...
+        self.root_group: str = ...
+        self.load_group: str = ...
+
+    @property
+    def live(self) -> int: ...
+
+    @property
+    def current(self) -> str: ...
+
+    @property
+    def _stack(self) -> List[ObjectScope]: ...
+
+    def stats(self) -> dict: ...
+
+    def scope(self) -> ObjectScope: ...
+
+    def pin(self) -> ObjectScope: ...
+
+    def prepare(self, cmd: str, cmd_args: dict) -> Optional[str]: ...
+
+    def record(self, group: str, result: dict) -> None: ...
+
+    def track(self, obj: Union[ChromiumElement, ShadowRoot]) -> None: ...
+
+    def release(self, group: str = None) -> int: ...
+
+    def new_load(self) -> None: ...
+
+
+class ObjectScope(object):
+    def __init__(self, groups: ObjectGroups, group: str, release: bool = True):
+        self._groups: ObjectGroups = ...
+        self.group: str = ...
+        self._release: bool = ...
+
+    def __enter__(self) -> ObjectScope: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def live(self) -> int: ...
+
+
+def _new_name(kind: str) -> str: ...
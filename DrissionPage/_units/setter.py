@@ -11,6 +11,7 @@ from time import sleep
 from requests.structures import CaseInsensitiveDict
 
 from .cookies_setter import SessionCookiesSetter, CookiesSetter, WebPageCookiesSetter
+from .load_state import LOAD_MODES
 from .._functions.settings import Settings
 from .._functions.tools import show_or_hide_browser
 from .._functions.web import format_headers
@@ -530,24 +531,46 @@ class LoadMode(object):
 
     def __call__(self, value):
         """设置加载策略
-        :param value: 可选 'normal', 'eager', 'none'
+        :param value: 可选 'normal', 'eager', 'none', 'network_almost_idle', 'network_idle',
+                      'first_meaningful_paint', 'in_flight'
         :return: None
         """
-        if value.lower() not in ('normal', 'eager', 'none'):
-            raise ValueError("只能选择 'normal', 'eager', 'none'。")
-        self._owner._load_mode = value
+        value = value.lower()
+        if value not in LOAD_MODES:
+            raise ValueError(f'只能选择 {", ".join(LOAD_MODES)}。')
+        self._owner._set_load_mode(value)
 
     def normal(self):
         """设置页面加载策略为normal"""
-        self._owner._load_mode = 'normal'
+        self._owner._set_load_mode('normal')
 
     def eager(self):
         """设置页面加载策略为eager"""
-        self._owner._load_mode = 'eager'
+        self._owner._set_load_mode('eager')
 
     def none(self):
         """设置页面加载策略为none"""
-        self._owner._load_mode = 'none'
+        self._owner._set_load_mode('none')
+
+    def network_almost_idle(self):
+        """设置页面加载策略为文档可用且浏览器报告networkAlmostIdle（不多于2个请求持续500毫秒）"""
+        self._owner._set_load_mode('network_almost_idle')
+
+    def network_idle(self):
+        """设置页面加载策略为文档可用且浏览器报告networkIdle（没有请求持续500毫秒）"""
+        self._owner._set_load_mode('network_idle')
+
+    def first_meaningful_paint(self):
+        """设置页面加载策略为文档可用且浏览器报告firstMeaningfulPaint"""
+        self._owner._set_load_mode('first_meaningful_paint')
+
+    def in_flight(self, max_requests=0, duration=.5):
+        """设置页面加载策略为文档可用且进行中的请求不多于指定数量并持续指定时间
+        :param max_requests: 允许的进行中请求数
+        :param duration: 需持续的秒数
+        :return: None
+        """
+        self._owner._set_load_mode('in_flight', (max_requests, duration))
 
 
 class PageScrollSetter(object):
@@ -187,7 +187,8 @@ class LoadMode(object):
     def __init__(self, owner: ChromiumBase):
         self._owner: ChromiumBase = ...
 
-    def __call__(self, value: str) -> None: ...
+    def __call__(self, value: Literal['normal', 'eager', 'none', 'network_almost_idle', 'network_idle',
+                                      'first_meaningful_paint', 'in_flight']) -> None: ...
 
     def normal(self) -> None: ...
 
@@ -195,6 +196,14 @@ class LoadMode(object):
 
     def none(self) -> None: ...
 
+    def network_almost_idle(self) -> None: ...
+
+    def network_idle(self) -> None: ...
+
+    def first_meaningful_paint(self) -> None: ...
+
+    def in_flight(self, max_requests: int = 0, duration: float = .5) -> None: ...
+
 
 class PageScrollSetter(object):
     def __init__(self, scroll: PageScroller):
@@ -137,7 +137,7 @@ class BaseWaiter(OriginWaiter):
         :param raise_err: 等待失败时是否报错，为None时根据Settings设置
         :return: 是否等待成功
         """
-        return self._loading(timeout=timeout, gap=.002, raise_err=raise_err)
+        return self._loading(timeout=timeout, raise_err=raise_err)
 
     def doc_loaded(self, timeout=None, raise_err=None):
         """等待页面加载完成
@@ -229,22 +229,20 @@ class BaseWaiter(OriginWaiter):
         else:
             return False
 
-    def _loading(self, timeout=None, start=True, gap=.01, raise_err=None):
+    def _loading(self, timeout=None, start=True, raise_err=None):
         """等待页面开始加载或加载完成
         :param timeout: 超时时间，为None时使用页面timeout属性
         :param start: 等待开始还是结束
-        :param gap: 间隔秒数
         :param raise_err: 等待失败时是否报错，为None时根据Settings设置
         :return: 是否等待成功
         """
         if timeout != 0:
             if timeout is None or timeout is True:
                 timeout = self._driver.timeout
-            end_time = perf_counter() + timeout
-            while perf_counter() < end_time:
-                if self._driver._is_loading == start:
-                    return True
-                sleep(gap)
+            driver = self._driver
+            predicate = (lambda: driver._is_loading is True) if start else (lambda: driver._is_loaded(doc=True))
+            if driver._load_state.wait(predicate, timeout):
+                return True
 
             if raise_err is True or Settings.raise_when_wait_failed is True:
                 raise WaitTimeoutError(f'等待页面加载失败（等待{timeout}秒）。')
@@ -43,7 +43,7 @@ class BaseWaiter(OriginWaiter):
                     any_one: bool = False,
                     raise_err: bool = None) -> bool: ...
 
-    def _loading(self, timeout: float = None, start: bool = True, gap: float = .01, raise_err: bool = None) -> bool: ...
+    def _loading(self, timeout: float = None, start: bool = True, raise_err: bool = None) -> bool: ...
 
     def load_start(self, timeout: float = None, raise_err: bool = None) -> bool: ...
 
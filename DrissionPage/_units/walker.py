@@ -0,0 +1,202 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from time import perf_counter
+
+from .._elements.none_element import NoneElement
+from .._functions.locator import get_loc
+
+# 在页面中依次执行各步xpath，每步以上一步的所有结果为起点，返回最后一步的元素数组
+WALK_JS = '''function(steps){
+    let cur = [this];
+    for(const [xpath, index] of steps){
+        const next = [];
+        const seen = new Set();
+        for(const node of cur){
+            const r = (node.ownerDocument || node).evaluate(xpath, node, null, 7, null);
+            const len = r.snapshotLength;
+            let items = [];
+            if(index === null){
+                for(let i = 0; i < len; i++){items.push(r.snapshotItem(i));}
+            }else{
+                const i = index > 0 ? index - 1 : len + index;
+                if(i >= 0 && i < len){items.push(r.snapshotItem(i));}
+            }
+            for(const n of items){
+                if(n.nodeType === 1 && !seen.has(n)){seen.add(n); next.push(n);}
+            }
+        }
+        cur = next;
+    }
+    return cur;
+}'''
+
+
+class ElementWalker(object):
+    """从元素出发的相对定位链，各步在页面中用一次调用执行完毕，结果元素一次批量生成
+    每步以上一步的所有结果为起点，只获取元素节点，例：ele.walk('parent', 2).children('t:td').eles()
+    """
+
+    def __init__(self, ele):
+        """
+        :param ele: 起点ChromiumElement对象
+        """
+        self._ele = ele
+        self._steps = []  # [(xpath, 序号或None)]
+
+    def __repr__(self):
+        return f'<ElementWalker {self._ele} steps={len(self._steps)}>'
+
+    def parent(self, level_or_loc=1, index=1):
+        """走到上面某一级父元素，可指定层数或用查询语法定位
+        :param level_or_loc: 第几级父元素，1开始，或定位符
+        :param index: 当level_or_loc传入定位符，使用此参数选择第几个结果，1开始
+        :return: 自身
+        """
+        if isinstance(level_or_loc, int):
+            return self._add(f'./ancestor::*[{level_or_loc}]', 1)
+        elif isinstance(level_or_loc, (tuple, str)):
+            return self._add(f'./ancestor::{_node_test(level_or_loc)}[{index}]', 1)
+        raise TypeError('level_or_loc参数只能是tuple、int或str。')
+
+    def child(self, locator='', index=1):
+        """走到一个符合条件的直接子元素
+        :param locator: 用于筛选的查询语法，为int时作为index
+        :param index: 第几个查询结果，1开始
+        :return: 自身
+        """
+        locator, index = _split_index(locator, index)
+        return self._add(f'./{_node_test(locator)}', index)
+
+    def children(self, locator=''):
+        """走到所有符合条件的直接子元素
+        :param locator: 用于筛选的查询语法
+        :return: 自身
+        """
+        return self._add(f'./{_node_test(locator)}', None)
+
+    def next(self, locator='', index=1):
+        """走到后面一个符合条件的同级元素
+        :param locator: 用于筛选的查询语法，为int时作为index
+        :param index: 后面第几个查询结果，1开始
+        :return: 自身
+        """
+        locator, index = _split_index(locator, index)
+        return self._add(f'./following-sibling::{_node_test(locator)}', index)
+
+    def nexts(self, locator=''):
+        """走到后面所有符合条件的同级元素
+        :param locator: 用于筛选的查询语法
+        :return: 自身
+        """
+        return self._add(f'./following-sibling::{_node_test(locator)}', None)
+
+    def prev(self, locator='', index=1):
+        """走到前面一个符合条件的同级元素
+        :param locator: 用于筛选的查询语法，为int时作为index
+        :param index: 前面第几个查询结果，1开始
+        :return: 自身
+        """
+        locator, index = _split_index(locator, index)
+        return self._add(f'./preceding-sibling::{_node_test(locator)}', -index)
+
+    def prevs(self, locator=''):
+        """走到前面所有符合条件的同级元素
+        :param locator: 用于筛选的查询语法
+        :return: 自身
+        """
+        return self._add(f'./preceding-sibling::{_node_test(locator)}', None)
+
+    def after(self, locator='', index=1):
+        """走到文档中后面一个符合条件的元素，不限同级
+        :param locator: 用于筛选的查询语法，为int时作为index
+        :param index: 后面第几个查询结果，1开始
+        :return: 自身
+        """
+        locator, index = _split_index(locator, index)
+        return self._add(f'./following::{_node_test(locator)}', index)
+
+    def before(self, locator='', index=1):
+        """走到文档中前面一个符合条件的元素，不限同级
+        :param locator: 用于筛选的查询语法，为int时作为index
+        :param index: 前面第几个查询结果，1开始
+        :return: 自身
+        """
+        locator, index = _split_index(locator, index)
+        return self._add(f'./preceding::{_node_test(locator)}', -index)
+
+    def ele(self, index=1, timeout=0):
+        """执行定位链并返回一个结果
+        :param index: 第几个结果，从1开始，可传入负数获取倒数第几个
+        :param timeout: 没有结果时等待DOM变化并重试的超时时间（秒），为0时只执行一次
+        :return: ChromiumElement对象，找不到时返回NoneElement
+        """
+        eles = self.eles(timeout)
+        if eles and abs(index) <= len(eles) and index:
+            return eles[index - 1 if index > 0 else index]
+        return NoneElement(self._ele.owner, 'walk()', {'steps': list(self._steps), 'index': index})
+
+    def eles(self, timeout=0):
+        """执行定位链并返回所有结果
+        :param timeout: 没有结果时等待DOM变化并重试的超时时间（秒），为0时只执行一次
+        :return: ChromiumElement对象组成的列表
+        """
+        from .._elements.chromium_element import make_chromium_eles, wait_for_mutation
+        owner = self._ele.owner
+        owner.wait.doc_loaded()
+        end_time = perf_counter() + timeout
+        while True:
+            obj_ids = self._run()
+            if obj_ids or perf_counter() >= end_time:
+                break
+            wait_for_mutation(owner, self._ele._obj_id, None, end_time)
+        if not obj_ids:
+            return []
+        return make_chromium_eles(owner, _ids=obj_ids, index=None, is_obj_id=True) or []
+
+    def _add(self, xpath, index):
+        """添加一步
+        :param xpath: 以'./'开头的相对xpath
+        :param index: 取第几个结果，负数表示倒数，None表示全部
+        :return: 自身
+        """
+        self._steps.append((xpath, index))
+        return self
+
+    def _run(self):
+        """在页面中执行定位链
+        :return: 结果元素的object id组成的列表
+        """
+        owner = self._ele.owner
+        r = owner.run_cdp('Runtime.callFunctionOn', functionDeclaration=WALK_JS, objectId=self._ele._obj_id,
+                          arguments=[{'value': [list(i) for i in self._steps]}], returnByValue=False)
+        if 'exceptionDetails' in r:
+            raise SyntaxError(f'定位链语句错误：{self._steps}\n{r["exceptionDetails"]}')
+        if r['result'].get('description') == 'Array(0)':
+            return []
+        props = owner.run_cdp('Runtime.getProperties', objectId=r['result']['objectId'], ownProperties=True)['result']
+        return [i['value']['objectId'] for i in props if i['name'].isdigit()]
+
+
+def _node_test(locator):
+    """把定位符转换为xpath轴后面的部分
+    :param locator: 定位符，为空时表示所有元素
+    :return: xpath文本
+    """
+    if not locator:
+        return '*'
+    loc = get_loc(locator, True)  # 把定位符转换为xpath
+    if loc[0] == 'css selector':
+        raise ValueError('此css selector语法不受支持，请换成xpath。')
+    return loc[1].lstrip('./')
+
+
+def _split_index(locator, index):
+    """locator为int时作为index使用"""
+    if isinstance(locator, int):
+        return '', locator
+    return locator, index
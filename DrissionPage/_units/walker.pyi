@@ -0,0 +1,52 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
+@License  : BSD 3-Clause.
+"""
+from typing import Union, Tuple, List, Optional
+
+from .._elements.chromium_element import ChromiumElement
+from .._elements.none_element import NoneElement
+
+WALK_JS: str = ...
+
+
+class ElementWalker(object):
+    _ele: ChromiumElement = ...
+    _steps: List[Tuple[str, Optional[int]]] = ...
+
+    def __init__(self, ele: ChromiumElement): ...
+
+    def parent(self, level_or_loc: Union[int, str, Tuple[str, str]] = 1, index: int = 1) -> ElementWalker: ...
+
+    def child(self, locator: Union[Tuple[str, str], str, int] = '', index: int = 1) -> ElementWalker: ...
+
+    def children(self, locator: Union[Tuple[str, str], str] = '') -> ElementWalker: ...
+
+    def next(self, locator: Union[Tuple[str, str], str, int] = '', index: int = 1) -> ElementWalker: ...
+
+    def nexts(self, locator: Union[Tuple[str, str], str] = '') -> ElementWalker: ...
+
+    def prev(self, locator: Union[Tuple[str, str], str, int] = '', index: int = 1) -> ElementWalker: ...
+
+    def prevs(self, locator: Union[Tuple[str, str], str] = '') -> ElementWalker: ...
+
+    def after(self, locator: Union[Tuple[str, str], str, int] = '', index: int = 1) -> ElementWalker: ...
+
+    def before(self, locator: Union[Tuple[str, str], str, int] = '', index: int = 1) -> ElementWalker: ...
+
+    def ele(self, index: int = 1, timeout: float = 0) -> Union[ChromiumElement, NoneElement]: ...
+
+    def eles(self, timeout: float = 0) -> List[ChromiumElement]: ...
+
+    def _add(self, xpath: str, index: Optional[int]) -> ElementWalker: ...
+
+    def _run(self) -> List[str]: ...
+
+
+def _node_test(locator: Union[Tuple[str, str], str]) -> str: ...
+
+
+def _split_index(locator: Union[Tuple[str, str], str, int], index: int) -> Tuple[Union[Tuple[str, str], str], int]: ...
@@ -5,6 +5,7 @@
 @Copyright: (c) 2024 by g1879, Inc. All Rights Reserved.
 @License  : BSD 3-Clause.
 """
+from ._elements.async_element import AsyncChromiumElement
 from ._elements.chromium_element import ChromiumElement, ShadowRoot
 from ._elements.none_element import NoneElement
 from ._elements.session_element import SessionElement
@@ -12,4 +13,4 @@ from ._pages.chromium_frame import ChromiumFrame
 from ._pages.chromium_tab import ChromiumTab, WebPageTab
 
 __all__ = ['ChromiumElement', 'ShadowRoot', 'NoneElement', 'SessionElement', 'ChromiumFrame', 'ChromiumTab',
-           'WebPageTab']
+           'WebPageTab', 'AsyncChromiumElement']
@@ -0,0 +1,49 @@
+# -*- coding:utf-8 -*-
+"""
+事件分发测试，慢的Network回调不应拖慢Page事件，不需要浏览器。
+用法：python benchmarks/bench_dispatch.py [事件数]
+"""
+from pathlib import Path
+from sys import path, argv
+from threading import Event
+from time import perf_counter, sleep
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage._base.dispatcher import EventDispatcher  # noqa: E402
+from DrissionPage._base.driver import Driver  # noqa: E402
+from fake_cdp import FakeCDPServer  # noqa: E402
+
+
+def bench(driver, workers, count):
+    """交替发送慢Network事件和Page事件，返回Page事件平均延迟（毫秒）"""
+    driver.dispatcher = EventDispatcher(driver, workers=workers)
+    delays = []
+    done = Event()
+
+    def on_page(sent):
+        delays.append(perf_counter() - sent)
+        if len(delays) == count:
+            done.set()
+
+    driver.set_callback('Network.loadingFinished', lambda **kw: sleep(.005))
+    driver.set_callback('Page.loadEventFired', on_page)
+    for _ in range(count):
+        driver._handle_msg({'method': 'Network.loadingFinished', 'params': {'requestId': '1'}})
+        driver._handle_msg({'method': 'Page.loadEventFired', 'params': {'sent': perf_counter()}})
+    done.wait()
+    return sum(delays) / count * 1000
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 200
+    endpoint = FakeCDPServer()
+    driver = Driver('bench', 'page', endpoint.address)
+    for workers in (1, 4):
+        print(f'{workers}个工作线程  Page事件平均延迟{bench(driver, workers, count):>10.1f} 毫秒')
+    driver.stop()
+    endpoint.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding:utf-8 -*-
+"""
+Driver命令吞吐量测试，使用本地模拟端点，不需要浏览器。
+用法：python benchmarks/bench_driver.py [命令数]
+"""
+from pathlib import Path
+from sys import path, argv
+from threading import Thread
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage._base.driver import Driver  # noqa: E402
+from fake_cdp import FakeCDPServer  # noqa: E402
+
+
+def bench_serial(driver, count):
+    begin = perf_counter()
+    for _ in range(count):
+        driver.run('Runtime.evaluate', expression='1')
+    return count / (perf_counter() - begin)
+
+
+def bench_threads(driver, count, threads=4):
+    def work():
+        for _ in range(count // threads):
+            driver.run('Runtime.evaluate', expression='1')
+
+    ths = [Thread(target=work) for _ in range(threads)]
+    begin = perf_counter()
+    for th in ths:
+        th.start()
+    for th in ths:
+        th.join()
+    return count // threads * threads / (perf_counter() - begin)
+
+
+def bench_batch(driver, count, size=50):
+    begin = perf_counter()
+    for _ in range(count // size):
+        driver.run_many([('Runtime.evaluate', {'expression': '1'})] * size)
+    return count // size * size / (perf_counter() - begin)
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 5000
+    endpoint = FakeCDPServer()
+    driver = Driver('bench', 'page', endpoint.address)
+    driver.run('Runtime.enable')
+    print(f'{"串行run()":<16}{bench_serial(driver, count):>12.0f} 条/秒')
+    print(f'{"4线程run()":<16}{bench_threads(driver, count):>12.0f} 条/秒')
+    print(f'{"run_many()":<16}{bench_batch(driver, count):>12.0f} 条/秒')
+    driver.stop()
+    endpoint.close()
+
+
+if __name__ == '__main__':
+    main()
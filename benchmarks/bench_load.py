@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+"""
+加载状态测试，使用本地模拟端点发送页面加载事件，测试从加载完成事件到达到wait.doc_loaded()返回的延迟，
+eager模式下多次跳转后的线程数，以及按模拟的事件时间线各加载策略等待的时长，不需要浏览器。
+用法：python benchmarks/bench_load.py [跳转次数]
+"""
+from pathlib import Path
+from sys import path, argv
+from threading import active_count, Thread
+from time import perf_counter, sleep
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage import ChromiumPage  # noqa: E402
+from fake_cdp import FakeCDPServer  # noqa: E402
+
+
+def navigate(page, server):
+    """模拟一次跳转，返回从loadEventFired发出到doc_loaded()返回的秒数"""
+    fid = page._frame_id
+    server.emit('Page.frameStartedLoading', {'frameId': fid})
+    page.wait.load_start(timeout=5)
+    server.emit('Page.frameNavigated', {'frame': {'id': fid}})
+    server.emit('Page.domContentEventFired', {})
+    begin = perf_counter()
+    server.emit('Page.loadEventFired', {})
+    page.wait.doc_loaded(timeout=5)
+    t = perf_counter() - begin
+    server.emit('Page.frameStoppedLoading', {'frameId': fid})
+    return t
+
+
+def bench_latency(page, server, times):
+    results = sorted(navigate(page, server) for _ in range(times))
+    print(f'{"doc_loaded延迟":<18}{times:>6}次  中位{results[times // 2] * 1000:>7.2f} 毫秒'
+          f'  最大{results[-1] * 1000:>7.2f} 毫秒')
+
+
+def bench_eager_threads(page, server, times):
+    page.set.load_mode.eager()
+    before = active_count()
+    for _ in range(times):
+        navigate(page, server)
+    print(f'{"eager跳转后线程数":<16}{times:>6}次  跳转前{before:>4}  跳转后{active_count():>4}')
+    page.set.load_mode.normal()
+
+
+# 模拟的单页应用加载过程：(毫秒, 事件, 参数)，frameId和requestId在发送时补充
+TIMELINE = ((0, 'Page.frameNavigated', None),
+            (0, 'Page.lifecycleEvent', 'init'),
+            (0, 'Network.requestWillBeSent', 'doc'),
+            (20, 'Network.loadingFinished', 'doc'),
+            (20, 'Network.requestWillBeSent', 'app.js'),
+            (20, 'Network.requestWillBeSent', 'img1'),
+            (20, 'Network.requestWillBeSent', 'img2'),
+            (50, 'Page.domContentEventFired', None),
+            (60, 'Network.loadingFinished', 'app.js'),
+            (80, 'Page.lifecycleEvent', 'firstMeaningfulPaint'),
+            (80, 'Network.requestWillBeSent', 'api'),
+            (120, 'Network.loadingFinished', 'api'),
+            (600, 'Page.lifecycleEvent', 'networkAlmostIdle'),
+            (1500, 'Network.loadingFinished', 'img1'),
+            (1500, 'Network.loadingFinished', 'img2'),
+            (1500, 'Page.loadEventFired', None),
+            (1500, 'Page.frameStoppedLoading', None),
+            (2000, 'Page.lifecycleEvent', 'networkIdle'))
+
+
+def play(page, server):
+    """按TIMELINE发送事件"""
+    fid = page._frame_id
+    begin = perf_counter()
+    for ms, method, arg in TIMELINE:
+        sleep(max(0, begin + ms / 1000 - perf_counter()))
+        if method == 'Page.frameNavigated':
+            params = {'frame': {'id': fid}}
+        elif method == 'Page.lifecycleEvent':
+            params = {'frameId': fid, 'name': arg}
+        elif method.startswith('Network.'):
+            params = {'requestId': arg}
+        else:
+            params = {'frameId': fid}
+        server.emit(method, params)
+
+
+def bench_strategies(page, server):
+    modes = (('normal', None), ('eager', None), ('first_meaningful_paint', None), ('network_almost_idle', None),
+             ('in_flight', (2, .2)), ('in_flight', (0, .2)), ('network_idle', None))
+    for mode, rule in modes:
+        page._set_load_mode(mode, rule)
+        server.emit('Page.frameStartedLoading', {'frameId': page._frame_id})
+        page.wait.load_start(timeout=5)
+        t = Thread(target=play, args=(page, server))
+        begin = perf_counter()
+        t.start()
+        ok = page._wait_loaded(5)
+        cost = perf_counter() - begin
+        t.join()
+        name = f'{mode}{rule or ""}'
+        print(f'{name:<26}{"完成" if ok else "超时":>4}{cost * 1000:>10.0f} 毫秒')
+    page.set.load_mode.normal()
+
+
+def main():
+    times = int(argv[1]) if len(argv) > 1 else 50
+    server = FakeCDPServer(nodes=10)
+    page = ChromiumPage(server.address)
+    bench_latency(page, server, times)
+    bench_eager_threads(page, server, times)
+    bench_strategies(page, server)
+    page.driver.stop()
+    page.browser.driver.stop()
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
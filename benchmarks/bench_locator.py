@@ -0,0 +1,49 @@
+# -*- coding:utf-8 -*-
+"""
+定位符缓存测试，在多个小文档上反复用相同定位符查找，对比关闭和开启缓存的耗时，不需要浏览器。
+用法：python benchmarks/bench_locator.py [文档数]
+"""
+from pathlib import Path
+from sys import path, argv
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage._elements.session_element import make_session_ele  # noqa: E402
+from DrissionPage._functions import locator  # noqa: E402
+
+LOCATORS = ('@class=item', 'tag:a@href', 'text:第3', 'css:ul > li.item', 'xpath://li[last()]')
+HTML = '<html><body><ul>{}</ul></body></html>'.format(
+    ''.join(f'<li class="item"><a href="/{i}">第{i}项</a></li>' for i in range(10)))
+
+
+def run(docs):
+    eles = [make_session_ele(HTML) for _ in range(docs)]
+    begin = perf_counter()
+    for ele in eles:
+        for loc in LOCATORS:
+            ele.ele(loc)
+    return perf_counter() - begin
+
+
+def main():
+    docs = int(argv[1]) if len(argv) > 1 else 2000
+    get_loc, compile_loc = locator._get_loc, locator.compile_loc
+    locator._get_loc, locator.compile_loc = get_loc.__wrapped__, compile_loc.__wrapped__
+    import DrissionPage._elements.session_element as session_element
+    session_element.compile_loc = compile_loc.__wrapped__
+    uncached = run(docs)
+
+    locator._get_loc, locator.compile_loc = get_loc, compile_loc
+    session_element.compile_loc = compile_loc
+    locator.clear_loc_cache()
+    cached = run(docs)
+
+    count = docs * len(LOCATORS)
+    print(f'{"无缓存":<10}{uncached * 1000:>10.1f} 毫秒    {uncached / count * 1e6:>8.1f} 微秒/次')
+    print(f'{"有缓存":<10}{cached * 1000:>10.1f} 毫秒    {cached / count * 1e6:>8.1f} 微秒/次')
+    print(locator.loc_cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding:utf-8 -*-
+"""
+页面层测试，使用本地模拟端点连接ChromiumPage，测试页面和元素内查找元素、生成元素对象和监听器的耗时，不需要浏览器。
+可设置模拟的每条命令延迟，观察往返次数对耗时的影响。
+用法：python benchmarks/bench_page.py [元素数] [延迟毫秒]
+"""
+from pathlib import Path
+from sys import path, argv
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage import ChromiumPage  # noqa: E402
+from DrissionPage._elements.chromium_element import make_chromium_eles  # noqa: E402
+from fake_cdp import FakeCDPServer  # noqa: E402
+
+
+def timed(server, func, *args):
+    """执行方法，返回(耗时秒数, cdp命令数, 返回值)"""
+    commands = server.commands
+    begin = perf_counter()
+    r = func(*args)
+    return perf_counter() - begin, server.commands - commands, r
+
+
+def bench_find(page, server):
+    t, n, eles = timed(server, page._find_elements, 'css:div', 10, None)
+    print(f'{"_find_elements":<22}{len(eles):>6}个元素{t * 1000:>10.1f} 毫秒{n:>8}条命令')
+
+
+def bench_ele_eles(page, server):
+    ele = page.ele('css:div')
+    t, n, eles = timed(server, ele.eles, 'css:div', 10)
+    print(f'{"ele.eles":<22}{len(eles):>6}个元素{t * 1000:>10.1f} 毫秒{n:>8}条命令')
+
+
+def bench_make(page, server):
+    ids = server.dom.element_ids()
+    t, n, eles = timed(server, make_chromium_eles, page, ids, None, False)
+    print(f'{"make_chromium_eles":<22}{len(eles):>6}个元素{t * 1000:>10.1f} 毫秒{n:>8}条命令')
+
+
+def bench_walk(page, server):
+    ele = page.ele('css:div')
+    t, n, eles = timed(server, ele.walk('parent').children('t:div').eles)
+    print(f'{"ele.walk":<22}{len(eles):>6}个元素{t * 1000:>10.1f} 毫秒{n:>8}条命令')
+
+
+def bench_listener(page, server, count):
+    """模拟count个请求的完整事件序列，统计监听器捕获全部数据包的耗时"""
+    page.listen.start()
+    begin = perf_counter()
+    for i in range(count):
+        rid = str(i)
+        server.emit('Network.requestWillBeSent', {'requestId': rid, 'type': 'XHR', 'request': {
+            'url': f'https://example.com/api/{i}', 'method': 'GET', 'headers': {}}})
+        server.emit('Network.responseReceived', {'requestId': rid, 'type': 'XHR', 'response': {
+            'url': f'https://example.com/api/{i}', 'status': 200, 'headers': {}}})
+        server.emit('Network.loadingFinished', {'requestId': rid})
+    packets = page.listen.wait(count, timeout=60)
+    t = perf_counter() - begin
+    page.listen.stop()
+    caught = len(packets) if packets else 0
+    print(f'{"Listener":<22}{caught:>6}个数据包{t * 1000:>8.1f} 毫秒{count * 3 / t:>10.0f} 事件/秒')
+
+
+def main():
+    nodes = int(argv[1]) if len(argv) > 1 else 200
+    latency = float(argv[2]) / 1000 if len(argv) > 2 else 0
+    server = FakeCDPServer(nodes=nodes)
+    page = ChromiumPage(server.address)
+    server.latency = latency
+    bench_find(page, server)
+    bench_ele_eles(page, server)
+    bench_make(page, server)
+    bench_walk(page, server)
+    server.latency = 0
+    bench_listener(page, server, nodes)
+    page.driver.stop()
+    page.browser.driver.stop()
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
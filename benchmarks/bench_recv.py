@@ -0,0 +1,69 @@
+# -*- coding:utf-8 -*-
+"""
+接收线程解码开销测试，比较各json库完整解析与预过滤跳过无人处理事件的耗时，不需要浏览器。
+用法：python benchmarks/bench_recv.py [信息数]
+"""
+from json import dumps
+from pathlib import Path
+from sys import path, argv
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage._functions.json_codec import get_codec, peek_event  # noqa: E402
+
+
+def compact(obj):
+    """按浏览器的格式输出紧凑json"""
+    return dumps(obj, separators=(',', ':'))
+
+
+def make_frames(count):
+    """生成模拟的信息流，大部分是无人处理的大事件，少量是命令结果"""
+    nodes = [{'nodeId': i, 'nodeName': 'DIV', 'localName': 'div', 'attributes': ['class', f'item-{i}'],
+              'childNodeCount': 0} for i in range(200)]
+    frames = []
+    for i in range(count):
+        if i % 10 == 0:
+            frames.append(compact({'id': i, 'result': {'result': {'type': 'number', 'value': 1}}}))
+        elif i % 2:
+            frames.append(compact({'method': 'DOM.setChildNodes', 'params': {'parentId': i, 'nodes': nodes}}))
+        else:
+            frames.append(compact({'method': 'Network.dataReceived',
+                                  'params': {'requestId': str(i), 'timestamp': 1.5, 'dataLength': 65536,
+                                             'encodedDataLength': 65536, 'data': 'x' * 4096}}))
+    return frames
+
+
+def bench_full(loads, frames):
+    begin = perf_counter()
+    for f in frames:
+        loads(f)
+    return len(frames) / (perf_counter() - begin)
+
+
+def bench_filtered(loads, frames, wanted=frozenset()):
+    begin = perf_counter()
+    for f in frames:
+        method = peek_event(f)[0]
+        if method and method not in wanted:
+            continue
+        loads(f)
+    return len(frames) / (perf_counter() - begin)
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 5000
+    frames = make_frames(count)
+    for name in ('json', 'ujson', 'orjson'):
+        try:
+            loads = get_codec(name)[1]
+        except ImportError:
+            print(f'{name:<10}未安装')
+            continue
+        print(f'{name:<10}完整解析{bench_full(loads, frames):>12.0f} 条/秒    '
+              f'预过滤{bench_filtered(loads, frames):>12.0f} 条/秒')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+"""
+记录与回放测试，先在本地模拟端点上记录查找元素和读取元素信息的cdp信息，再用ReplayDriver回放，不需要浏览器。
+用法：python benchmarks/bench_replay.py [元素数]
+"""
+from pathlib import Path
+from sys import path, argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage import ChromiumPage  # noqa: E402
+from DrissionPage._base.recorder import TrafficRecorder, TrafficRecording, ReplayDriver  # noqa: E402
+from fake_cdp import FakeCDPServer  # noqa: E402
+
+
+def work(page):
+    """被测试的上层逻辑"""
+    eles = page.eles('css:div')
+    return [ele.tag for ele in eles]
+
+
+def main():
+    nodes = int(argv[1]) if len(argv) > 1 else 200
+    server = FakeCDPServer(nodes=nodes, latency=.001)
+    page = ChromiumPage(server.address)
+    page.wait.doc_loaded()
+
+    recorder = TrafficRecorder()
+    page.driver.add_observer(recorder)
+    begin = perf_counter()
+    tags = work(page)
+    live = perf_counter() - begin
+    page.driver.remove_observer(recorder)
+
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / 'traffic.jsonl.gz'
+        count = recorder.save(file)
+        size = file.stat().st_size
+        recording = TrafficRecording(file)
+
+    live_driver = page._driver
+    page._driver = ReplayDriver(recording, owner=page)
+    begin = perf_counter()
+    replayed = work(page)
+    replay = perf_counter() - begin
+    misses = page._driver.misses
+    page._driver.stop()
+    page._driver = live_driver
+
+    print(f'记录{count}条，压缩后{size / 1024:.1f} KB')
+    print(f'{"实时执行":<12}{live * 1000:>10.1f} 毫秒')
+    print(f'{"回放":<12}{replay * 1000:>10.1f} 毫秒    结果一致：{replayed == tags}    未命中：{len(misses)}')
+    page.driver.stop()
+    page.browser.driver.stop()
+    server.close()
+
+
+if __name__ == '__main__':
+    main()
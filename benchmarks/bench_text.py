@@ -0,0 +1,114 @@
+# -*- coding:utf-8 -*-
+"""
+元素文本提取测试，对比原来逐层用xpath查找子节点的递归实现和现在的单次遍历实现，并检查结果一致，不需要浏览器。
+用法：python benchmarks/bench_text.py [段落数]
+"""
+from pathlib import Path
+from re import sub
+from sys import path, argv
+from time import perf_counter
+
+path.insert(0, str(Path(__file__).parent.parent))
+
+from DrissionPage._elements.session_element import make_session_ele  # noqa: E402
+from DrissionPage._functions.web import get_ele_txt, format_html  # noqa: E402
+
+PARAGRAPH = """<div class="section"><h2>标题 {i}</h2>
+<p>第{i}段  正文，<b>加粗</b>和<a href="/{i}">链接</a>，<!-- 注释 -->注释后的文字<br>换行后的文字。</p>
+<ul><li>项目一</li><li>项目 <span>二</span></li></ul>
+<table><tr><td>单元格1</td><td>单元格2</td><th>表头</th></tr></table>
+<pre>  保留   空格
+和换行\n</pre><script>var a = "{i}";</script><p>&nbsp;实体&amp;字符&lt;</p></div>
+"""
+
+
+def old_get_ele_txt(e):
+    """原来的递归实现，每层用xpath查找子节点"""
+    # 前面无须换行的元素
+    nowrap_list = ('br', 'sub', 'sup', 'em', 'strong', 'a', 'font', 'b', 'span', 's', 'i', 'del', 'ins', 'img', 'td',
+                   'th', 'abbr', 'bdi', 'bdo', 'cite', 'code', 'data', 'dfn', 'kbd', 'mark', 'q', 'rp', 'rt', 'ruby',
+                   'samp', 'small', 'time', 'u', 'var', 'wbr', 'button', 'slot', 'content')
+    # 后面添加换行的元素
+    wrap_after_list = ('p', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ol', 'li', 'blockquote', 'header',
+                       'footer', 'address' 'article', 'aside', 'main', 'nav', 'section', 'figcaption', 'summary')
+    # 不获取文本的元素
+    noText_list = ('script', 'style', 'video', 'audio', 'iframe', 'embed', 'noscript', 'canvas', 'template')
+    # 用/t分隔的元素
+    tab_list = ('td', 'th')
+
+    if e.tag in noText_list:
+        return e.raw_text
+
+    def get_node_txt(ele, pre: bool = False):
+        tag = ele.tag
+        if tag == 'br':
+            return [True]
+        if not pre and tag == 'pre':
+            pre = True
+
+        str_list = []
+        if tag in noText_list and not pre:  # 标签内的文本不返回
+            return str_list
+
+        nodes = ele.eles('xpath:./text() | *')
+        prev_ele = ''
+        for el in nodes:
+            if isinstance(el, str):  # 字符节点
+                if pre:
+                    str_list.append(el)
+
+                else:
+                    if sub('[ \n\t\r]', '', el) != '':  # 字符除了回车和空格还有其它内容
+                        txt = el
+                        if not pre:
+                            txt = txt.replace('\r\n', ' ').replace('\n', ' ').strip(' ')
+                            txt = sub(r' {2,}', ' ', txt)
+                        str_list.append(txt)
+
+            else:  # 元素节点
+                if el.tag not in nowrap_list and str_list and str_list[-1] != '\n':  # 元素间换行的情况
+                    str_list.append('\n')
+                if el.tag in tab_list and prev_ele in tab_list:  # 表格的行
+                    str_list.append('\t')
+
+                str_list.extend(get_node_txt(el, pre))
+                prev_ele = el.tag
+
+        if tag in wrap_after_list and str_list and str_list[-1] not in ('\n', True):  # 有些元素后面要添加回车
+            str_list.append('\n')
+
+        return str_list
+
+    re_str = get_node_txt(e)
+    if re_str and re_str[-1] == '\n':
+        re_str.pop()
+    re_str = ''.join([i if i is not True else '\n' for i in re_str])
+    return format_html(re_str)
+
+
+def fixture(count):
+    return f'<html><body><article>{"".join(PARAGRAPH.format(i=i) for i in range(count))}</article></body></html>'
+
+
+def timed(func, ele, repeat):
+    begin = perf_counter()
+    for _ in range(repeat):
+        r = func(ele)
+    return r, (perf_counter() - begin) / repeat
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 500
+    for size in (10, count):
+        ele = make_session_ele(fixture(size))
+        old, old_time = timed(old_get_ele_txt, ele, 3)
+        new, new_time = timed(get_ele_txt, ele, 3)
+        print(f'{size:>6}段    原实现{old_time * 1000:>10.1f} 毫秒    单次遍历{new_time * 1000:>8.1f} 毫秒    '
+              f'结果一致：{old == new}')
+    for html in ('<br>', '<pre>\n a\n</pre>', '<script>x</script>', '<div><td>a</td><td>b</td></div>'):
+        ele = make_session_ele(html)
+        assert old_get_ele_txt(ele) == get_ele_txt(ele), html
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,425 @@
+# -*- coding:utf-8 -*-
+"""
+本地模拟的DevTools端点，只用于性能测试，不依赖浏览器。
+提供/json、/json/version等http接口和浏览器、标签页的websocket连接，支持flatten方式的session。
+cdp命令按脚本回应，可设置全局或按方法的延迟，也可主动向标签页发送事件。
+内置一个只有若干div元素的模拟DOM，足够让ChromiumPage完成连接和查找元素。
+"""
+from base64 import b64encode
+from hashlib import sha1
+from heapq import heappush, heappop
+from itertools import count
+from json import loads, dumps
+from os import getpid
+from socket import socket, AF_INET, SOCK_STREAM, SOL_SOCKET, SO_REUSEADDR, IPPROTO_TCP, TCP_NODELAY
+from struct import pack, unpack
+from threading import Thread, Condition, Lock
+from time import perf_counter
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class CDPFault(Exception):
+    """在回应方法中抛出，返回cdp错误信息"""
+
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.code = code
+
+
+def recv_exact(conn, size):
+    """从socket读取指定长度数据
+    :param conn: socket对象
+    :param size: 长度
+    :return: 数据，连接关闭时返回None
+    """
+    buf = b''
+    while len(buf) < size:
+        chunk = conn.recv(size - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def read_frame(conn):
+    """读取一个websocket帧
+    :param conn: socket对象
+    :return: (opcode, 数据)，连接关闭时返回(None, None)
+    """
+    head = recv_exact(conn, 2)
+    if head is None:
+        return None, None
+    opcode = head[0] & 0x0f
+    masked = head[1] & 0x80
+    length = head[1] & 0x7f
+    if length == 126:
+        length = unpack('>H', recv_exact(conn, 2))[0]
+    elif length == 127:
+        length = unpack('>Q', recv_exact(conn, 8))[0]
+    mask = recv_exact(conn, 4) if masked else None
+    data = recv_exact(conn, length) if length else b''
+    if data is None:
+        return None, None
+    if mask:
+        data = (int.from_bytes(data, 'big') ^ int.from_bytes((mask * (length // 4 + 1))[:length], 'big')
+                ).to_bytes(length, 'big')
+    return opcode, data
+
+
+def make_frame(data, opcode=1):
+    """生成不带掩码的websocket帧
+    :param data: 数据
+    :param opcode: 帧类型
+    :return: 帧数据
+    """
+    length = len(data)
+    if length < 126:
+        head = pack('>BB', 0x80 | opcode, length)
+    elif length < 65536:
+        head = pack('>BBH', 0x80 | opcode, 126, length)
+    else:
+        head = pack('>BBQ', 0x80 | opcode, 127, length)
+    return head + data
+
+
+def read_request(conn):
+    """读取http请求头
+    :param conn: socket对象
+    :return: (请求路径, 小写键名的请求头dict)，连接关闭时返回(None, None)
+    """
+    data = b''
+    while b'\r\n\r\n' not in data:
+        chunk = conn.recv(4096)
+        if not chunk:
+            return None, None
+        data += chunk
+    lines = data.split(b'\r\n\r\n', 1)[0].decode().split('\r\n')
+    headers = {k.strip().lower(): v.strip() for k, v in (i.split(':', 1) for i in lines[1:] if ':' in i)}
+    return lines[0].split(' ')[1], headers
+
+
+def handshake(conn, headers):
+    """回应websocket握手
+    :param conn: socket对象
+    :param headers: 请求头
+    :return: None
+    """
+    accept = b64encode(sha1((headers['sec-websocket-key'] + _WS_GUID).encode()).digest()).decode()
+    conn.sendall(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                  f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+
+
+class FakeDOM(object):
+    """只有一个document和若干个div元素的模拟DOM，node id、backend id和object id一一对应"""
+
+    def __init__(self, size=100):
+        """
+        :param size: div元素数量
+        """
+        self.size = size
+
+    def node(self, backend_id):
+        """返回describeNode格式的节点信息
+        :param backend_id: backend id，1为document
+        :return: 节点信息dict
+        """
+        if backend_id == 1:
+            return {'nodeId': 1, 'backendNodeId': 1, 'nodeType': 9, 'nodeName': '#document', 'localName': '',
+                    'nodeValue': '', 'childNodeCount': 1}
+        return {'nodeId': backend_id, 'backendNodeId': backend_id, 'nodeType': 1, 'nodeName': 'DIV',
+                'localName': 'div', 'nodeValue': '', 'childNodeCount': 0,
+                'attributes': ['class', f'item item-{backend_id}']}
+
+    def backend_id(self, params):
+        """从cdp参数中取得节点的backend id
+        :param params: 含有nodeId、backendNodeId或objectId的参数
+        :return: backend id
+        """
+        if 'objectId' in params:
+            obj_id = params['objectId']
+            if not obj_id.startswith('node-'):
+                raise CDPFault('Could not find node with given id')
+            return int(obj_id[5:])
+        return params.get('backendNodeId') or params['nodeId']
+
+    @staticmethod
+    def obj_id(backend_id):
+        return f'node-{backend_id}'
+
+    def element_ids(self):
+        """返回所有div元素的id"""
+        return list(range(2, self.size + 2))
+
+
+class FakeCDPServer(object):
+    """本地模拟的DevTools端点"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0, nodes=100):
+        """
+        :param host: 监听地址
+        :param port: 监听端口，为0时自动分配
+        :param latency: 每条命令回应的默认延迟（秒）
+        :param nodes: 模拟DOM中div元素的数量
+        """
+        self.browser_id = 'fake-browser-0001'
+        self.targets = [{'id': 'FAKEPAGE0001', 'type': 'page', 'url': 'about:blank', 'title': 'fake'}]
+        self.dom = FakeDOM(nodes)
+        self.latency = latency
+        self.latencies = {}
+        self.responders = {}
+        self.commands = 0
+        self._conns = {}
+        self._sessions = {}
+        self._session_ids = count(1)
+        self._lock = Lock()
+        self._set_default_responders()
+
+        self._server = socket(AF_INET, SOCK_STREAM)
+        self._server.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(64)
+        self.address = f'{host}:{self._server.getsockname()[1]}'
+        Thread(target=self._accept_loop, daemon=True).start()
+
+    def set_responder(self, method, responder, latency=None):
+        """设置一个cdp方法的回应
+        :param method: cdp方法名
+        :param responder: 回应的result dict，或接收(params, target_id)并返回result的方法，方法中可抛出CDPFault返回错误
+        :param latency: 此方法的回应延迟（秒），为None时使用默认延迟
+        :return: None
+        """
+        self.responders[method] = responder
+        if latency is not None:
+            self.latencies[method] = latency
+
+    def emit(self, method, params, target_id=None):
+        """向标签页连接发送事件
+        :param method: 事件名
+        :param params: 事件参数
+        :param target_id: 标签页id，为None时发给第一个标签页
+        :return: None
+        """
+        target_id = target_id or self.targets[0]['id']
+        with self._lock:
+            conns = list(self._conns.get(target_id, ()))
+            sessions = [(s, c) for s, (t, c) in self._sessions.items() if t == target_id]
+        for conn in conns:
+            conn.send({'method': method, 'params': params})
+        for session_id, conn in sessions:
+            conn.send({'method': method, 'params': params, 'sessionId': session_id})
+
+    def close(self):
+        self._server.close()
+
+    def _set_default_responders(self):
+        dom = self.dom
+
+        def get_targets(params, target_id):
+            return {'targetInfos': [{'targetId': t['id'], 'type': t['type'], 'url': t['url'], 'title': t['title'],
+                                     'attached': False} for t in self.targets]}
+
+        def evaluate(params, target_id):
+            expr = params.get('expression', '')
+            if 'readyState' in expr:
+                return {'result': {'type': 'string', 'value': 'complete'}}
+            if expr.strip().rstrip(';') == 'document':
+                return {'result': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDocument',
+                                   'objectId': dom.obj_id(1)}}
+            return {'result': {'type': 'undefined'}}
+
+        def call_function_on(params, target_id):
+            dom.backend_id(params)
+            js = params.get('functionDeclaration', '')
+            if 'of steps' in js:  # ElementWalker定位链，返回所有div组成的数组
+                return {'result': {'type': 'object', 'subtype': 'array', 'className': 'Array',
+                                   'description': f'Array({dom.size})', 'objectId': 'array-all'}}
+            if 'ownerDocument' in js:
+                return {'result': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDocument',
+                                   'objectId': dom.obj_id(1)}}
+            if 'MutationObserver' in js:
+                return {'result': {'type': 'string', 'value': 'now'}}
+            if 'querySelectorAll' in js:
+                return {'result': {'type': 'object', 'subtype': 'array', 'className': 'NodeList',
+                                   'description': f'NodeList({dom.size})', 'objectId': 'list-all'}}
+            if 'querySelector' in js:
+                return {'result': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDivElement',
+                                   'description': 'div', 'objectId': dom.obj_id(2)}}
+            return {'result': {'type': 'undefined'}}
+
+        def get_properties(params, target_id):
+            if params['objectId'] not in ('list-all', 'array-all'):
+                return {'result': []}
+            r = [{'name': str(n), 'value': {'type': 'object', 'subtype': 'node', 'objectId': dom.obj_id(i)}}
+                 for n, i in enumerate(dom.element_ids())]
+            if params['objectId'] == 'array-all':  # 数组自身还有length属性
+                r.append({'name': 'length', 'value': {'type': 'number', 'value': dom.size}})
+            return {'result': r}
+
+        def search_results(params, target_id):
+            return {'nodeIds': dom.element_ids()[params['fromIndex']:params['toIndex']]}
+
+        for method, responder in {
+            'Browser.getVersion': {'protocolVersion': '1.3', 'product': 'FakeChrome/120.0.0.0',
+                                   'userAgent': 'Mozilla/5.0 FakeChrome/120.0.0.0', 'jsVersion': '12.0'},
+            'SystemInfo.getProcessInfo': {'processInfo': [{'type': 'browser', 'id': getpid(), 'cpuTime': 0}]},
+            'Target.getTargets': get_targets,
+            'Target.getTargetInfo': lambda p, t: {'targetInfo': dict(get_targets(p, t)['targetInfos'][0])},
+            'Page.getFrameTree': lambda p, t: {'frameTree': {'frame': {'id': t or self.targets[0]['id'],
+                                                                       'url': 'about:blank'}}},
+            'Page.navigate': lambda p, t: {'frameId': t, 'loaderId': 'loader'},
+            'Runtime.evaluate': evaluate,
+            'Runtime.callFunctionOn': call_function_on,
+            'Runtime.getProperties': get_properties,
+            'DOM.getDocument': {'root': dom.node(1)},
+            'DOM.describeNode': lambda p, t: {'node': dom.node(dom.backend_id(p))},
+            'DOM.resolveNode': lambda p, t: {'object': {'type': 'object', 'subtype': 'node', 'className': 'HTMLElement',
+                                                        'objectId': dom.obj_id(dom.backend_id(p))}},
+            'DOM.requestNode': lambda p, t: {'nodeId': dom.backend_id(p)},
+            'DOM.performSearch': {'searchId': 'search', 'resultCount': dom.size},
+            'DOM.getSearchResults': search_results,
+            'Network.getResponseBody': {'body': '{"fake": true}', 'base64Encoded': False},
+        }.items():
+            self.responders[method] = responder
+
+    def _respond(self, msg, target_id):
+        """生成一条命令的回应
+        :param msg: 命令
+        :param target_id: 命令所属标签页id，浏览器连接为None
+        :return: 回应dict
+        """
+        self.commands += 1
+        method = msg.get('method')
+        responder = self.responders.get(method, {})
+        try:
+            result = responder(msg.get('params', {}), target_id) if callable(responder) else responder
+            r = {'id': msg['id'], 'result': result}
+        except CDPFault as e:
+            r = {'id': msg['id'], 'error': {'code': e.code, 'message': str(e)}}
+        if 'sessionId' in msg:
+            r['sessionId'] = msg['sessionId']
+        return r
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            conn.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        path, headers = read_request(conn)
+        if path is None:
+            return conn.close()
+        if headers.get('upgrade', '').lower() != 'websocket':
+            return self._serve_http(conn, path)
+
+        handshake(conn, headers)
+        target_id = path.rstrip('/').split('/')[-1] if path.startswith('/devtools/page/') else None
+        ws = _Connection(conn)
+        if target_id:
+            with self._lock:
+                self._conns.setdefault(target_id, []).append(ws)
+
+        while True:
+            opcode, data = read_frame(conn)
+            if opcode is None or opcode == 8:
+                break
+            if opcode == 9:
+                ws.send_raw(make_frame(data, 10))
+                continue
+            msg = loads(data)
+            method = msg.get('method')
+            tid = target_id
+            if 'sessionId' in msg:
+                tid = self._sessions.get(msg['sessionId'], (None,))[0]
+            elif method == 'Target.attachToTarget':
+                session_id = f'SESSION{next(self._session_ids):04d}'
+                with self._lock:
+                    self._sessions[session_id] = (msg['params']['targetId'], ws)
+                ws.send({'id': msg['id'], 'result': {'sessionId': session_id}})
+                continue
+            elif method == 'Target.detachFromTarget':
+                with self._lock:
+                    self._sessions.pop(msg['params'].get('sessionId'), None)
+
+            ws.send(self._respond(msg, tid), self.latencies.get(method, self.latency))
+
+        ws.close()
+        with self._lock:
+            if target_id:
+                self._conns.get(target_id, []).remove(ws)
+            for s in [s for s, (t, c) in self._sessions.items() if c is ws]:
+                self._sessions.pop(s)
+        conn.close()
+
+    def _serve_http(self, conn, path):
+        path = path.split('?')[0].rstrip('/')
+        if path == '/json/version':
+            body = {'Browser': 'FakeChrome/120.0.0.0', 'Protocol-Version': '1.3',
+                    'User-Agent': 'Mozilla/5.0 FakeChrome/120.0.0.0',
+                    'webSocketDebuggerUrl': f'ws://{self.address}/devtools/browser/{self.browser_id}'}
+        elif path in ('/json', '/json/list'):
+            body = [dict(t, webSocketDebuggerUrl=f'ws://{self.address}/devtools/page/{t["id"]}')
+                    for t in self.targets]
+        else:
+            body = None
+
+        data = dumps(body).encode() if body is not None else b'Not Found'
+        status = '200 OK' if body is not None else '404 Not Found'
+        conn.sendall(f'HTTP/1.1 {status}\r\nContent-Type: application/json; charset=UTF-8\r\n'
+                     f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n'.encode() + data)
+        conn.close()
+
+
+class _Connection(object):
+    """一个websocket连接的发送端，有延迟的回应由单独线程按时间发出"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._lock = Lock()
+        self._delayed = []
+        self._seq = count()
+        self._cond = Condition()
+        self._closed = False
+        self._th = None
+
+    def send(self, msg, latency=0):
+        """发送一条信息
+        :param msg: 信息dict
+        :param latency: 延迟（秒）
+        :return: None
+        """
+        frame = make_frame(dumps(msg, separators=(',', ':')).encode())
+        if not latency:
+            return self.send_raw(frame)
+        with self._cond:
+            if self._th is None:
+                self._th = Thread(target=self._delay_loop, daemon=True)
+                self._th.start()
+            heappush(self._delayed, (perf_counter() + latency, next(self._seq), frame))
+            self._cond.notify()
+
+    def send_raw(self, frame):
+        with self._lock:
+            try:
+                self._conn.sendall(frame)
+            except OSError:
+                pass
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _delay_loop(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._delayed or self._delayed[0][0] > perf_counter()):
+                    self._cond.wait(self._delayed[0][0] - perf_counter() if self._delayed else None)
+                if self._closed:
+                    return
+                frame = heappop(self._delayed)[2]
+            self.send_raw(frame)